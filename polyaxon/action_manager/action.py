@@ -50,6 +50,11 @@ class Action(object):
     def _execute(cls, data, config):
         raise NotImplementedError
 
+    @classmethod
+    def _dispatch(cls, data, config):
+        """Executes the action for an event, by default in the code path recording the event."""
+        return cls._execute(data=data, config=config)
+
     @classmethod
     def serialize_event_to_context(cls, event):
         """Implementation for turning an event into actionable notification."""
@@ -68,7 +73,10 @@ class Action(object):
             return False
 
         data = cls._prepare(context)
-        result = cls._execute(data=data, config=config)
+        if from_event:
+            result = cls._dispatch(data=data, config=config)
+        else:
+            result = cls._execute(data=data, config=config)
         auditor.record(event_type=cls.event_type,
                        automatic=from_user is None,
                        user=from_user)
@@ -17,6 +17,7 @@ class MattermostWebHookAction(WebHookAction):
     event_type = MATTERMOST_WEBHOOK_ACTION_EXECUTED
     description = "Mattermost webhooks to send payload to a Mattermost channel."
     raise_empty_context = True
+    coalesce_payloads = True
 
     @classmethod
     def _validate_config(cls, config):
@@ -61,3 +62,11 @@ class MattermostWebHookAction(WebHookAction):
             data['channel'] = channel
 
         return data
+
+    @classmethod
+    def coalesce(cls, payloads):
+        # The attachments are sent in one message
+        data = payloads[0]
+        data['attachments'] = [attachment for payload in payloads
+                               for attachment in payload['attachments']]
+        return [data]
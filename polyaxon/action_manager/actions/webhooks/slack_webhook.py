@@ -17,6 +17,7 @@ class SlackWebHookAction(WebHookAction):
     event_type = SLACK_WEBHOOK_ACTION_EXECUTED
     description = "Slack webhooks to send payload to Slack Incoming Webhooks."
     raise_empty_context = True
+    coalesce_payloads = True
 
     @classmethod
     def _validate_config(cls, config):
@@ -66,3 +67,11 @@ class SlackWebHookAction(WebHookAction):
             data['icon_url'] = icon_url
 
         return data
+
+    @classmethod
+    def coalesce(cls, payloads):
+        # The attachments are sent in one message
+        data = payloads[0]
+        data['attachments'] = [attachment for payload in payloads
+                               for attachment in payload['attachments']]
+        return [data]
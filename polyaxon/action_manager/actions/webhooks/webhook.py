@@ -1,5 +1,6 @@
 from django.conf import settings
 
+from action_manager import delivery
 from action_manager.action import Action, logger
 from action_manager.action_event import ActionExecutedEvent
 from action_manager.exceptions import PolyaxonActionException
@@ -24,6 +25,8 @@ class WebHookAction(Action):
                    "by subscribing to certain events on Polyaxon, "
                    "or manually triggered by a user operation.")
     raise_empty_context = False
+    # Whether the payloads sent to an endpoint in a short window are merged in a digest
+    coalesce_payloads = False
 
     @classmethod
     def _validate_config(cls, config):
@@ -95,3 +98,18 @@ class WebHookAction(Action):
                 safe_request(url=web_hook['url'], method=web_hook['method'], json=data)
             else:
                 safe_request(url=web_hook['url'], method=web_hook['method'], params=data)
+
+    @classmethod
+    def _dispatch(cls, data, config):
+        """The webhooks of events are delivered by celery tasks, see `action_manager.delivery`."""
+        for web_hook in config:
+            data = cls._pre_execute_web_hook(data=data, config=web_hook)
+            delivery.deliver(action_key=cls.action_key,
+                             web_hook=web_hook,
+                             data=data,
+                             coalesce=cls.coalesce_payloads)
+
+    @classmethod
+    def coalesce(cls, payloads):
+        """Merges the payloads of a digest, returns the payloads to send."""
+        return payloads
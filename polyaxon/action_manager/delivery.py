@@ -0,0 +1,111 @@
+"""Delivery of the webhooks executed for events.
+
+The webhooks are sent by celery tasks instead of the code path recording the event,
+and a slow or failing endpoint only delays its own deliveries:
+
+ * The requests to a host reuse the connections of a pooled session.
+ * Failed deliveries are retried with an exponential backoff.
+ * The requests to an endpoint are rate limited, and limited in concurrency.
+ * A circuit breaker suspends the deliveries to an endpoint after consecutive failures.
+ * The payloads of the actions that can merge them are sent as one digest per window.
+"""
+import json
+import logging
+import requests
+
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from libs.http import get_session, safe_request
+from libs.json_utils import dumps, loads
+from libs.redis_db import RedisWebHookEndpoints
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import ActionsCeleryTasks, Intervals
+
+_logger = logging.getLogger('polyaxon.actions.delivery')
+
+# Requests failing with these statuses are not retried
+NON_RETRIABLE_STATUSES = {400, 401, 403, 404, 405, 410, 413, 422}
+
+
+def get_digest_key(web_hook):
+    return json.dumps(web_hook, sort_keys=True)
+
+
+def get_retry_delay(retries):
+    return min(settings.INTEGRATIONS_WEBHOOKS_RETRY_DELAY * 2 ** retries,
+               Intervals.OPERATIONS_MAX_RETRY_DELAY)
+
+
+def deliver(action_key, web_hook, data, coalesce=False):
+    """Schedules the delivery of a webhook payload."""
+    # The payloads are serialized by celery and redis
+    data = loads(dumps(data))
+    if coalesce and settings.INTEGRATIONS_WEBHOOKS_DIGEST_WINDOW:
+        if RedisWebHookEndpoints(get_digest_key(web_hook)).push_digest(data):
+            celery_app.send_task(
+                ActionsCeleryTasks.ACTIONS_SEND_WEBHOOK_DIGEST,
+                kwargs={'action_key': action_key, 'web_hook': web_hook},
+                countdown=settings.INTEGRATIONS_WEBHOOKS_DIGEST_WINDOW)
+        return
+
+    celery_app.send_task(ActionsCeleryTasks.ACTIONS_DELIVER_WEBHOOK,
+                         kwargs={'web_hook': web_hook, 'data': data})
+
+
+def pop_digest(web_hook):
+    return RedisWebHookEndpoints(get_digest_key(web_hook)).pop_digest()
+
+
+def send(web_hook, data, retries=0):
+    """Sends a webhook payload.
+
+    Returns:
+        int: `None` if the payload was delivered or dropped,
+            otherwise the seconds to wait before trying again.
+    """
+    url = web_hook['url']
+    # Webhook urls usually contain secrets, only the host is logged
+    host = urlparse(url).netloc
+    endpoint = RedisWebHookEndpoints(url)
+    can_retry = retries < settings.INTEGRATIONS_WEBHOOKS_MAX_RETRIES
+
+    delay = endpoint.get_circuit_open_ttl() or endpoint.acquire(
+        rate_limit=settings.INTEGRATIONS_WEBHOOKS_RATE_LIMIT,
+        concurrency=settings.INTEGRATIONS_WEBHOOKS_CONCURRENCY,
+        timeout=settings.INTEGRATIONS_WEBHOOKS_TIMEOUT)
+    if delay:
+        if can_retry:
+            return delay
+        _logger.warning('Dropped a webhook payload, the endpoint `%s` is not available.', host)
+        return None
+
+    status_code = None
+    try:
+        kwargs = {'json': data} if web_hook['method'] == 'POST' else {'params': data}
+        response = safe_request(url=url,
+                                method=web_hook['method'],
+                                timeout=settings.INTEGRATIONS_WEBHOOKS_TIMEOUT,
+                                session=get_session(url),
+                                **kwargs)
+        status_code = response.status_code
+        delivered = status_code < 400
+    except requests.RequestException as e:
+        _logger.info('Could not deliver a webhook payload: %s', e)
+        delivered = False
+    finally:
+        endpoint.release()
+
+    if delivered:
+        endpoint.set_succeeded()
+        return None
+
+    if endpoint.set_failed(max_failures=settings.INTEGRATIONS_WEBHOOKS_CIRCUIT_FAILURES,
+                           cooldown=settings.INTEGRATIONS_WEBHOOKS_CIRCUIT_COOLDOWN):
+        _logger.warning('Suspended the deliveries to the webhook endpoint `%s`.', host)
+    if status_code in NON_RETRIABLE_STATUSES or not can_retry:
+        _logger.warning('Dropped a webhook payload, the endpoint `%s` responded with `%s`.',
+                        host, status_code)
+        return None
+    return get_retry_delay(retries)
@@ -0,0 +1,22 @@
+from action_manager import delivery
+from notifier.managers import default_action_manager
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import ActionsCeleryTasks
+
+
+@celery_app.task(name=ActionsCeleryTasks.ACTIONS_DELIVER_WEBHOOK, bind=True, max_retries=None)
+def actions_deliver_webhook(self, web_hook, data):
+    countdown = delivery.send(web_hook=web_hook, data=data, retries=self.request.retries)
+    if countdown is not None:
+        self.retry(countdown=countdown)
+
+
+@celery_app.task(name=ActionsCeleryTasks.ACTIONS_SEND_WEBHOOK_DIGEST, ignore_result=True)
+def actions_send_webhook_digest(action_key, web_hook):
+    payloads = delivery.pop_digest(web_hook)
+    if not payloads:
+        return
+
+    action = default_action_manager.get(action_key)
+    for data in action.coalesce(payloads):
+        delivery.deliver(action_key=action_key, web_hook=web_hook, data=data)
@@ -1,5 +1,6 @@
 from activitylogs.manager import default_manager
 from constants import user_system
+from event_manager import event_subjects
 from event_manager.event_service import EventService
 
 
@@ -9,17 +10,37 @@ class ActivityLogService(EventService):
     def __init__(self):
         self.activity_log = None
 
-    def record_event(self, event):
+    @staticmethod
+    def get_subject_id(event, subject):
+        """The id of the subject (e.g. project) the event's instance is or belongs to."""
+        if event.get_event_subject() == subject:
+            value = event.data.get('id')
+        else:
+            value = event.data.get('{}.id'.format(subject))
+        return int(value) if value is not None else None
+
+    def get_activity_log(self, event):
         assert event.actor_id is not None
         actor_id = event.data[event.actor_id]
-        return self.activity_log.objects.create(
+        return self.activity_log(
             event_type=event.event_type,
             actor_id=actor_id if actor_id != user_system.USER_SYSTEM_ID else None,
             context=event.data,
             created_at=event.datetime,
-            content_object=event.instance,
+            project_id=self.get_subject_id(event, event_subjects.PROJECT),
+            experiment_id=self.get_subject_id(event, event_subjects.EXPERIMENT),
+            **event.get_content_object_fields()
         )
 
+    def record_event(self, event):
+        activity_log = self.get_activity_log(event)
+        activity_log.save()
+        return activity_log
+
+    def record_events(self, events):
+        return self.activity_log.objects.bulk_create(
+            [self.get_activity_log(event) for event in events])
+
     def setup(self):
         super().setup()
         # Load default event types
@@ -1,23 +1,27 @@
 from rest_framework.generics import ListAPIView, get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 
-from django.db.models import Q
-
 import activitylogs
 
 from api.activitylogs.serializers import ActivityLogsSerializer
+from api.utils.pagination import KeysetPagination
 from db.models.activitylogs import ActivityLog
 from db.models.projects import Project
 
 
 class HistoryLogsView(ListAPIView):
-    """Activity logs list view."""
+    """Activity logs list view.
+
+    The activities are paginated with `KeysetPagination`, the `count` of the response
+    is not the total number of activities, but a lower bound used to page to the next page.
+    """
     # Filter only for user write events
     queryset = ActivityLog.objects.order_by('-created_at').filter(
         event_type__in=activitylogs.default_manager.user_view_events()
     )
     serializer_class = ActivityLogsSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
 
     def filter_queryset(self, queryset):
         queryset = queryset.filter(actor=self.request.user)
@@ -25,13 +29,18 @@ class HistoryLogsView(ListAPIView):
 
 
 class ActivityLogsView(ListAPIView):
-    """Activity logs list view."""
+    """Activity logs list view.
+
+    The activities are paginated with `KeysetPagination`, the `count` of the response
+    is not the total number of activities, but a lower bound used to page to the next page.
+    """
     # Filter only for user write events
     queryset = ActivityLog.objects.order_by('-created_at').filter(
         event_type__in=activitylogs.default_manager.user_write_events()
     )
     serializer_class = ActivityLogsSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
 
 
 class ProjectActivityLogsView(ActivityLogsView):
@@ -41,10 +50,6 @@ class ProjectActivityLogsView(ActivityLogsView):
         project_name = self.kwargs['name']
         username = self.kwargs['username']
         project = get_object_or_404(Project, user__username=username, name=project_name)
-        project_id = '{}'.format(project.id)
         # Filter for project/all events
-        queryset = queryset.filter(
-            Q(content_type__model='project', context__id=project_id) |
-            Q(**{'context__project.id': project_id})
-        )
+        queryset = queryset.filter(project_id=project.id)
         return super().filter_queryset(queryset=queryset)
@@ -4,6 +4,7 @@ from django.urls import re_path
 
 from api.bookmarks import views as bookmark_views
 from api.experiment_groups import views
+from api.experiments import views as experiments_views
 from constants.urls import GROUP_ID_PATTERN, ID_PATTERN, NAME_PATTERN, USERNAME_PATTERN
 
 groups_urlpatterns = [
@@ -14,6 +15,9 @@ groups_urlpatterns = [
         views.ExperimentGroupStatusListView.as_view()),
     re_path(r'^{}/{}/groups/{}/stop/?$'.format(USERNAME_PATTERN, NAME_PATTERN, ID_PATTERN),
             views.ExperimentGroupStopView.as_view()),
+    re_path(r'^{}/{}/groups/{}/compare/?$'.format(
+        USERNAME_PATTERN, NAME_PATTERN, GROUP_ID_PATTERN),
+        experiments_views.ProjectExperimentComparisonView.as_view()),
     re_path(
         r'^{}/{}/groups/{}/bookmark/?$'.format(USERNAME_PATTERN, NAME_PATTERN, ID_PATTERN),
         bookmark_views.ExperimentGroupBookmarkCreateView.as_view()),
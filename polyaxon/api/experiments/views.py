@@ -35,7 +35,8 @@ from api.experiments.serializers import (
     ExperimentStatusSerializer
 )
 from api.filters import OrderingFilter, QueryFilter
-from api.utils.views import AuditorMixinView, ListCreateAPIView, ProtectedView
+from api.utils.parsers import NDJSONParser
+from api.utils.views import AuditorMixinView, ListCreateAPIView, OutputsDownloadView
 from db.models.experiment_groups import ExperimentGroup
 from db.models.experiment_jobs import ExperimentJob, ExperimentJobStatus
 from db.models.experiments import Experiment, ExperimentMetric, ExperimentStatus
@@ -60,8 +61,11 @@ from event_manager.events.experiment_job import (
     EXPERIMENT_JOB_VIEWED
 )
 from event_manager.events.project import PROJECT_EXPERIMENTS_VIEWED
-from libs.archive import archive_experiment_outputs
-from libs.paths.experiments import get_experiment_logs_path
+from libs import downsampling
+from libs.comparison import compare_experiments
+from libs.date_utils import DateTimeFormatter, DateTimeFormatterException
+from libs.metrics import get_metric_series
+from libs.paths.experiments import get_experiment_logs_path, get_experiment_outputs_path
 from libs.permissions.authentication import InternalAuthentication
 from libs.permissions.internal import IsAuthenticatedOrInternal
 from libs.permissions.projects import get_permissible_project
@@ -131,7 +135,7 @@ class ProjectExperimentListView(ListCreateAPIView):
         independent = to_bool(self.request.query_params.get('independent', None),
                               handle_none=True,
                               exception=ValidationError)
-        group_id = self.request.query_params.get('group', None)
+        group_id = self.kwargs.get('group_id') or self.request.query_params.get('group', None)
         if independent and group_id:
             raise ValidationError('You cannot filter for independent experiments and '
                                   'group experiments at the same time.')
@@ -154,6 +158,31 @@ class ProjectExperimentListView(ListCreateAPIView):
         auditor.record(event_type=EXPERIMENT_CREATED, instance=instance)
 
 
+class ProjectExperimentComparisonView(ProjectExperimentListView):
+    """Compare the declarations and last metrics of experiments under a project or a group.
+
+    The result is columnar: one list per declaration and per metric,
+    aligned with the list of experiment ids.
+    The same filters used to list experiments can be used.
+
+    Query params:
+        summary: if true, summary statistics are computed for every numeric column.
+        target: a metric key to correlate every declaration with.
+    """
+    http_method_names = ['get', 'head', 'options']
+
+    def list(self, request, *args, **kwargs):
+        summary = to_bool(request.query_params.get('summary', None),
+                          handle_none=True,
+                          exception=ValidationError)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list('id', 'declarations', 'metric__values')
+        return Response(status=status.HTTP_200_OK,
+                        data=compare_experiments(rows=rows.iterator(),
+                                                 summary=summary,
+                                                 target=request.query_params.get('target')))
+
+
 class ExperimentDetailView(AuditorMixinView, RetrieveUpdateDestroyAPIView):
     """
     get:
@@ -311,17 +340,30 @@ class ExperimentStatusListView(ExperimentViewMixin, ListCreateAPIView):
 class ExperimentMetricListView(ExperimentViewMixin, ListCreateAPIView):
     """
     get:
-        List all metrics of an experiment.
+        List the raw metrics of an experiment,
+        the history of the compacted metrics is served by the metric series endpoint.
     post:
-        Create an experiment metric.
+        Create an experiment metric,
+        or a batch of metrics if a list or newline-delimited JSON is posted.
     """
     queryset = ExperimentMetric.objects.all()
     serializer_class = ExperimentMetricSerializer
     authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
         InternalAuthentication,
     ]
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [NDJSONParser]
     permission_classes = (IsAuthenticatedOrInternal,)
 
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        metrics = self.get_experiment().add_metrics(metrics=serializer.validated_data)
+        serializer = self.get_serializer(metrics, many=True)
+        return Response(status=status.HTTP_201_CREATED, data=serializer.data)
+
     def perform_create(self, serializer):
         serializer.save(experiment=self.get_experiment())
 
@@ -334,6 +376,54 @@ class ExperimentMetricListView(ExperimentViewMixin, ListCreateAPIView):
         return response
 
 
+class ExperimentMetricSeriesView(ExperimentViewMixin, RetrieveAPIView):
+    """Get the history of the experiment metrics, optionally downsampled, as series per key.
+
+    Query params:
+        keys: comma separated list of metric keys.
+        start, end: datetime range.
+        points: maximum number of points to return per key.
+        method: downsampling method, `lttb` (default) or `minmax`.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get_datetime_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return DateTimeFormatter.extract(value)
+        except DateTimeFormatterException as e:
+            raise ValidationError(e)
+
+    def get(self, request, *args, **kwargs):
+        experiment = self.get_experiment()
+        auditor.record(event_type=EXPERIMENT_METRICS_VIEWED,
+                       instance=experiment,
+                       actor_id=request.user.id,
+                       actor_name=request.user.username)
+        keys = request.query_params.get('keys')
+        keys = [key.strip() for key in keys.split(',') if key.strip()] if keys else None
+        method = request.query_params.get('method', downsampling.LTTB)
+        if method not in downsampling.METHODS:
+            raise ValidationError('Unknown downsampling method `{}`.'.format(method))
+        points = request.query_params.get('points')
+        if points is not None:
+            try:
+                points = int(points)
+            except ValueError:
+                raise ValidationError('`points` must be an integer.')
+
+        series = get_metric_series(experiment=experiment,
+                                   keys=keys,
+                                   start=self.get_datetime_param('start'),
+                                   end=self.get_datetime_param('end'))
+        if points:
+            series = {key: downsampling.downsample(values, threshold=points, method=method)
+                      for key, values in series.items()}
+        return Response(status=status.HTTP_200_OK, data=series)
+
+
 class ExperimentStatusDetailView(ExperimentViewMixin, RetrieveAPIView):
     """Get experiment status details."""
     queryset = ExperimentStatus.objects.all()
@@ -502,10 +592,9 @@ class ExperimentStopView(CreateAPIView):
         return Response(status=status.HTTP_200_OK)
 
 
-class DownloadOutputsView(ProtectedView):
+class DownloadOutputsView(OutputsDownloadView):
     """Download outputs of an experiment."""
     permission_classes = (IsAuthenticated,)
-    HANDLE_UNAUTHENTICATED = False
 
     def get_object(self):
         project = get_permissible_project(view=self)
@@ -516,9 +605,9 @@ class DownloadOutputsView(ProtectedView):
                        actor_name=self.request.user.username)
         return experiment
 
-    def get(self, request, *args, **kwargs):
+    def get_outputs(self):
         experiment = self.get_object()
-        archived_path, archive_name = archive_experiment_outputs(
+        outputs_path = get_experiment_outputs_path(
             persistence_outputs=experiment.persistence_outputs,
             experiment_name=experiment.unique_name)
-        return self.redirect(path='{}/{}'.format(archived_path, archive_name))
+        return outputs_path, experiment.unique_name
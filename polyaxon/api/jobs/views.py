@@ -26,7 +26,7 @@ from api.jobs.serializers import (
     JobSerializer,
     JobStatusSerializer
 )
-from api.utils.views import AuditorMixinView, ListCreateAPIView, ProtectedView
+from api.utils.views import AuditorMixinView, ListCreateAPIView, OutputsDownloadView
 from db.models.jobs import Job, JobStatus
 from event_manager.events.job import (
     JOB_CREATED,
@@ -40,8 +40,7 @@ from event_manager.events.job import (
     JOB_VIEWED
 )
 from event_manager.events.project import PROJECT_JOBS_VIEWED
-from libs.archive import archive_job_outputs
-from libs.paths.jobs import get_job_logs_path
+from libs.paths.jobs import get_job_logs_path, get_job_outputs_path
 from libs.permissions.projects import get_permissible_project
 from libs.spec_validation import validate_job_spec_config
 from libs.utils import to_bool
@@ -266,10 +265,9 @@ class JobStopView(CreateAPIView):
         return Response(status=status.HTTP_200_OK)
 
 
-class DownloadOutputsView(ProtectedView):
+class DownloadOutputsView(OutputsDownloadView):
     """Download outputs of a job."""
     permission_classes = (IsAuthenticated,)
-    HANDLE_UNAUTHENTICATED = False
 
     def get_object(self):
         project = get_permissible_project(view=self)
@@ -280,9 +278,8 @@ class DownloadOutputsView(ProtectedView):
                        actor_name=self.request.user.username)
         return job
 
-    def get(self, request, *args, **kwargs):
+    def get_outputs(self):
         job = self.get_object()
-        archived_path, archive_name = archive_job_outputs(
-            persistence_outputs=job.persistence_outputs,
-            job_name=job.unique_name)
-        return self.redirect(path='{}/{}'.format(archived_path, archive_name))
+        outputs_path = get_job_outputs_path(persistence_outputs=job.persistence_outputs,
+                                            job_name=job.unique_name)
+        return outputs_path, job.unique_name
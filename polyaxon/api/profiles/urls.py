@@ -0,0 +1,12 @@
+from rest_framework.urlpatterns import format_suffix_patterns
+
+from django.urls import re_path
+
+from api.profiles import views
+
+urlpatterns = [
+    re_path(r'^profiles/?$', views.ProfileListView.as_view()),
+    re_path(r'^profiles/(?P<profile_id>[a-f0-9]{32})/?$', views.ProfileDetailView.as_view()),
+]
+
+urlpatterns = format_suffix_patterns(urlpatterns)
@@ -0,0 +1,35 @@
+from rest_framework.generics import RetrieveAPIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+
+from django.http import Http404
+
+from libs.redis_db import RedisProfiles
+
+
+class ProfileListView(RetrieveAPIView):
+    """
+    get:
+        List the profiles of the requests and tasks, without their functions.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser)
+
+    def retrieve(self, request, *args, **kwargs):
+        profiles = RedisProfiles.get_profiles()
+        for profile in profiles:
+            profile.pop('functions', None)
+        return Response(profiles)
+
+
+class ProfileDetailView(RetrieveAPIView):
+    """
+    get:
+        Get a profile of a request or a task.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser)
+
+    def retrieve(self, request, *args, **kwargs):
+        profile = RedisProfiles.get_profile(self.kwargs['profile_id'])
+        if not profile:
+            raise Http404
+        return Response(profile)
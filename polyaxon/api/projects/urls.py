@@ -22,6 +22,8 @@ projects_urlpatterns = [
             groups_views.ExperimentGroupListView.as_view()),
     re_path(r'^{}/{}/experiments/?$'.format(USERNAME_PATTERN, NAME_PATTERN),
             experiments_views.ProjectExperimentListView.as_view()),
+    re_path(r'^{}/{}/experiments/compare/?$'.format(USERNAME_PATTERN, NAME_PATTERN),
+            experiments_views.ProjectExperimentComparisonView.as_view()),
     re_path(r'^{}/{}/jobs/?$'.format(USERNAME_PATTERN, NAME_PATTERN),
             jobs_views.ProjectJobListView.as_view()),
     re_path(r'^{}/{}/builds/?$'.format(USERNAME_PATTERN, NAME_PATTERN),
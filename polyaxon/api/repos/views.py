@@ -1,13 +1,17 @@
 import logging
 import os
+import re
 
+from git.exc import BadName, GitCommandError
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import RetrieveUpdateDestroyAPIView, get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
 from django.conf import settings
-from django.http import HttpResponseServerError
+from django.http import Http404, HttpResponseNotModified, HttpResponseServerError
+from django.utils.http import parse_etags, quote_etag
 
 import auditor
 
@@ -24,6 +28,8 @@ from libs.repos.git import set_git_repo
 
 _logger = logging.getLogger('polyaxon.views.repos')
 
+COMMIT_REGEX = re.compile(r'^[0-9a-f]{4,40}$')
+
 
 class RepoDetailView(RetrieveUpdateDestroyAPIView):
     """
@@ -43,7 +49,11 @@ class RepoDetailView(RetrieveUpdateDestroyAPIView):
 
 
 class DownloadFilesView(ProtectedView):
-    """Download repo code as tar.gz."""
+    """Download repo code as tar.gz.
+
+    The code is archived once per commit, `?commit=` selects the commit to download,
+    by default the last commit is used. The commit hash is used as the ETag.
+    """
     HANDLE_UNAUTHENTICATED = False
     authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
         InternalAuthentication,
@@ -60,10 +70,32 @@ class DownloadFilesView(ProtectedView):
                            actor_name=self.request.user.username)
         return repo
 
+    @staticmethod
+    def get_commit(repo, commit=None):
+        if not commit:
+            commit = repo.last_commit_hash
+            if not commit:
+                raise Http404('Repo has no commits.')
+            return commit
+
+        if not COMMIT_REGEX.match(commit):
+            raise ValidationError('Received an invalid commit `{}`.'.format(commit))
+        try:
+            return repo.git.commit(commit).hexsha
+        except (BadName, GitCommandError, ValueError):
+            raise Http404('Commit `{}` was not found.'.format(commit))
+
     def get(self, request, *args, **kwargs):
         repo = self.get_object()
-        archived_path, archive_name = archive_repo(repo.git, repo.project.name)
-        return self.redirect(path='{}/{}'.format(archived_path, archive_name))
+        commit = self.get_commit(repo=repo, commit=request.query_params.get('commit'))
+        etag = quote_etag(commit)
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            archive_path = archive_repo(repo.git, repo.project.unique_name, commit)
+            response = self.redirect(path=archive_path)
+        response['ETag'] = etag
+        return response
 
 
 class UploadFilesView(UploadView):
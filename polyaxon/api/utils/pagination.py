@@ -0,0 +1,86 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """Paginates a queryset on its `created_at` and `id`, newest first.
+
+    The next page is filtered on the last item of the previous page instead of being offset,
+    so every page is read from an index on `created_at`, and does not shift
+    when new items are created. The response has the format of `LimitOffsetPagination`,
+    and the pages requested with an `offset`, e.g. by the dashboard, are still supported.
+
+    The items are not counted, unlike `LimitOffsetPagination` the `count` is not the total
+    number of items: it is the number of items up to the end of the page,
+    plus one if there is a next page, so that the clients paging on the `count`,
+    e.g. the dashboard, can request the next page. The clients should rely on `next` instead.
+    """
+    cursor_query_param = 'before'
+    invalid_cursor_message = 'Invalid cursor'
+    template = None
+
+    def __init__(self):
+        self.count = None
+        self.limit = None
+        self.offset = 0
+        self.request = None
+        self.last = None
+        self.has_next = False
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        created_at, _, pk = cursor.rpartition('_')
+        try:
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except ValueError:
+            created_at = None
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def encode_cursor(self, item):
+        return '{}_{}'.format(item.created_at.isoformat(), item.pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.request = request
+        queryset = queryset.order_by('-created_at', '-pk')
+        cursor = self.decode_cursor(request)
+        if cursor:
+            created_at, pk = cursor
+            queryset = queryset.filter(Q(created_at__lt=created_at) |
+                                       Q(created_at=created_at, pk__lt=pk))
+            self.offset = 0
+        else:
+            self.offset = self.get_offset(request)
+
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        results = results[:self.limit]
+        self.last = results[-1] if results else None
+        self.count = self.offset + len(results) + int(self.has_next)
+        return results
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last))
+
+    def get_previous_link(self):
+        if not self.offset:
+            # The pages requested with a cursor only link to the next page
+            return None
+        return super().get_previous_link()
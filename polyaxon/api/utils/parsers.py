@@ -0,0 +1,26 @@
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from django.conf import settings
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline-delimited JSON, every non empty line is an item of the returned list."""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        data = []
+        for line_number, line in enumerate(stream, start=1):
+            line = line.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                data.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError('NDJSON parse error at line {} - {}'.format(line_number, exc))
+        return data
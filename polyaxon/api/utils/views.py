@@ -9,11 +9,15 @@ from rest_framework.views import APIView
 
 from django.conf import settings
 from django.core import exceptions as django_exceptions
-from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.urls import reverse
 
 import auditor
 
+from auditor.manager import default_manager as auditor_manager
+from libs.archive import get_files_in_path, get_outputs_archive_path, stream_outputs_archive
+from libs.utils import to_bool
+
 
 class PostAPIView(generics.CreateAPIView):
     def get_serializer(self, *args, **kwargs):
@@ -74,6 +78,37 @@ class ProtectedView(APIView):
         return self._redirect(path, filename)
 
 
+class OutputsDownloadView(ProtectedView):
+    """Base view to download an archive of outputs.
+
+    The archive is streamed to the client while it is being built, and cached.
+    Next downloads of the same unchanged outputs are redirected to the cached archive.
+    The archive compression can be disabled with `?compress=false`.
+    """
+    HANDLE_UNAUTHENTICATED = False
+
+    def get_outputs(self):
+        """Returns the outputs path and the unique name of the object to download."""
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        outputs_path, name = self.get_outputs()
+        compress = to_bool(request.query_params.get('compress', True),
+                           handle_none=True,
+                           exception=rest_exceptions.ValidationError)
+        files = get_files_in_path(outputs_path)
+        archive_path = get_outputs_archive_path(name=name, files=files, compress=compress)
+        filename = '{}{}'.format(name.replace('.', '_'), '.tar.gz' if compress else '.tar')
+        if os.path.exists(archive_path):
+            return self.redirect(path=archive_path, filename=filename)
+
+        response = StreamingHttpResponse(
+            stream_outputs_archive(files=files, archive_path=archive_path, compress=compress),
+            content_type='application/gzip' if compress else 'application/x-tar')
+        response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+        return response
+
+
 class UploadView(APIView):
     """Base view to handle data upload."""
     parser_classes = (MultiPartParser,)
@@ -108,6 +143,22 @@ class AuditorMixinView(object):
     update_event = None
     delete_event = None
 
+    def get_event_type(self):
+        return {
+            'get': self.get_event,
+            'put': self.update_event,
+            'patch': self.update_event,
+            'delete': self.delete_event,
+        }.get(self.request.method.lower())
+
+    def get_queryset(self):
+        """Selects the related objects the recorded event is created from with the instance."""
+        queryset = super().get_queryset()
+        event_type = self.get_event_type()
+        if event_type and auditor_manager.knows(event_type):
+            queryset = auditor_manager.get(event_type).select_related(queryset)
+        return queryset
+
     def get_object(self):
         instance = super().get_object()
         method = self.request.method.lower()
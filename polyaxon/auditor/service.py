@@ -3,7 +3,12 @@ from event_manager.event_service import EventService
 
 
 class AuditorService(EventService):
-    """An service that just passes the event to author services."""
+    """An service that passes the event to author services.
+
+    The event is created once and passed to the services through a transport,
+    see `auditor.transports`.
+    """
+    __all__ = ('record', 'record_events', 'flush', 'setup')
 
     event_manager = default_manager
 
@@ -11,24 +16,41 @@ class AuditorService(EventService):
         self.notifier = None
         self.tracker = None
         self.activitylogs = None
+        self.transport = None
+
+    @property
+    def services(self):
+        return self.notifier, self.tracker, self.activitylogs
 
-    def get_event(self, event_type, instance, **kwargs):
-        return {
-            'event_type': event_type,
-            'instance': instance,
-            'kwargs': kwargs
-        }
+    def get_services(self, event_type):
+        return [service for service in self.services
+                if service.is_setup and service.can_handle(event_type=event_type)]
 
     def record_event(self, event):
-        self.notifier.record(event_type=event['event_type'],
-                             instance=event['instance'],
-                             **event['kwargs'])
-        self.tracker.record(event_type=event['event_type'],
-                            instance=event['instance'],
-                            **event['kwargs'])
-        self.activitylogs.record(event_type=event['event_type'],
-                                 instance=event['instance'],
-                                 **event['kwargs'])
+        self.transport.send(event)
+
+    def dispatch_event(self, event):
+        for service in self.get_services(event.event_type):
+            service.record_event(event)
+
+    def record_events(self, events):
+        """Records a batch of events, every service records its events at once."""
+        from auditor.transports import load_instances
+
+        for service in self.services:
+            if not service.is_setup:
+                continue
+            service_events = [event for event in events
+                              if service.can_handle(event_type=event.event_type)]
+            if not service_events:
+                continue
+            if service.requires_instance:
+                load_instances(service_events)
+            service.record_events(service_events)
+
+    def flush(self):
+        """Records the events queued by the transport, if any."""
+        return self.transport.flush()
 
     def setup(self):
         super().setup()
@@ -38,7 +60,9 @@ class AuditorService(EventService):
         import notifier
         import activitylogs
         import tracker
+        from auditor.transports import get_transport
 
-        self.notifier = notifier
-        self.tracker = tracker
-        self.activitylogs = activitylogs
+        self.notifier = notifier.backend
+        self.tracker = tracker.backend
+        self.activitylogs = activitylogs.backend
+        self.transport = get_transport(self)
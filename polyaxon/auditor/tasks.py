@@ -0,0 +1,16 @@
+import auditor
+
+from auditor.manager import default_manager
+from auditor.transports import deserialize_events
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import AuditorCeleryTasks
+
+
+@celery_app.task(name=AuditorCeleryTasks.AUDITOR_RECORD_EVENTS, ignore_result=True)
+def auditor_record_events(events):
+    auditor.record_events(deserialize_events(events, event_manager=default_manager))
+
+
+@celery_app.task(name=AuditorCeleryTasks.AUDITOR_FLUSH_EVENTS, ignore_result=True)
+def auditor_flush_events():
+    auditor.flush()
@@ -0,0 +1,183 @@
+"""Transports passing the events recorded by the auditor to the services handling them.
+
+The `sync` transport (default) records the events with every service before returning,
+the other transports queue the events so that they are recorded in batches,
+out of the request path:
+
+ * `memory`: the events are kept in an in-process queue, flushed by a background thread.
+ * `redis`: the serialized events are pushed to a redis list,
+   flushed by a periodic task routed to the auditor events queue,
+   this queue needs to be consumed by a worker.
+ * `celery`: every serialized event is sent to a celery task.
+
+Events are serialized with their type, data, timestamp and a reference to their instance;
+the instances are only reloaded for the services that need them, e.g. the notifier.
+The events are only queued once the current transaction is committed,
+so that the consumers find the instances the events reference,
+and the events of a transaction rolled back are not recorded.
+"""
+import logging
+import queue
+import threading
+import time
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, transaction
+
+from libs.redis_db import RedisAuditorEvents
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import AuditorCeleryTasks
+
+_logger = logging.getLogger('polyaxon.auditor')
+
+
+def serialize_event(event):
+    value = event.serialize()
+    if event.instance is not None:
+        value['instance'] = [ContentType.objects.get_for_model(event.instance).id,
+                             event.instance.pk]
+    return value
+
+
+def deserialize_events(values, event_manager):
+    events = []
+    for value in values:
+        if not event_manager.knows(value['type']):
+            _logger.warning('Received an unknown event `%s`.', value['type'])
+            continue
+        instance_contenttype, instance_id = value.get('instance') or (None, None)
+        events.append(event_manager.get(value['type']).from_serialized(
+            value, instance_contenttype=instance_contenttype, instance_id=instance_id))
+    return events
+
+
+def load_instances(events):
+    """Sets the instances of events that were deserialized, with one query per content type.
+
+    The instances that do not exist anymore are left to `None`.
+    """
+    instances_ids = defaultdict(set)
+    for event in events:
+        if event.instance is None and event.instance_contenttype is not None:
+            instances_ids[event.instance_contenttype].add(event.instance_id)
+
+    instances = {}
+    for contenttype_id, ids in instances_ids.items():
+        content_type = ContentType.objects.get_for_id(contenttype_id)
+        instances[contenttype_id] = {
+            instance.pk: instance
+            for instance in content_type.get_all_objects_for_this_type(pk__in=ids)}
+
+    for event in events:
+        if event.instance is None and event.instance_contenttype is not None:
+            event.instance = instances[event.instance_contenttype].get(event.instance_id)
+
+
+class BaseTransport(object):
+    def __init__(self, service):
+        self.service = service
+
+    def send(self, event):
+        raise NotImplementedError
+
+    def flush(self):
+        """Records all the queued events, returns the number of events recorded."""
+        return 0
+
+
+class SyncTransport(BaseTransport):
+    def send(self, event):
+        self.service.dispatch_event(event)
+
+
+class MemoryTransport(BaseTransport):
+    """Keeps the events in memory, the events still queued when the process exits are lost."""
+
+    def __init__(self, service):
+        super().__init__(service)
+        self.queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def send(self, event):
+        transaction.on_commit(lambda: self.put(event))
+
+    def put(self, event):
+        self.queue.put(event)
+        self.start()
+
+    def start(self):
+        """Starts the flushing thread, it is started lazily to survive forks of the process."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='auditor')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(settings.AUDITOR_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:  # Keep flushing the next events
+                _logger.exception('Could not record the auditor events.')
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        count = 0
+        while True:
+            events = []
+            while len(events) < settings.AUDITOR_BATCH_SIZE:
+                try:
+                    events.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not events:
+                return count
+            self.service.record_events(events)
+            count += len(events)
+
+
+class RedisTransport(BaseTransport):
+    def send(self, event):
+        value = serialize_event(event)
+        transaction.on_commit(lambda: RedisAuditorEvents.push(value))
+
+    def flush(self):
+        count = 0
+        while True:
+            values = RedisAuditorEvents.pop(settings.AUDITOR_BATCH_SIZE)
+            if not values:
+                return count
+            try:
+                self.service.record_events(
+                    deserialize_events(values, event_manager=self.service.event_manager))
+            except Exception:
+                # The batch is recorded by the next flush
+                RedisAuditorEvents.push_back(values)
+                raise
+            count += len(values)
+
+
+class CeleryTransport(BaseTransport):
+    def send(self, event):
+        value = serialize_event(event)
+        transaction.on_commit(lambda: celery_app.send_task(
+            AuditorCeleryTasks.AUDITOR_RECORD_EVENTS, kwargs={'events': [value]}))
+
+
+TRANSPORTS = {
+    settings.AUDITOR_TRANSPORT_SYNC: SyncTransport,
+    settings.AUDITOR_TRANSPORT_MEMORY: MemoryTransport,
+    settings.AUDITOR_TRANSPORT_REDIS: RedisTransport,
+    settings.AUDITOR_TRANSPORT_CELERY: CeleryTransport,
+}
+
+
+def get_transport(service, transport=None):
+    return TRANSPORTS[transport or settings.AUDITOR_TRANSPORT](service)
@@ -9,6 +9,7 @@ class ExperimentLifeCycle(BaseStatuses):
     Props:
         * CREATED: created and waiting to be scheduled
         * BUILDING: started building imagesif necessary
+        * QUEUED: waiting for the cluster to have enough capacity to be scheduled
         * SCHEDULED: scheduled waiting to be picked
         * STARTING: picked and is starting (jobs are created/building/pending)
         * RUNNING: one or all jobs is still running
@@ -20,6 +21,7 @@ class ExperimentLifeCycle(BaseStatuses):
     CREATED = StatusOptions.CREATED
     RESUMING = StatusOptions.RESUMING
     BUILDING = StatusOptions.BUILDING
+    QUEUED = StatusOptions.QUEUED
     SCHEDULED = StatusOptions.SCHEDULED
     STARTING = StatusOptions.STARTING
     RUNNING = StatusOptions.RUNNING
@@ -32,6 +34,7 @@ class ExperimentLifeCycle(BaseStatuses):
         (CREATED, CREATED),
         (RESUMING, RESUMING),
         (BUILDING, BUILDING),
+        (QUEUED, QUEUED),
         (SCHEDULED, SCHEDULED),
         (STARTING, STARTING),
         (RUNNING, RUNNING),
@@ -42,12 +45,12 @@ class ExperimentLifeCycle(BaseStatuses):
     )
 
     VALUES = {
-        CREATED, RESUMING, BUILDING, SCHEDULED, STARTING, RUNNING,
+        CREATED, RESUMING, BUILDING, QUEUED, SCHEDULED, STARTING, RUNNING,
         SUCCEEDED, FAILED, STOPPED, UNKNOWN
     }
 
     PENDING_STATUS = {CREATED, RESUMING}
-    RUNNING_STATUS = {SCHEDULED, BUILDING, STARTING, RUNNING}
+    RUNNING_STATUS = {SCHEDULED, BUILDING, QUEUED, STARTING, RUNNING}
     DONE_STATUS = {FAILED, STOPPED, SUCCEEDED}
     FAILED_STATUS = {FAILED, }
 
@@ -55,11 +58,12 @@ class ExperimentLifeCycle(BaseStatuses):
         CREATED: {None, },
         RESUMING: {SUCCEEDED, STOPPED, },
         BUILDING: {CREATED, RESUMING, },
-        SCHEDULED: {CREATED, RESUMING, BUILDING, },
+        QUEUED: {CREATED, RESUMING, BUILDING, SCHEDULED, STARTING, },
+        SCHEDULED: {CREATED, RESUMING, BUILDING, QUEUED, },
         STARTING: {SCHEDULED, },
         RUNNING: {SCHEDULED, STARTING, UNKNOWN},
         SUCCEEDED: {SCHEDULED, STARTING, RUNNING, UNKNOWN, },
-        FAILED: {CREATED, RESUMING, BUILDING, SCHEDULED, STARTING, RUNNING, UNKNOWN, },
+        FAILED: {CREATED, RESUMING, BUILDING, QUEUED, SCHEDULED, STARTING, RUNNING, UNKNOWN, },
         STOPPED: set(VALUES) - {STOPPED, },
         UNKNOWN: set(VALUES),
     }
@@ -1,5 +1,6 @@
 class StatusOptions:
     CREATED = 'created'
+    QUEUED = 'queued'
     SCHEDULED = 'scheduled'
     BUILDING = 'building'
     RESUMING = 'resuming'
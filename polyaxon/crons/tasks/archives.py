@@ -0,0 +1,17 @@
+import logging
+
+from django.conf import settings
+
+from libs import archive
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import CronsCeleryTasks
+
+_logger = logging.getLogger('polyaxon.crons.archives')
+
+
+@celery_app.task(name=CronsCeleryTasks.ARCHIVES_CLEAN, ignore_result=True)
+def clean_archives():
+    for archive_root in (settings.REPOS_ARCHIVE_ROOT, settings.OUTPUTS_ARCHIVE_ROOT):
+        removed = archive.clean_archives(archive_root=archive_root, ttl=settings.ARCHIVES_TTL)
+        if removed:
+            _logger.info('Removed %s expired archives from `%s`.', removed, archive_root)
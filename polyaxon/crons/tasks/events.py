@@ -0,0 +1,14 @@
+import logging
+
+from libs.retention import clean_all_expired_events
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import CronsCeleryTasks
+
+_logger = logging.getLogger('polyaxon.crons.events')
+
+
+@celery_app.task(name=CronsCeleryTasks.EVENTS_CLEAN_EXPIRED, ignore_result=True)
+def clean_expired_events():
+    for model, deleted in clean_all_expired_events().items():
+        if deleted:
+            _logger.info('Deleted %s expired %s rows.', deleted, model.__name__)
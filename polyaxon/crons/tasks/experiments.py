@@ -1,7 +1,12 @@
-from django.db.models import Count
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.utils import timezone
 
 from constants.experiments import ExperimentLifeCycle
 from db.models.experiments import Experiment
+from libs.metrics import compact_experiment_metrics
 from polyaxon.celery_api import app as celery_app
 from polyaxon.settings import CronsCeleryTasks, SchedulerCeleryTasks
 
@@ -15,3 +20,18 @@ def sync_experiments_and_jobs_statuses():
         celery_app.send_task(
             SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
             kwargs={'experiment_id': experiment.id})
+
+
+@celery_app.task(name=CronsCeleryTasks.EXPERIMENTS_COMPACT_METRICS, ignore_result=True)
+def compact_experiments_metrics():
+    finished_before = timezone.now() - timedelta(seconds=settings.METRICS_COMPACTION_DELAY)
+    experiments = Experiment.objects.filter(
+        status__status__in=ExperimentLifeCycle.DONE_STATUS,
+        finished_at__lte=finished_before)
+    # Experiments are compacted once per run, the metrics left are not compactable
+    experiments = experiments.filter(Q(metrics_compacted_at__isnull=True) |
+                                     Q(metrics_compacted_at__lt=F('finished_at')))
+    experiments = experiments.annotate(num_metrics=Count('metrics')).filter(
+        num_metrics__gt=settings.METRICS_COMPACTION_MIN_COUNT)
+    for experiment in experiments:
+        compact_experiment_metrics(experiment=experiment)
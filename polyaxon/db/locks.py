@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+from libs.hashing import sha1_text
+
+
+def get_lock_id(key):
+    """Maps a string key to a positive signed bigint, the type of Postgres advisory lock ids."""
+    return int(sha1_text(key).hexdigest()[:15], 16)
+
+
+@contextmanager
+def advisory_xact_lock(key):
+    """Runs the block in a transaction holding a Postgres advisory lock for `key`.
+
+    The lock is released by Postgres when the transaction ends.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [get_lock_id(key)])
+        yield
@@ -0,0 +1,34 @@
+# Generated by Django 2.0.8 on 2018-08-20 10:12
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0005_node_scheduling'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentMetricChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=256)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('timestamps', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), size=None)),
+                ('values', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), size=None)),
+                ('experiment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_chunks', to='db.Experiment')),
+            ],
+            options={
+                'ordering': ['started_at'],
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='experimentmetricchunk',
+            index_together={('experiment', 'key')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.0.8 on 2018-08-24 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0006_experimentmetricchunk'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='experimentstatus',
+            name='status',
+            field=models.CharField(blank=True, choices=[('created', 'created'), ('resuming', 'resuming'), ('building', 'building'), ('queued', 'queued'), ('scheduled', 'scheduled'), ('starting', 'starting'), ('running', 'running'), ('succeeded', 'succeeded'), ('failed', 'failed'), ('stopped', 'stopped'), ('unknown', 'unknown')], default='created', max_length=64, null=True),
+        ),
+    ]
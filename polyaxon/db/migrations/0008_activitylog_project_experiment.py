@@ -0,0 +1,31 @@
+# Generated by Django 2.0.8 on 2018-08-27 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0007_experimentstatus_queued'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='experiment_id',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='project_id',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['project_id', '-created_at'], name='db_activitylog_project'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['experiment_id', '-created_at'], name='db_activitylog_experiment'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.0.8 on 2018-08-29 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0008_activitylog_project_experiment'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='created_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='notificationevent',
+            name='created_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.0.8 on 2018-09-03 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0009_events_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experiment',
+            name='metrics_compacted_at',
+            field=models.DateTimeField(blank=True, help_text='The last time the raw metrics of this experiment were compacted.', null=True),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 2.0.8 on 2018-09-04 09:30
+
+from django.db import migrations
+
+BATCH_SIZE = 10000
+
+BACKFILL_SQL = """
+UPDATE db_activitylog SET {field} = CASE
+    WHEN content_type_id = %(content_type_id)s THEN object_id
+    ELSE (context->>'{model}.id')::integer
+END
+WHERE id >= %(start)s AND id < %(end)s AND {field} IS NULL AND (
+    content_type_id = %(content_type_id)s OR context->>'{model}.id' ~ '^[0-9]+$'
+);
+"""
+
+
+def backfill_activitylogs(apps, schema_editor):
+    """Sets the project and experiment of the activity logs, in batches of ids.
+
+    The migration is not atomic, every batch is committed on its own
+    so that the table is not locked for the whole backfill.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT MIN(id), MAX(id) FROM db_activitylog')
+        min_id, max_id = cursor.fetchone()
+        if min_id is None:
+            return
+
+        for field, model in (('project_id', 'project'), ('experiment_id', 'experiment')):
+            cursor.execute(
+                "SELECT id FROM django_content_type WHERE app_label = 'db' AND model = %s",
+                [model])
+            content_type = cursor.fetchone()
+            content_type_id = content_type[0] if content_type else None
+            for start in range(min_id, max_id + 1, BATCH_SIZE):
+                cursor.execute(BACKFILL_SQL.format(field=field, model=model),
+                               {'content_type_id': content_type_id,
+                                'start': start,
+                                'end': start + BATCH_SIZE})
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('db', '0010_experiment_metrics_compacted_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_activitylogs, reverse_code=migrations.RunPython.noop),
+    ]
@@ -17,16 +17,27 @@ class ActivityLog(models.Model):
         blank=True,
         help_text='The user who triggered this activity, if null we assume a user `system`.')
     context = JSONField(help_text='Extra context information.')
-    created_at = models.DateTimeField()
+    # Indexed for the retention of the expired events
+    created_at = models.DateTimeField(db_index=True)
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
 
+    # Denormalized from the context, to list the activities of a project or an experiment
+    project_id = models.PositiveIntegerField(null=True, blank=True)
+    experiment_id = models.PositiveIntegerField(null=True, blank=True)
+
     class Meta:
         app_label = 'db'
         verbose_name = 'activity log'
         verbose_name_plural = 'activities logs'
+        indexes = [
+            models.Index(fields=['project_id', '-created_at'],
+                         name='db_activitylog_project'),
+            models.Index(fields=['experiment_id', '-created_at'],
+                         name='db_activitylog_experiment'),
+        ]
 
     def __str__(self):
         return '{} - {}'.format(self.event_type, self.created_at)
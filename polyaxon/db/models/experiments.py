@@ -1,7 +1,9 @@
 import uuid
 
+from datetime import timedelta
+
 from django.conf import settings
-from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields import ArrayField, JSONField
 from django.db import models
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -26,6 +28,7 @@ from db.models.utils import (
 )
 from event_manager.events.experiment import (
     EXPERIMENT_COPIED,
+    EXPERIMENT_NEW_METRIC,
     EXPERIMENT_RESTARTED,
     EXPERIMENT_RESUMED
 )
@@ -113,6 +116,10 @@ class Experiment(DiffModel,
         blank=True,
         null=True,
         related_name='+')
+    metrics_compacted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='The last time the raw metrics of this experiment were compacted.')
 
     class Meta:
         app_label = 'db'
@@ -211,6 +218,37 @@ class Experiment(DiffModel,
     def set_status(self, status, message=None, **kwargs):
         ExperimentStatus.objects.create(experiment=self, status=status, message=message)
 
+    def add_metrics(self, metrics):
+        """Creates a batch of metrics with a single insert.
+
+        Unlike creating the metrics one by one, the last metric is updated
+        and the `EXPERIMENT_NEW_METRIC` event is recorded only once per batch.
+
+        The metrics without a `created_at` are dated in the order they are sent,
+        one microsecond apart, so that each one keeps a distinct timestamp.
+
+        Args:
+            metrics: list of dicts with `values` and an optional `created_at`.
+        """
+        if not metrics:
+            return []
+
+        now = timezone.now()
+        metrics = ExperimentMetric.objects.bulk_create([
+            ExperimentMetric(experiment=self,
+                             values=metric['values'],
+                             created_at=(metric.get('created_at') or
+                                         now + timedelta(microseconds=i)))
+            for i, metric in enumerate(metrics)
+        ])
+        # On ties, the last metric sent wins
+        last_metric = max(reversed(metrics), key=lambda metric: metric.created_at)
+        if not self.metric or self.metric.created_at <= last_metric.created_at:
+            self.metric = last_metric
+            self.save(update_fields=['metric', 'updated_at'])
+        auditor.record(event_type=EXPERIMENT_NEW_METRIC, instance=self)
+        return metrics
+
     def _clone(self,
                cloning_strategy,
                event_type,
@@ -344,3 +382,28 @@ class ExperimentMetric(models.Model):
     class Meta:
         app_label = 'db'
         ordering = ['created_at']
+
+
+class ExperimentMetricChunk(models.Model):
+    """A model that represents a compacted series of values of an experiment metric key.
+
+    Raw `ExperimentMetric` rows of finished experiments are folded into
+    chunks holding the timestamps and values of one key as arrays.
+    """
+    experiment = models.ForeignKey(
+        'db.Experiment',
+        on_delete=models.CASCADE,
+        related_name='metric_chunks')
+    key = models.CharField(max_length=256)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    timestamps = ArrayField(models.FloatField())
+    values = ArrayField(models.FloatField())
+
+    def __str__(self):
+        return '{} <{}: {}>'.format(self.experiment.unique_name, self.key, self.started_at)
+
+    class Meta:
+        app_label = 'db'
+        ordering = ['started_at']
+        index_together = (('experiment', 'key'),)
@@ -17,7 +17,8 @@ class NotificationEvent(models.Model):
         blank=True,
         help_text='The user who triggered this activity, if null we assume a user `system`.')
     context = JSONField(help_text='Extra context information.')
-    created_at = models.DateTimeField()
+    # Indexed for the retention of the expired events
+    created_at = models.DateTimeField(db_index=True)
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
@@ -35,6 +35,13 @@ class RepoMixin(object):
 
         return git.get_last_commit(repo_path=self.path)
 
+    @property
+    def last_commit_hash(self):
+        """Returns the hash of the last commit without loading the commit object"""
+        from libs.repos import git
+
+        return git.get_head_commit_hash(repo_path=self.path)
+
     @property
     def last_code_reference(self):
         """Returns the last code reference"""
@@ -48,15 +48,15 @@ def get_job_image_info(project, job):
             raise ValueError('Repo was not found for `{}`.'.format(job_spec.build.git))
 
         repo_name = repo.name
-        last_commit = repo.last_commit
+        commit_hash = repo.last_commit_hash
     else:
         repo_name = project_name
-        last_commit = project.repo.last_commit
+        commit_hash = project.repo.last_commit_hash
 
     image_name = '{}/{}'.format(settings.REGISTRY_HOST, repo_name)
-    if not last_commit:
+    if not commit_hash:
         raise ValueError('Repo was not found for project `{}`.'.format(project))
-    return image_name, last_commit[0]
+    return image_name, commit_hash
 
 
 def get_notebook_image_info(project, job):
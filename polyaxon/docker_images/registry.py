@@ -0,0 +1,51 @@
+import logging
+import requests
+
+from django.conf import settings
+
+_logger = logging.getLogger('polyaxon.dockerizer.images')
+
+MANIFEST_MEDIA_TYPE = 'application/vnd.docker.distribution.manifest.v2+json'
+
+
+def get_registry_url():
+    if not settings.REGISTRY_HOST_NAME or not settings.REGISTRY_PORT:
+        return None
+    return 'http://{}:{}'.format(settings.REGISTRY_HOST_NAME, settings.REGISTRY_PORT)
+
+
+def image_exists(image_name, image_tag, timeout=5):
+    """Checks if the internal registry has a manifest for the image tag.
+
+    Returns:
+        bool or None: None if the registry is not configured or could not be queried.
+    """
+    registry_url = get_registry_url()
+    if not registry_url:
+        return None
+
+    # Image names are prefixed with the registry host used by the nodes
+    repository = image_name
+    if repository.startswith('{}/'.format(settings.REGISTRY_HOST)):
+        repository = repository[len(settings.REGISTRY_HOST) + 1:]
+
+    url = '{}/v2/{}/manifests/{}'.format(registry_url, repository, image_tag)
+    auth = None
+    if settings.REGISTRY_USER:
+        auth = (settings.REGISTRY_USER, settings.REGISTRY_PASSWORD)
+    try:
+        response = requests.head(url,
+                                 headers={'Accept': MANIFEST_MEDIA_TYPE},
+                                 auth=auth,
+                                 timeout=timeout)
+    except requests.exceptions.RequestException:
+        _logger.warning('Could not query the registry `%s`', registry_url, exc_info=True)
+        return None
+
+    if response.status_code == 200:
+        return True
+    if response.status_code == 404:
+        return False
+    _logger.warning('Unexpected status `%s` from the registry for `%s:%s`',
+                    response.status_code, repository, image_tag)
+    return None
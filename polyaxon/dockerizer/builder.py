@@ -13,9 +13,11 @@ from django.conf import settings
 import publisher
 
 from constants.jobs import JobLifeCycle
-from docker_images.image_info import get_image_name, get_tagged_image
-from dockerizer.dockerfile import POLYAXON_DOCKER_TEMPLATE
-from libs.http import download, untar_file
+from docker_images.image_info import get_image_info, get_image_name, get_tagged_image
+from docker_images.registry import image_exists
+from dockerizer.dockerfile import POLYAXON_DOCKER_CODE_TEMPLATE, POLYAXON_DOCKER_TEMPLATE
+from libs.hashing import sha1_text
+from libs.http import download
 from libs.paths.utils import delete_path
 from libs.repos import git
 from libs.utils import get_list
@@ -24,6 +26,8 @@ from polyaxon.settings import EventsCeleryTasks, SchedulerCeleryTasks
 
 _logger = logging.getLogger('polyaxon.dockerizer')
 
+BUILDS_ROOT = '/tmp/build'
+
 
 class DockerBuilderError(Exception):
     pass
@@ -32,6 +36,7 @@ class DockerBuilderError(Exception):
 class DockerBuilder(object):
     LATEST_IMAGE_TAG = 'latest'
     WORKDIR = '/code'
+    DEPENDENCIES_IMAGE_TAG = 'deps-{}'
 
     def __init__(self,
                  build_job,
@@ -55,6 +60,7 @@ class DockerBuilder(object):
         self.build_steps = get_list(build_steps)
         self.env_vars = get_list(env_vars)
         self.dockerfile_path = os.path.join(self.build_path, dockerfile_name)
+        self.dependencies_dockerfile_path = '{}.deps'.format(self.dockerfile_path)
         self.polyaxon_requirements_path = self._get_requirements_path()
         self.polyaxon_setup_path = self._get_setup_path()
         self.docker = APIClient(version='auto')
@@ -65,11 +71,16 @@ class DockerBuilder(object):
         return get_tagged_image(self.build_job)
 
     def check_image(self):
+        image_name, image_tag = get_image_info(self.build_job)
+        in_registry = image_exists(image_name=image_name, image_tag=image_tag)
+        if in_registry is not None:
+            return in_registry
         return self.docker.images(self.get_tagged_image())
 
     def clean(self):
-        # Clean dockerfile
+        # Clean dockerfiles
         delete_path(self.dockerfile_path)
+        delete_path(self.dependencies_dockerfile_path)
 
     def login_internal_registry(self):
         try:
@@ -179,7 +190,7 @@ class DockerBuilder(object):
             return setup_file
         return None
 
-    def render(self):
+    def render(self, copy_code=None):
         docker_template = jinja2.Template(POLYAXON_DOCKER_TEMPLATE)
         return docker_template.render(
             from_image=self.from_image,
@@ -190,15 +201,75 @@ class DockerBuilder(object):
             folder_name=self.folder_name,
             workdir=self.WORKDIR,
             nvidia_bin=settings.MOUNT_PATHS_NVIDIA.get('bin'),
-            copy_code=self.copy_code
+            copy_code=self.copy_code if copy_code is None else copy_code
         )
 
-    def build(self, nocache=False, memory_limit=None):
-        _logger.debug('Starting build in `%s`', self.repo_path)
-        # Checkout to the correct commit
-        if self.image_tag != self.LATEST_IMAGE_TAG:
-            git.checkout_commit(repo_path=self.repo_path, commit=self.image_tag)
+    def render_code(self, from_image):
+        docker_template = jinja2.Template(POLYAXON_DOCKER_CODE_TEMPLATE)
+        return docker_template.render(
+            from_image=from_image,
+            folder_name=self.folder_name,
+            workdir=self.WORKDIR
+        )
 
+    def get_from_image_digest(self):
+        """The digest of the manifest the base image resolves to in its registry.
+
+        The daemon queries the registry of the base image with its credentials,
+        so that a tag pointing to a new image gives a new digest.
+
+        Returns:
+            str or None: None if the registry could not be queried.
+        """
+        if '@' in self.from_image:
+            # The image is pinned by digest
+            return self.from_image.split('@', 1)[1]
+        try:
+            distribution = self.docker.inspect_distribution(self.from_image)
+        except DockerException:
+            _logger.warning('Could not resolve the digest of the base image `%s`',
+                            self.from_image, exc_info=True)
+            return None
+        return distribution.get('Descriptor', {}).get('digest')
+
+    def get_dependencies_hash(self, from_image_digest):
+        """Hash of everything the dependencies layers depend on.
+
+        i.e. the base image digest, the env vars, the build steps,
+        and the requirements and setup files.
+        """
+        dependencies_hash = sha1_text(from_image_digest,
+                                      json.dumps(self.build_steps),
+                                      json.dumps(self.env_vars),
+                                      settings.MOUNT_PATHS_NVIDIA.get('bin'))
+        for path in (self.polyaxon_requirements_path, self.polyaxon_setup_path):
+            if not path:
+                continue
+            dependencies_hash.update(path.encode('utf-8'))
+            with open(os.path.join(self.build_path, path), 'rb') as f:
+                dependencies_hash.update(f.read())
+        return dependencies_hash.hexdigest()
+
+    def get_dependencies_image(self):
+        """Returns the name and tag of the image with the dependencies installed.
+
+        Returns None if the digest of the base image is not known,
+        an image built from an older base image could be reused otherwise.
+        """
+        from_image_digest = self.get_from_image_digest()
+        if not from_image_digest:
+            return None
+        return self.image_name, self.DEPENDENCIES_IMAGE_TAG.format(
+            self.get_dependencies_hash(from_image_digest=from_image_digest))
+
+    def check_dependencies_image(self, image_name, image_tag):
+        in_registry = image_exists(image_name=image_name, image_tag=image_tag)
+        if in_registry is not None:
+            return in_registry
+        return self.docker.images('{}:{}'.format(image_name, image_tag))
+
+    @staticmethod
+    def _get_limits(memory_limit=None):
         limits = {
             # Always disable memory swap for building, since mostly
             # nothing good can come of that.
@@ -206,36 +277,87 @@ class DockerBuilder(object):
         }
         if memory_limit:
             limits['memory'] = memory_limit
+        return limits
 
-        # Create DockerFile
-        with open(self.dockerfile_path, 'w') as dockerfile:
-            rendered_dockerfile = self.render()
-            celery_app.send_task(
-                SchedulerCeleryTasks.BUILD_JOBS_SET_DOCKERFILE,
-                kwargs={'build_job_uuid': self.job_uuid, 'dockerfile': rendered_dockerfile})
-            dockerfile.write(rendered_dockerfile)
-
+    def _build(self, dockerfile_path, tag, pull, nocache=False, memory_limit=None):
         stream = self.docker.build(
             path=self.build_path,
-            tag=self.get_tagged_image(),
+            dockerfile=os.path.basename(dockerfile_path),
+            tag=tag,
             forcerm=True,
             rm=True,
-            pull=True,
+            pull=pull,
             nocache=nocache,
-            container_limits=limits)
+            container_limits=self._get_limits(memory_limit))
         return self._handle_log_stream(stream=stream)
 
-    def push(self):
-        stream = self.docker.push(self.image_name, tag=self.image_tag, stream=True)
+    def build_dependencies(self, image_name, image_tag, memory_limit=None):
+        """Builds and pushes the image with the dependencies installed, if it does not exist."""
+        if self.check_dependencies_image(image_name=image_name, image_tag=image_tag):
+            _logger.info('Reusing dependencies image `%s:%s`', image_name, image_tag)
+            return True
+
+        with open(self.dependencies_dockerfile_path, 'w') as dockerfile:
+            dockerfile.write(self.render(copy_code=False))
+
+        # The base image is only pulled when the dependencies change
+        if not self._build(dockerfile_path=self.dependencies_dockerfile_path,
+                           tag='{}:{}'.format(image_name, image_tag),
+                           pull=True,
+                           memory_limit=memory_limit):
+            return False
+
+        stream = self.docker.push(image_name, tag=image_tag, stream=True)
         return self._handle_log_stream(stream=stream)
 
+    def build(self, nocache=False, memory_limit=None):
+        _logger.debug('Starting build in `%s`', self.repo_path)
+        # Checkout to the correct commit
+        if self.image_tag != self.LATEST_IMAGE_TAG:
+            git.checkout_commit(repo_path=self.repo_path, commit=self.image_tag)
+
+        rendered_dockerfile = self.render()
+        celery_app.send_task(
+            SchedulerCeleryTasks.BUILD_JOBS_SET_DOCKERFILE,
+            kwargs={'build_job_uuid': self.job_uuid, 'dockerfile': rendered_dockerfile})
+
+        dependencies_image = None
+        if not nocache and self.copy_code:
+            dependencies_image = self.get_dependencies_image()
+
+        if not dependencies_image:
+            # Create DockerFile
+            with open(self.dockerfile_path, 'w') as dockerfile:
+                dockerfile.write(rendered_dockerfile)
+            return self._build(dockerfile_path=self.dockerfile_path,
+                               tag=self.get_tagged_image(),
+                               pull=True,
+                               nocache=nocache,
+                               memory_limit=memory_limit)
+
+        # The dependencies are installed in a separate image, tagged by their hash,
+        # so that builds of code only changes just add the code on top of it
+        dependencies_image, dependencies_tag = dependencies_image
+        if not self.build_dependencies(image_name=dependencies_image,
+                                       image_tag=dependencies_tag,
+                                       memory_limit=memory_limit):
+            return False
 
-def download_code(build_job, build_path, filename):
-    if not os.path.exists(build_path):
-        os.makedirs(build_path)
+        with open(self.dockerfile_path, 'w') as dockerfile:
+            dockerfile.write(self.render_code(
+                from_image='{}:{}'.format(dependencies_image, dependencies_tag)))
+        return self._build(dockerfile_path=self.dockerfile_path,
+                           tag=self.get_tagged_image(),
+                           pull=False,
+                           memory_limit=memory_limit)
+
+    def push(self):
+        stream = self.docker.push(self.image_name, tag=self.image_tag, stream=True)
+        return self._handle_log_stream(stream=stream)
 
-    filename = '{}/{}'.format(build_path, filename)
 
+def download_code(build_job, build_path):
+    """Downloads and extracts the code of the build job's commit to `build_path`."""
     if build_job.code_reference.repo:
         download_url = build_job.code_reference.repo.download_url
     elif build_job.code_reference.external_repo:
@@ -243,26 +365,34 @@ def download_code(build_job, build_path, filename):
     else:
         raise ValueError('Code reference for this build job does not have any repo.')
 
-    repo_file = download(
+    commit = build_job.code_reference.commit
+    repo_path = download(
         url=download_url,
-        filename=filename,
+        filename=build_path,
         logger=_logger,
-        headers={settings.HEADERS_INTERNAL.replace('_', '-'): 'dockerizer'})
-    untar_file(build_path=build_path, filename=filename, logger=_logger, delete_tar=True)
-    if not repo_file:
+        headers={settings.HEADERS_INTERNAL.replace('_', '-'): 'dockerizer'},
+        params={'commit': commit} if commit else None,
+        untar=True)
+    if not repo_path:
         send_status(build_job=build_job,
                     status=JobLifeCycle.FAILED,
                     message='Could not download code to build the image.')
+    return repo_path
 
 
 def build(build_job):
     """Build necessary code for a job to run"""
-    build_path = '/tmp/build'
-    filename = '_code'
-    download_code(build_job=build_job,
-                  build_path=build_path,
-                  filename=filename)
+    # Every build gets its own directory, concurrent builds do not share their code
+    build_path = os.path.join(BUILDS_ROOT, build_job.uuid.hex, 'code')
+    try:
+        if not download_code(build_job=build_job, build_path=build_path):
+            return False
+        return _build(build_job=build_job, build_path=build_path)
+    finally:
+        delete_path(os.path.dirname(build_path))
+
 
+def _build(build_job, build_path):
     _logger.info('Starting build ...')
     # Build the image
     docker_builder = DockerBuilder(
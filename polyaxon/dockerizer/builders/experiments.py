@@ -77,7 +77,7 @@ def get_experiment_repo_info(experiment):
         if not experiment.code_reference.commit:
             # Update experiment commit if not set already
             code_reference, _ = CodeReference.objects.get_or_create(repo=repo,
-                                                                    commit=repo.last_commit[0])
+                                                                    commit=repo.last_commit_hash)
             experiment.code_reference = code_reference
             experiment.save()
 
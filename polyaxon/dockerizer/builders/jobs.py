@@ -55,16 +55,16 @@ def get_job_repo_info(project, job):
 
         repo_path = repo.path
         repo_name = repo.name
-        last_commit = repo.last_commit
+        commit_hash = repo.last_commit_hash
     else:
         repo_path = project.repo.path
-        last_commit = project.repo.last_commit
+        commit_hash = project.repo.last_commit_hash
         repo_name = project_name
 
     image_name = '{}/{}'.format(settings.REGISTRY_HOST, repo_name)
-    if not last_commit:
+    if not commit_hash:
         raise Repo.DoesNotExist
-    image_tag = last_commit[0]
+    image_tag = commit_hash
     return {
         'repo_path': repo_path,
         'image_name': image_name,
@@ -38,3 +38,12 @@ RUN {{ step }}
 COPY {{ folder_name }} {{ workdir }}
 {% endif -%}
 """
+
+# Adds the code on top of an image having the dependencies already installed
+POLYAXON_DOCKER_CODE_TEMPLATE = """
+FROM {{ from_image }}
+
+WORKDIR {{ workdir }}
+
+COPY {{ folder_name }} {{ workdir }}
+"""
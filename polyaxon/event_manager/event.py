@@ -1,12 +1,14 @@
 import copy
 
-from uuid import uuid1
+from operator import attrgetter
+from uuid import UUID, uuid1
 
+from django.core.exceptions import FieldDoesNotExist
 from django.utils import timezone
 
 from constants import user_system
 from event_manager import event_context
-from libs.date_utils import to_timestamp
+from libs.date_utils import to_datetime, to_timestamp
 from libs.json_utils import dumps_htmlsafe
 
 
@@ -29,14 +31,120 @@ class Attribute(object):
         return self.attr_type(value)
 
 
+def get_relation_field(model, name):
+    """Returns the forward relation field `name` of a model, if it is one."""
+    if model is None or not hasattr(model, '_meta'):
+        return None
+    try:
+        field = model._meta.get_field(name)  # pylint:disable=protected-access
+    except FieldDoesNotExist:
+        return None
+    if field.is_relation and field.concrete and (field.many_to_one or field.one_to_one):
+        return field
+    return None
+
+
+def resolve_path(model, path):
+    """Resolves a dotted attribute path against a model.
+
+    The id of a related object is read from its foreign key, e.g. `project.user.id`
+    is read from `project.user_id`, without loading the user.
+
+    Returns:
+        tuple: the path to read, and the relations to select with the instance, if any.
+    """
+    relations = []
+    for i, name in enumerate(path):
+        field = get_relation_field(model, name)
+        if field is None:
+            break
+        if path[i + 1:] == [field.target_field.name]:
+            return relations + [field.attname], '__'.join(relations)
+        relations.append(name)
+        model = field.related_model
+    return path, '__'.join(relations)
+
+
+def get_path_getter(path):
+    getter = attrgetter('.'.join(path))
+
+    def get_value(instance):
+        try:
+            return getter(instance)
+        except AttributeError:
+            return None
+
+    return get_value
+
+
+class EventExtractor(object):
+    """The attributes of an event class, compiled once to extract their values.
+
+    The getters of the dotted attributes are compiled for every model
+    the event is created from, see `resolve_path`.
+    """
+
+    def __init__(self, attributes):
+        # The attributes with the name used in the keyword arguments
+        self.attributes = tuple((attr, attr.name.replace('.', '_')) for attr in attributes)
+        self._getters = {}
+        self._select_related = {}
+
+    def _compile(self, model):
+        getters = []
+        select_related = set()
+        for attr, _ in self.attributes:
+            path, relations = resolve_path(model, attr.name.split('.'))
+            getters.append(get_path_getter(path))
+            if relations:
+                select_related.add(relations)
+        self._select_related[model] = sorted(select_related)
+        self._getters[model] = getters
+
+    def get_getters(self, model):
+        if model not in self._getters:
+            self._compile(model)
+        return self._getters[model]
+
+    def get_select_related(self, model):
+        """The relations to select with the instances of a model to extract the values."""
+        if model not in self._select_related:
+            self._compile(model)
+        return self._select_related[model]
+
+    def get_instance_values(self, instance, **kwargs):
+        values = {}
+        getters = self.get_getters(instance.__class__)
+        for (attr, alias), get_value in zip(self.attributes, getters):
+            value = kwargs.get(alias)
+            if value is None:
+                value = get_value(instance)
+            values[attr.name] = value
+        return values
+
+    def extract(self, values):
+        data = {}
+        for attr, alias in self.attributes:
+            value = values.get(attr.name)
+            if value is None:
+                value = values.get(alias)
+            if attr.is_required and value is None:
+                raise ValueError('{} is required (cannot be None)'.format(
+                    attr.name,
+                ))
+            data[attr.name] = attr.extract(value)
+        return data
+
+
 class Event(object):
-    __slots__ = ['uuid', 'data', 'datetime', 'instance']
+    __slots__ = ['uuid', 'data', 'datetime', 'instance', 'instance_contenttype', 'instance_id']
 
     event_type = None  # The event type should ideally follow subject.action
     attributes = ()
     actor = False
     actor_id = 'actor_id'
     actor_name = 'actor_name'
+    _extractor = None
 
     @classmethod
     def get_event_attributes(cls):
@@ -46,26 +154,35 @@ class Event(object):
         return cls.attributes
 
     def __init__(self, datetime=None, instance=None, **items):
+        self._init(datetime=datetime, instance=instance)
+
+        known_items = {}
+        for attr, alias in self.get_extractor().attributes:
+            # Check plain attr name, and dot notation converted
+            for key in (attr.name, alias):
+                if key in items:
+                    known_items[key] = items.pop(key)
+
+        if items:
+            raise ValueError('Unknown attributes: {}'.format(
+                ', '.join(items.keys()),
+            ))
+
+        self._set_data(known_items)
+
+    def _init(self, datetime=None, instance=None):
         self.uuid = uuid1()
         self.datetime = datetime or timezone.now()
         self.instance = instance
+        # Only set on events recreated from their serialized form
+        self.instance_contenttype = None
+        self.instance_id = None
 
         if self.event_type is None:
             raise ValueError('Event is missing a type')
 
-        data = {}
-        for attr in self.get_event_attributes():
-            # Check plain attr name
-            item_value = items.pop(attr.name, None)
-            if item_value is None:
-                # Convert dot notation
-                item_value = items.pop(attr.name.replace('.', '_'), None)
-
-            if attr.is_required and item_value is None:
-                raise ValueError('{} is required (cannot be None)'.format(
-                    attr.name,
-                ))
-            data[attr.name] = attr.extract(item_value)
+    def _set_data(self, values):
+        data = self.get_extractor().extract(values)
 
         actor_id = data.get(self.actor_id)
         actor_name = data.get(self.actor_name)
@@ -80,13 +197,23 @@ class Event(object):
         if self.actor and (actor_id == user_system.USER_SYSTEM_ID and actor_name is None):
             data[self.actor_name] = user_system.USER_SYSTEM_NAME
 
-        if items:
-            raise ValueError('Unknown attributes: {}'.format(
-                ', '.join(items.keys()),
-            ))
-
         self.data = data
 
+    @classmethod
+    def get_extractor(cls):
+        """The extractor of the event attributes, compiled once per event class."""
+        extractor = cls.__dict__.get('_extractor')
+        if extractor is None:
+            extractor = EventExtractor(cls.get_event_attributes())
+            cls._extractor = extractor
+        return extractor
+
+    @classmethod
+    def select_related(cls, queryset):
+        """Selects the related objects needed to create the event from the instances."""
+        select_related = cls.get_extractor().get_select_related(queryset.model)
+        return queryset.select_related(*select_related) if select_related else queryset
+
     @classmethod
     def get_event_subject(cls):
         """Return the first part of the event_type
@@ -124,6 +251,31 @@ class Event(object):
         }
         return dumps_htmlsafe(data) if dumps else data
 
+    @classmethod
+    def from_serialized(cls, value, instance_contenttype=None, instance_id=None):
+        """Recreates an event from its serialized form, without extracting its attributes again.
+
+        The instance is not part of the serialized event, only its content type and id are kept.
+        """
+        event = cls.__new__(cls)
+        event.uuid = UUID(value['uuid'])
+        event.datetime = to_datetime(value['timestamp'])
+        event.data = value['data']
+        event.instance = None
+        event.instance_contenttype = instance_contenttype
+        event.instance_id = instance_id
+        return event
+
+    def get_content_object_fields(self):
+        """The generic relation fields referencing the instance of the event.
+
+        The content type and id are used when known, so that events of deleted instances
+        can still be referenced.
+        """
+        if self.instance_contenttype is not None:
+            return {'content_type_id': self.instance_contenttype, 'object_id': self.instance_id}
+        return {'content_object': self.instance}
+
     @classmethod
     def get_value_from_instance(cls, attr, instance):
         # Handle dot notation
@@ -138,11 +290,17 @@ class Event(object):
 
     @classmethod
     def from_instance(cls, instance, **kwargs):
-        values = {'instance': instance}
-        for attr in cls.get_event_attributes():
-            # Convert dot notation
-            value = kwargs.get(attr.name.replace('.', '_'))
-            if value is None:
-                value = cls.get_value_from_instance(attr=attr.name, instance=instance)
-            values[attr.name] = value
-        return cls(**values)
+        values = cls.get_extractor().get_instance_values(instance, **kwargs)
+        return cls.from_values(values, instance=instance)
+
+    @classmethod
+    def from_values(cls, values, datetime=None, instance=None):
+        """Creates an event from the already loaded values of its attributes.
+
+        The values are keyed by the attribute names, dotted or not, e.g. `project.user.id`
+        or `project_user_id`, the other keys are ignored.
+        """
+        event = cls.__new__(cls)
+        event._init(datetime=datetime, instance=instance)  # pylint:disable=protected-access
+        event._set_data(values)  # pylint:disable=protected-access
+        return event
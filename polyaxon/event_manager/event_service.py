@@ -5,6 +5,8 @@ class EventService(Service):
     __all__ = ('record', 'setup')
 
     event_manager = None
+    # Whether the service needs the instance of the events recorded in batches
+    requires_instance = False
 
     def can_handle(self, event_type):
         return isinstance(event_type, str) and self.event_manager.knows(event_type)
@@ -33,3 +35,11 @@ class EventService(Service):
         >>> record_event(Event())
         """
         pass
+
+    def record_events(self, events):
+        """ Record a batch of events.
+
+        >>> record_events([Event(), Event()])
+        """
+        for event in events:
+            self.record_event(event)
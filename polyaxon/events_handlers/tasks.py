@@ -1,10 +1,14 @@
 import logging
+import uuid
 
 from django.conf import settings
 from django.db import IntegrityError
 
+import stats
+
+from constants.jobs import JobLifeCycle
 from db.models.build_jobs import BuildJob
-from db.models.experiment_jobs import ExperimentJob
+from db.models.experiment_jobs import ExperimentJob, ExperimentJobStatus
 from db.models.experiments import Experiment
 from db.models.jobs import Job
 from db.models.nodes import ClusterEvent
@@ -12,8 +16,11 @@ from db.models.notebooks import NotebookJob
 from db.models.projects import Project
 from db.models.tensorboards import TensorboardJob
 from events_handlers.utils import safe_log_experiment_job, safe_log_job
+from libs.redis_db import RedisJobContainers
 from polyaxon.celery_api import app as celery_app
-from polyaxon.settings import EventsCeleryTasks
+from polyaxon.settings import EventsCeleryTasks, SchedulerCeleryTasks
+from schemas.utils import to_list
+from signals.run_time import set_job_finished_at, set_job_started_at
 
 _logger = logging.getLogger(__name__)
 
@@ -66,6 +73,60 @@ def events_handle_experiment_job_statuses(payload):
         pass
 
 
+@celery_app.task(name=EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES_BATCH)
+def events_handle_experiment_job_statuses_batch(payloads):
+    """Experiment jobs statuses coalesced by the statuses monitor.
+
+    The statuses are created with a single insert,
+    and the status of every experiment concerned is checked once.
+    """
+    payloads = {uuid.UUID(payload['details']['labels']['job_uuid']): payload
+                for payload in payloads}
+    _logger.debug('handling events statuses for %s jobs', len(payloads))
+
+    jobs = ExperimentJob.objects.filter(
+        uuid__in=payloads.keys()).select_related('status', 'experiment__status')
+    statuses = []
+    for job in jobs:
+        status = payloads[job.uuid]['status']
+        if job.is_done:
+            continue
+        if not JobLifeCycle.can_transition(status_from=job.last_status, status_to=status):
+            # Pods are bound to a node while still `building`
+            set_node_scheduling(job, payloads[job.uuid]['details']['node_name'])
+            continue
+        statuses.append(ExperimentJobStatus(job=job,
+                                            status=status,
+                                            message=payloads[job.uuid]['message'],
+                                            details=payloads[job.uuid]['details']))
+    if not statuses:
+        return
+
+    # `bulk_create` does not send the `post_save` signals, the jobs are updated here instead
+    experiments = {}
+    for status in ExperimentJobStatus.objects.bulk_create(statuses):
+        job = status.job
+        job.status = status
+        node_name = status.details['node_name']
+        if not job.node_scheduled and node_name is not None:
+            job.node_scheduled = node_name
+        set_job_started_at(instance=job, status=status.status)
+        set_job_finished_at(instance=job, status=status.status)
+        job.save()
+
+        if job.is_done:
+            RedisJobContainers.remove_job(job.uuid.hex)
+        experiments[job.experiment_id] = job.experiment
+
+    for experiment in experiments.values():
+        if experiment.is_done:
+            continue
+        celery_app.send_task(
+            SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
+            kwargs={'experiment_id': experiment.id},
+            countdown=1)
+
+
 @celery_app.task(name=EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES)
 def events_handle_job_statuses(payload):
     """Project jobs statuses"""
@@ -173,6 +234,8 @@ def events_handle_logs_experiment_job(experiment_name,
         return
 
     _logger.debug('handling log event for %s %s', experiment_uuid, job_uuid)
+    log_lines = to_list(log_lines)
+    stats.incr('events_handlers.logs.experiment_jobs.lines', amount=len(log_lines))
     if task_type and task_idx:
         log_lines = ['{}.{} -- {}'.format(task_type, int(task_idx) + 1, log_line)
                      for log_line in log_lines]
@@ -186,6 +249,7 @@ def events_handle_logs_job(job_uuid, job_name, log_lines):
         return
 
     _logger.debug('handling log event for %s', job_name)
+    stats.incr('events_handlers.logs.jobs.lines', amount=len(to_list(log_lines)))
     safe_log_job(job_name=job_name, log_lines=log_lines)
 
 
@@ -195,4 +259,5 @@ def events_handle_logs_build_job(job_uuid, job_name, log_lines):
         return
 
     _logger.debug('handling log event for %s', job_name)
+    stats.incr('events_handlers.logs.build_jobs.lines', amount=len(to_list(log_lines)))
     safe_log_job(job_name=job_name, log_lines=log_lines)
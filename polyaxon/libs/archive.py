@@ -1,15 +1,25 @@
+import fcntl
+import logging
 import os
 import tarfile
+import time
+import uuid
 
 from django.conf import settings
+from django.utils.encoding import force_bytes
 
-from libs.paths.experiments import get_experiment_outputs_path
-from libs.paths.jobs import get_job_outputs_path
+from libs.hashing import sha1_text
+
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+ARCHIVE_POLL_INTERVAL = 0.1
+# The delay in seconds after which an archive replaced by a newer one can be removed
+ARCHIVE_EVICTION_DELAY = 60
+
+_logger = logging.getLogger('polyaxon.libs.archive')
 
 
 def check_archive_path(archive_path=None):
-    if not os.path.exists(archive_path):
-        os.makedirs(archive_path)
+    os.makedirs(archive_path, exist_ok=True)
 
 
 def create_tarfile(files, tar_path):
@@ -27,32 +37,342 @@ def get_files_in_path(path):
     return result_files
 
 
-def archive_repo(repo_git, repo_name):
-    check_archive_path(settings.REPOS_ARCHIVE_ROOT)
-    archive_name = '{}.tar.gz'.format(repo_name)
-    with open(os.path.join(settings.REPOS_ARCHIVE_ROOT, archive_name), 'wb') as fp:
-        repo_git.archive(fp, format='tgz')
+def get_repo_archive_path(name, commit):
+    """Returns the path of the archive of a repo at a given commit."""
+    return os.path.join(settings.REPOS_ARCHIVE_ROOT, name, '{}.tar.gz'.format(commit))
+
+
+def archive_repo(repo_git, name, commit):
+    """Archives a repo at a given commit, the archive is created only once per commit.
+
+    Concurrent calls write to their own temporary files,
+    and atomically rename them to the same final path.
+    The archives of the other commits are kept, they are evicted by `clean_archives`.
+
+    Returns:
+        str: the archive path.
+    """
+    archive_path = get_repo_archive_path(name=name, commit=commit)
+    if os.path.exists(archive_path):
+        return archive_path
+
+    check_archive_path(os.path.dirname(archive_path))
+    tmp_path = '{}.{}.tmp'.format(archive_path, uuid.uuid4().hex)
+    try:
+        with open(tmp_path, 'wb') as fp:
+            repo_git.archive(fp, treeish=commit, format='tgz')
+        os.rename(tmp_path, archive_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return archive_path
+
+
+def get_files_manifest_hash(files):
+    """Returns a hash of the (path, size, mtime) of the files, used to key cached archives."""
+    manifest = sha1_text()
+    for f in files:
+        try:
+            stat = os.stat(f)
+        except FileNotFoundError:
+            continue
+        manifest.update(force_bytes('{}:{}:{}\n'.format(f, stat.st_size, stat.st_mtime)))
+    return manifest.hexdigest()
+
+
+def get_outputs_archive_path(name, files, compress=True):
+    """Returns the path of the cached archive for the current state of the outputs files."""
+    file_name = '{}.tar{}'.format(get_files_manifest_hash(files), '.gz' if compress else '')
+    return os.path.join(settings.OUTPUTS_ARCHIVE_ROOT, name, file_name)
+
+
+def get_archive_tmp_path(archive_path):
+    """Returns the path of an archive while it is being built."""
+    return '{}.tmp'.format(archive_path)
+
+
+class ArchiveLock(object):
+    """A non blocking file lock, it ensures that only one process builds a given archive."""
+
+    def __init__(self, archive_path):
+        self.lock_path = '{}.lock'.format(archive_path)
+        self._fp = None
+
+    def acquire(self):
+        self._fp = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(self._fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            self._fp.close()
+            self._fp = None
+            return False
+        # The stale locks are the ones not acquired since a while
+        os.utime(self.lock_path)
+        return True
+
+    def is_locked(self):
+        """Whether the lock is held, i.e. the archive is being built."""
+        if not os.path.exists(self.lock_path):
+            return False
+        fp = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(fp, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            return True
+        finally:
+            fp.close()
+        return False
+
+    def release(self):
+        if self._fp:
+            fcntl.flock(self._fp, fcntl.LOCK_UN)
+            self._fp.close()
+            self._fp = None
+
+
+class ArchiveFollowers(object):
+    """A file lock shared by the downloads following an archive being built.
+
+    The builder checks it when its own download is interrupted,
+    to complete the archive only if other downloads are still streaming it.
+    """
+
+    def __init__(self, archive_path):
+        self.lock_path = '{}.followers'.format(archive_path)
+        self._fp = None
+
+    def attach(self):
+        """Attaches a follower, it waits while the builder is aborting the archive."""
+        self._fp = open(self.lock_path, 'a')
+        fcntl.flock(self._fp, fcntl.LOCK_SH)
+
+    def acquire(self):
+        """Acquires the lock if no follower is attached, new followers wait for its release."""
+        self._fp = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(self._fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            self._fp.close()
+            self._fp = None
+            return False
+        return True
+
+    def release(self):
+        if self._fp:
+            fcntl.flock(self._fp, fcntl.LOCK_UN)
+            self._fp.close()
+            self._fp = None
+
 
-    return settings.REPOS_ARCHIVE_ROOT, archive_name
+class _ChunksWriter(object):
+    """A write only file object collecting the written chunks, and optionally copying them."""
 
+    def __init__(self, fp=None):
+        self.chunks = []
+        self.fp = fp
 
-def archive_experiment_outputs(persistence_outputs, experiment_name):
-    check_archive_path(settings.OUTPUTS_ARCHIVE_ROOT)
-    experiment_outputs_path = get_experiment_outputs_path(persistence_outputs=persistence_outputs,
-                                                          experiment_name=experiment_name)
-    outputs_files = get_files_in_path(experiment_outputs_path)
-    tar_name = "{}.tar.gz".format(experiment_name.replace('.', '_'))
-    create_tarfile(files=outputs_files, tar_path=os.path.join(settings.OUTPUTS_ARCHIVE_ROOT,
-                                                              tar_name))
-    return settings.OUTPUTS_ARCHIVE_ROOT, tar_name
+    def write(self, data):
+        self.chunks.append(data)
+        if self.fp:
+            self.fp.write(data)
+        return len(data)
 
+    def flush(self):
+        pass
 
-def archive_job_outputs(persistence_outputs, job_name):
-    check_archive_path(settings.OUTPUTS_ARCHIVE_ROOT)
-    job_outputs_path = get_job_outputs_path(persistence_outputs=persistence_outputs,
-                                            job_name=job_name)
-    outputs_files = get_files_in_path(job_outputs_path)
-    tar_name = "{}.tar.gz".format(job_name.replace('.', '_'))
-    create_tarfile(files=outputs_files, tar_path=os.path.join(settings.OUTPUTS_ARCHIVE_ROOT,
-                                                              tar_name))
-    return settings.OUTPUTS_ARCHIVE_ROOT, tar_name
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _add_regular_file(tar, tarinfo, path, writer, chunk_size):
+    """Adds a file to a stream tar, yielding the written data every `chunk_size` bytes.
+
+    This mirrors `TarFile.addfile` but avoids buffering big files in memory.
+    """
+    header = tarinfo.tobuf(tar.format, tar.encoding, tar.errors)
+    tar.fileobj.write(header)
+    tar.offset += len(header)
+    remaining = tarinfo.size
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                # The file was truncated since it was stat-ed, pad it to the declared size
+                chunk = tarfile.NUL * min(chunk_size, remaining)
+            remaining -= len(chunk)
+            tar.fileobj.write(chunk)
+            yield writer.pop()
+
+    blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+    if remainder > 0:
+        tar.fileobj.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+        blocks += 1
+    tar.offset += blocks * tarfile.BLOCKSIZE
+    tar.members.append(tarinfo)
+
+
+def stream_tarfile(files, fp=None, compress=True, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """Yields the content of a tar file of the files while it is being built.
+
+    If `fp` is passed, the content is also written to it.
+    """
+    writer = _ChunksWriter(fp=fp)
+    with tarfile.open(fileobj=writer, mode='w|gz' if compress else 'w|') as tar:
+        for f in files:
+            try:
+                tarinfo = tar.gettarinfo(f)
+            except FileNotFoundError:
+                continue
+            if tarinfo.isreg():
+                yield from _add_regular_file(tar=tar,
+                                             tarinfo=tarinfo,
+                                             path=f,
+                                             writer=writer,
+                                             chunk_size=chunk_size)
+            else:
+                tar.addfile(tarinfo)
+    yield writer.pop()
+
+
+def follow_archive(archive_path, lock, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """Yields the content of an archive built by another process, as it is written.
+
+    Returns:
+        bool: whether the archive was completed, `None` if its build was not started.
+    """
+    tmp_path = get_archive_tmp_path(archive_path)
+    followers = ArchiveFollowers(archive_path)
+    followers.attach()
+    try:
+        fp = None
+        while fp is None:
+            for path in (archive_path, tmp_path):
+                try:
+                    fp = open(path, 'rb')
+                    break
+                except FileNotFoundError:
+                    continue
+            if fp is None:
+                if not lock.is_locked() and not os.path.exists(archive_path):
+                    return None
+                time.sleep(ARCHIVE_POLL_INTERVAL)
+
+        with fp:
+            while True:
+                # The builder releases the lock once the archive is written
+                is_built = not lock.is_locked()
+                chunk = fp.read(chunk_size)
+                if chunk:
+                    yield chunk
+                elif is_built:
+                    break
+                else:
+                    time.sleep(ARCHIVE_POLL_INTERVAL)
+        return os.path.exists(archive_path)
+    finally:
+        followers.release()
+
+
+def evict_archives(archive_path, delay=ARCHIVE_EVICTION_DELAY):
+    """Removes the archives replaced by `archive_path` since more than `delay` seconds.
+
+    This bounds the archives kept for outputs that keep changing, e.g. of running experiments,
+    the archives replaced recently are kept for the downloads just redirected to them.
+
+    Returns:
+        int: the number of removed archives.
+    """
+    archive_dir = os.path.dirname(archive_path)
+    expired_at = time.time() - delay
+    removed = 0
+    for file_name in os.listdir(archive_dir):
+        file_path = os.path.join(archive_dir, file_name)
+        if file_path == archive_path or not file_name.endswith(('.tar', '.tar.gz')):
+            continue
+        try:
+            if os.stat(file_path).st_mtime >= expired_at:
+                continue
+            os.remove(file_path)
+        except FileNotFoundError:
+            continue
+        removed += 1
+    return removed
+
+
+def stream_outputs_archive(files, archive_path, compress=True):
+    """Yields the archive of the outputs files while it is being built.
+
+    Archives are built only once at a time: the process acquiring the build lock
+    writes the archive to `archive_path`, so that next downloads can be served from it,
+    and concurrent downloads stream the archive being written instead of building it.
+    Once written, the archive replaces the previous archives of the same outputs.
+    """
+    check_archive_path(os.path.dirname(archive_path))
+    lock = ArchiveLock(archive_path)
+    if not lock.acquire():
+        is_completed = yield from follow_archive(archive_path=archive_path, lock=lock)
+        if is_completed is not None:
+            if not is_completed:
+                _logger.warning('The archive `%s` was not completed by its builder.', archive_path)
+            return
+        if not lock.acquire():
+            yield from stream_tarfile(files=files, compress=compress)
+            return
+
+    tmp_path = get_archive_tmp_path(archive_path)
+    followers = ArchiveFollowers(archive_path)
+    try:
+        with open(tmp_path, 'wb') as fp:
+            chunks = stream_tarfile(files=files, fp=fp, compress=compress)
+            try:
+                for chunk in chunks:
+                    yield chunk
+            except GeneratorExit:
+                # The client disconnected, the archive is only completed for concurrent downloads
+                if followers.acquire():
+                    chunks.close()
+                    raise
+                for _ in chunks:
+                    pass
+        os.rename(tmp_path, archive_path)
+        evict_archives(archive_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        lock.release()
+        # The downloads waiting for the aborted archive build it
+        followers.release()
+
+
+def clean_archives(archive_root, ttl, now=None):
+    """Removes the archives, and the temporary and lock files, created more than `ttl` seconds ago.
+
+    Besides the archives replaced by newer ones, see `evict_archives`,
+    the archives are not removed by the requests, a download redirected to an archive,
+    or a build still downloading it, would read a missing file.
+    The files of the archives being built are kept.
+
+    Returns:
+        int: the number of removed files.
+    """
+    if not os.path.isdir(archive_root):
+        return 0
+
+    expired_at = (now or time.time()) - ttl
+    removed = 0
+    for root, _, files in os.walk(archive_root):
+        for file_name in files:
+            file_path = os.path.join(root, file_name)
+            name, ext = os.path.splitext(file_path)
+            if ext in ('.lock', '.followers', '.tmp') and ArchiveLock(name).is_locked():
+                continue
+            try:
+                if os.stat(file_path).st_mtime >= expired_at:
+                    continue
+                os.remove(file_path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+    return removed
@@ -0,0 +1,88 @@
+import math
+
+from libs.metrics import is_numeric
+
+
+def to_columns(rows):
+    """Pivots a list of dicts to a dict of columns aligned with the rows.
+
+    Missing values are filled with `None`.
+    """
+    columns = {}
+    for i, row in enumerate(rows):
+        for key, value in (row or {}).items():
+            if key not in columns:
+                columns[key] = [None] * len(rows)
+            columns[key][i] = value
+    return columns
+
+
+def get_summary(column):
+    """Returns count, min, max, mean and std of the numeric values of a column."""
+    values = [value for value in column if is_numeric(value)]
+    if not values:
+        return None
+    count = len(values)
+    mean = sum(values) / count
+    return {
+        'count': count,
+        'min': min(values),
+        'max': max(values),
+        'mean': mean,
+        'std': math.sqrt(sum((value - mean) ** 2 for value in values) / count),
+    }
+
+
+def get_correlation(column, target):
+    """Returns the Pearson correlation between two aligned columns, using only numeric pairs."""
+    pairs = [(x, y) for x, y in zip(column, target) if is_numeric(x) and is_numeric(y)]
+    if len(pairs) < 2:
+        return None
+    count = len(pairs)
+    mean_x = sum(x for x, _ in pairs) / count
+    mean_y = sum(y for _, y in pairs) / count
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in pairs)
+    std_x = math.sqrt(sum((x - mean_x) ** 2 for x, _ in pairs))
+    std_y = math.sqrt(sum((y - mean_y) ** 2 for _, y in pairs))
+    if not std_x or not std_y:
+        return None
+    return cov / (std_x * std_y)
+
+
+def compare_experiments(rows, summary=False, target=None):
+    """Builds a columnar comparison of experiments.
+
+    Args:
+        rows: iterable of (experiment id, declarations, last metric values).
+        summary: if True, summary statistics are computed for every numeric column.
+        target: a metric key, if provided the correlation of every declaration
+            with this metric is computed.
+
+    Returns:
+        dict: experiment ids, and the declarations and metrics columns aligned with them.
+    """
+    ids, declarations, metrics = [], [], []
+    for experiment_id, experiment_declarations, experiment_metric in rows:
+        ids.append(experiment_id)
+        declarations.append(experiment_declarations)
+        metrics.append(experiment_metric)
+
+    result = {
+        'ids': ids,
+        'declarations': to_columns(declarations),
+        'metrics': to_columns(metrics),
+    }
+
+    if summary:
+        result['summary'] = {
+            section: {key: get_summary(column) for key, column in result[section].items()}
+            for section in ('declarations', 'metrics')
+        }
+
+    if target:
+        target_column = result['metrics'].get(target, [None] * len(ids))
+        result['correlations'] = {
+            key: get_correlation(column, target_column)
+            for key, column in result['declarations'].items()
+        }
+    return result
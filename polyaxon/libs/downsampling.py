@@ -0,0 +1,78 @@
+"""Downsampling of (x, y) series for charting.
+
+All functions expect the points to be sorted by x.
+"""
+
+LTTB = 'lttb'
+MIN_MAX = 'minmax'
+
+METHODS = (LTTB, MIN_MAX)
+
+
+def lttb(points, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and the last points and, for every bucket in between,
+    the point forming the largest triangle with the previously selected point
+    and the average point of the next bucket.
+    """
+    n_points = len(points)
+    if threshold >= n_points or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n_points - 2) / (threshold - 2)
+    selected = 0
+    for i in range(threshold - 2):
+        # Average point of the next bucket
+        avg_start = int((i + 1) * bucket_size) + 1
+        avg_end = min(int((i + 2) * bucket_size) + 1, n_points)
+        avg_count = avg_end - avg_start
+        avg_x = sum(point[0] for point in points[avg_start:avg_end]) / avg_count
+        avg_y = sum(point[1] for point in points[avg_start:avg_end]) / avg_count
+
+        # Point of the current bucket with the largest triangle area
+        range_start = int(i * bucket_size) + 1
+        range_end = int((i + 1) * bucket_size) + 1
+        selected_x, selected_y = points[selected]
+        max_area = -1
+        next_selected = range_start
+        for j in range(range_start, range_end):
+            area = abs((selected_x - avg_x) * (points[j][1] - selected_y) -
+                       (selected_x - points[j][0]) * (avg_y - selected_y))
+            if area > max_area:
+                max_area = area
+                next_selected = j
+        sampled.append(points[next_selected])
+        selected = next_selected
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def min_max(points, threshold):
+    """Keeps the min and max points of `threshold / 2` equally sized buckets."""
+    n_points = len(points)
+    if threshold >= n_points or threshold < 2:
+        return list(points)
+
+    n_buckets = threshold // 2
+    bucket_size = n_points / n_buckets
+    sampled = []
+    for i in range(n_buckets):
+        bucket = points[int(i * bucket_size):int((i + 1) * bucket_size)]
+        if not bucket:
+            continue
+        low = min(bucket, key=lambda point: point[1])
+        high = max(bucket, key=lambda point: point[1])
+        sampled.extend(sorted({low, high}, key=lambda point: point[0]))
+    return sampled
+
+
+def downsample(points, threshold, method=LTTB):
+    if method == LTTB:
+        return lttb(points, threshold)
+    if method == MIN_MAX:
+        return min_max(points, threshold)
+    raise ValueError('Unknown downsampling method `{}`, '
+                     'supported methods are: {}'.format(method, METHODS))
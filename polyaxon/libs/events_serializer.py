@@ -0,0 +1,159 @@
+"""Compact binary serializer for the high volume event tasks.
+
+The logs, the resources and the job statuses are sent as msgpack messages instead of json.
+The keys of the resources and job states schemas are encoded as small integers,
+and the large messages, e.g. the batches of logs, are compressed.
+
+A message is one byte of flags followed by the msgpack body.
+msgpack is an optional dependency, the serializer is only registered when it is installed.
+"""
+import zlib
+
+from kombu.serialization import register
+
+from libs.json_utils import better_default_encoder
+
+NAME = 'polyaxon_events'
+CONTENT_TYPE = 'application/x-polyaxon-events'
+CONTENT_ENCODING = 'binary'
+
+FLAG_COMPRESSED = 1
+FLAG_KEYS = 2
+
+# The keys of `ContainerResourcesConfig`, `ContainerGPUResourcesConfig` and `JobStateConfig`.
+# N.B. the keys are encoded by index, new keys must be appended.
+KEYS = (
+    # Task kwargs
+    'payload',
+    'payloads',
+    'persist',
+    'log_lines',
+    'experiment_name',
+    'experiment_uuid',
+    'job_uuid',
+    'job_name',
+    'task_type',
+    'task_idx',
+    # Container resources
+    'container_id',
+    'n_cpus',
+    'cpu_percentage',
+    'percpu_percentage',
+    'memory_used',
+    'memory_limit',
+    'gpu_resources',
+    # Container gpu resources
+    'index',
+    'uuid',
+    'name',
+    'minor',
+    'bus_id',
+    'serial',
+    'temperature_gpu',
+    'utilization_gpu',
+    'power_draw',
+    'power_limit',
+    'memory_free',
+    'memory_total',
+    'memory_utilization',
+    # Job state
+    'status',
+    'message',
+    'details',
+    'event_type',
+    'labels',
+    'phase',
+    'node_name',
+    'deletion_timestamp',
+    'pod_conditions',
+    'container_statuses',
+    # Job labels
+    'app',
+    'project_name',
+    'experiment_group_name',
+    'role',
+    'type',
+    'project_uuid',
+    'experiment_group_uuid',
+)
+KEYS_INDICES = {key: index for index, key in enumerate(KEYS)}
+
+
+def has_str_keys(value):
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and has_str_keys(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return all(has_str_keys(item) for item in value)
+    return True
+
+
+def encode_keys(value):
+    if isinstance(value, dict):
+        return {KEYS_INDICES.get(key, key): encode_keys(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_keys(item) for item in value]
+    return value
+
+
+def decode_keys(value):
+    if isinstance(value, dict):
+        return {KEYS[key] if isinstance(key, int) else key: decode_keys(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_keys(item) for item in value]
+    return value
+
+
+def get_compress_threshold():
+    from django.conf import settings
+
+    return settings.EVENTS_SERIALIZER_COMPRESS_THRESHOLD
+
+
+def dumps(body, compress_threshold=None):
+    import msgpack  # pylint:disable=import-error
+
+    flags = 0
+    # The payloads with other keys than strings, i.e. ambiguous ones, are sent as is
+    if has_str_keys(body):
+        body = encode_keys(body)
+        flags |= FLAG_KEYS
+    # The uuids and dates are sent as strings, as with json
+    data = msgpack.packb(body, use_bin_type=True, default=better_default_encoder)
+    if compress_threshold is None:
+        compress_threshold = get_compress_threshold()
+    if compress_threshold and len(data) >= compress_threshold:
+        data = zlib.compress(data)
+        flags |= FLAG_COMPRESSED
+    return bytes([flags]) + data
+
+
+def loads(data):
+    import msgpack  # pylint:disable=import-error
+
+    flags, data = data[0], data[1:]
+    if flags & FLAG_COMPRESSED:
+        data = zlib.decompress(data)
+    options = {'raw': False}
+    if msgpack.version >= (1, 0, 0):
+        # The encoded keys are integers
+        options['strict_map_key'] = False
+    body = msgpack.unpackb(data, **options)
+    if flags & FLAG_KEYS:
+        body = decode_keys(body)
+    return body
+
+
+def register_serializer():
+    """Registers the serializer if msgpack is installed, returns whether it was registered."""
+    try:
+        import msgpack  # noqa pylint:disable=import-error,unused-import
+    except ImportError:
+        return False
+
+    register(NAME,
+             dumps,
+             loads,
+             content_type=CONTENT_TYPE,
+             content_encoding=CONTENT_ENCODING)
+    return True
@@ -1,6 +1,7 @@
 import os
 import requests
 import tarfile
+import threading
 
 from urllib.parse import parse_qs, urlencode, urljoin, urlparse, urlunparse
 
@@ -11,6 +12,12 @@ from django.conf import settings
 from libs.api import get_service_api_url
 from libs.permissions.authentication import InternalAuthentication
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+SESSION_POOL_SIZE = 10
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
 
 def absolute_uri(url):
     if not url or not settings.API_HOST:
@@ -41,6 +48,21 @@ def validate_url(url):
     return True
 
 
+def get_session(url):
+    """Returns the session of the url's host, so that the connections to the host are reused."""
+    parsed = urlparse(url)
+    key = (parsed.scheme, parsed.netloc)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.mount('{}://'.format(parsed.scheme),
+                          requests.adapters.HTTPAdapter(pool_connections=1,
+                                                        pool_maxsize=SESSION_POOL_SIZE))
+            _sessions[key] = session
+    return session
+
+
 def safe_request(
     url,
     method=None,
@@ -51,10 +73,11 @@ def safe_request(
     allow_redirects=False,
     timeout=30,
     verify_ssl=True,
+    session=None,
 ):
     """A slightly safer version of `request`."""
 
-    session = requests.Session()
+    session = session or requests.Session()
 
     kwargs = {}
 
@@ -94,8 +117,14 @@ def download(url,
              authentication_type=None,
              access_token=None,
              headers=None,
-             timeout=60):
-    """Download the file from the given url at the current path"""
+             params=None,
+             timeout=60,
+             untar=False):
+    """Download the file from the given url at the current path.
+
+    If `untar` is True, the downloaded tar is extracted on the fly
+    to the `filename` directory instead of being written to a file.
+    """
     authentication_type = authentication_type or InternalAuthentication.keyword
     if authentication_type == InternalAuthentication.keyword and not access_token:
         access_token = settings.INTERNAL_SECRET_TOKEN
@@ -116,6 +145,7 @@ def download(url,
         logger.info("Downloading file from %s using %s" % (url, authentication_type))
         response = requests.get(url,
                                 headers=request_headers,
+                                params=params,
                                 timeout=timeout,
                                 stream=True)
 
@@ -124,8 +154,16 @@ def download(url,
                          extra={'stack': True})
             return None
 
+        if untar:
+            response.raw.decode_content = True
+            with tarfile.open(fileobj=response.raw,
+                              mode='r|*',
+                              bufsize=DOWNLOAD_CHUNK_SIZE) as tar:
+                tar.extractall(filename)
+            return filename
+
         with open(filename, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=1024):
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                 if chunk:
                     f.write(chunk)
         return filename
@@ -133,6 +171,9 @@ def download(url,
     except requests.exceptions.RequestException:
         logger.error("Download exception", exc_info=True)
         return None
+    except tarfile.TarError:
+        logger.error("Untar exception", exc_info=True)
+        return None
 
 
 def untar_file(build_path, filename, logger, delete_tar=False):
@@ -0,0 +1,136 @@
+import logging
+import threading
+
+from functools import partial
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+from libs.redis_db import RedisWatchStates
+
+_logger = logging.getLogger('polyaxon.monitors.watch')
+
+ADDED = 'ADDED'
+MODIFIED = 'MODIFIED'
+DELETED = 'DELETED'
+ERROR = 'ERROR'
+
+# The resource version to resume from is too old, and was compacted by Kubernetes
+HTTP_GONE = 410
+
+
+class WatchAcks(object):
+    """Defers marking the events yielded by `stream` as processed until they are acknowledged.
+
+    A consumer buffering the events acknowledges them once the buffer is handed off,
+    so that the events still buffered when the consumer is killed are streamed again.
+    The events are marked as processed in the order they were yielded.
+    """
+
+    def __init__(self, name):
+        self.watch_state = RedisWatchStates(name)
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def set_processed(self, uid, resource_version, deleted=False):
+        with self._lock:
+            self._pending.append(partial(self.watch_state.set_processed,
+                                         uid=uid,
+                                         resource_version=resource_version,
+                                         deleted=deleted))
+
+    def reset(self, objects_versions, resource_version):
+        with self._lock:
+            self._pending.append(partial(self.watch_state.reset,
+                                         objects_versions=objects_versions,
+                                         resource_version=resource_version))
+
+    def count(self):
+        """Returns the number of events consumed and not acknowledged yet."""
+        with self._lock:
+            return len(self._pending)
+
+    def acknowledge(self, count):
+        """Marks the first `count` pending events as processed."""
+        with self._lock:
+            pending, self._pending = self._pending[:count], self._pending[count:]
+        for set_processed in pending:
+            set_processed()
+
+
+def relist(list_func, watch_state, acks=None, **kwargs):
+    """Yields an event for every listed object that changed since it was last processed.
+
+    The objects deleted while nothing was watching are only forgotten,
+    since their last state is not known anymore.
+
+    Returns:
+        str: the resource version of the list, to watch from.
+    """
+    response = list_func(**kwargs)
+    processed_versions = watch_state.get_objects_versions()
+    objects_versions = {}
+    for obj in response.items:
+        uid = obj.metadata.uid
+        objects_versions[uid] = obj.metadata.resource_version
+        if processed_versions.get(uid) == obj.metadata.resource_version:
+            continue
+        yield {'type': MODIFIED if uid in processed_versions else ADDED, 'object': obj}
+
+    n_deleted = len(set(processed_versions) - set(objects_versions))
+    if n_deleted:
+        _logger.info('%s objects were deleted since they were last watched.', n_deleted)
+    (acks or watch_state).reset(objects_versions=objects_versions,
+                                resource_version=response.metadata.resource_version)
+    return response.metadata.resource_version
+
+
+def stream(name, list_func, acks=None, **kwargs):
+    """Watches the objects of `list_func`, resuming from the last processed resource version.
+
+    When no resource version was processed yet, or the last one is gone,
+    the objects are listed and only the ones that changed are yielded before watching.
+    The events replayed by Kubernetes for objects that were already processed are dropped.
+
+    The events are marked as processed once the consumer asks for the next event,
+    or, if `acks` is passed, once the consumer acknowledges them.
+
+    Args:
+        name: the name of the watch, used to keep its state.
+        list_func: the Kubernetes api list function of the objects to watch.
+        acks: `WatchAcks` of the watch, if the consumer acknowledges the events.
+        kwargs: the arguments of `list_func`, e.g. namespace and label_selector.
+    """
+    watch_state = RedisWatchStates(name)
+    resource_version = watch_state.get_resource_version()
+    if resource_version is None:
+        resource_version = yield from relist(list_func, watch_state, acks=acks, **kwargs)
+
+    w = watch.Watch()
+    try:
+        for event in w.stream(list_func, resource_version=resource_version, **kwargs):
+            if event['type'] == ERROR:
+                status = event.get('raw_object') or {}
+                if status.get('code') == HTTP_GONE:
+                    _logger.info('Watch `%s` expired at `%s`, the objects will be listed again.',
+                                 name, resource_version)
+                    watch_state.clear_resource_version()
+                else:
+                    _logger.warning('Watch `%s` received an error: %s', name, status)
+                w.stop()
+                return
+
+            metadata = event['object'].metadata
+            deleted = event['type'] == DELETED
+            if not deleted and watch_state.is_processed(metadata.uid, metadata.resource_version):
+                continue
+            yield event
+            (acks or watch_state).set_processed(uid=metadata.uid,
+                                                resource_version=metadata.resource_version,
+                                                deleted=deleted)
+    except ApiException as e:
+        if e.status != HTTP_GONE:
+            raise
+        _logger.info('Watch `%s` expired at `%s`, the objects will be listed again.',
+                     name, resource_version)
+        watch_state.clear_resource_version()
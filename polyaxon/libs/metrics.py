@@ -0,0 +1,112 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from db.models.experiments import ExperimentMetric, ExperimentMetricChunk
+from libs.date_utils import to_timestamp
+
+
+def is_numeric(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def get_metric_series(experiment, keys=None, start=None, end=None):
+    """Returns the history of the numeric metrics of an experiment.
+
+    The history is reconstructed from both the compacted chunks and the raw metrics.
+
+    Args:
+        experiment: the experiment to get the metrics for.
+        keys: if provided, only these metric keys are returned.
+        start: datetime, if provided only points created after this datetime are returned.
+        end: datetime, if provided only points created before this datetime are returned.
+
+    Returns:
+        dict: metric key -> list of (timestamp, value) sorted by timestamp.
+    """
+    series = defaultdict(list)
+
+    chunks = ExperimentMetricChunk.objects.filter(experiment=experiment)
+    metrics = ExperimentMetric.objects.filter(experiment=experiment)
+    if keys:
+        chunks = chunks.filter(key__in=keys)
+    if start:
+        chunks = chunks.filter(finished_at__gte=start)
+        metrics = metrics.filter(created_at__gte=start)
+    if end:
+        chunks = chunks.filter(started_at__lte=end)
+        metrics = metrics.filter(created_at__lte=end)
+
+    for key, timestamps, values in chunks.values_list('key', 'timestamps', 'values'):
+        series[key].extend(zip(timestamps, values))
+
+    if start or end:
+        # Chunks are selected by overlap, their points need to be trimmed
+        start_ts = to_timestamp(start) if start else float('-inf')
+        end_ts = to_timestamp(end) if end else float('inf')
+        for key in series:
+            series[key] = [point for point in series[key] if start_ts <= point[0] <= end_ts]
+
+    for created_at, values in metrics.order_by('created_at', 'id').values_list(
+            'created_at', 'values').iterator():
+        timestamp = to_timestamp(created_at)
+        for key, value in values.items():
+            if keys and key not in keys:
+                continue
+            if is_numeric(value):
+                series[key].append((timestamp, value))
+
+    for points in series.values():
+        points.sort(key=lambda point: point[0])
+    return dict(series)
+
+
+def compact_experiment_metrics(experiment, chunk_size=10000, batch_size=1000):
+    """Folds the raw metrics of an experiment into columnar chunks per key.
+
+    The metric referenced as the experiment's last metric, as well as
+    metrics with non numeric values, are kept as raw rows.
+    The experiment is marked as compacted, even if none of its metrics could be compacted.
+
+    Returns:
+        int: the number of raw metrics compacted.
+    """
+    metrics = ExperimentMetric.objects.filter(experiment=experiment)
+    if experiment.metric_id:
+        metrics = metrics.exclude(id=experiment.metric_id)
+
+    compacted_ids = []
+    series = defaultdict(list)
+    for metric_id, created_at, values in metrics.order_by('created_at', 'id').values_list(
+            'id', 'created_at', 'values').iterator():
+        if not values or not all(is_numeric(value) for value in values.values()):
+            continue
+        compacted_ids.append(metric_id)
+        for key, value in values.items():
+            series[key].append((created_at, value))
+
+    experiment.metrics_compacted_at = timezone.now()
+    if not compacted_ids:
+        experiment.save(update_fields=['metrics_compacted_at'])
+        return 0
+
+    chunks = []
+    for key, points in series.items():
+        for i in range(0, len(points), chunk_size):
+            chunk_points = points[i:i + chunk_size]
+            chunks.append(ExperimentMetricChunk(
+                experiment=experiment,
+                key=key,
+                started_at=chunk_points[0][0],
+                finished_at=chunk_points[-1][0],
+                timestamps=[to_timestamp(point[0]) for point in chunk_points],
+                values=[float(point[1]) for point in chunk_points]))
+
+    with transaction.atomic():
+        ExperimentMetricChunk.objects.bulk_create(chunks)
+        experiment.save(update_fields=['metrics_compacted_at'])
+        for i in range(0, len(compacted_ids), batch_size):
+            ExperimentMetric.objects.filter(id__in=compacted_ids[i:i + batch_size]).delete()
+
+    return len(compacted_ids)
@@ -1,11 +1,10 @@
 import os
-import shutil
 
 from django.conf import settings
 
 from db.models.cloning_strategies import CloningStrategy
 from libs.paths.outputs_paths import get_outputs_paths
-from libs.paths.utils import create_path, delete_path
+from libs.paths.utils import copy_tree, create_path, delete_path
 
 
 def get_experiment_outputs_path(persistence_outputs,
@@ -74,7 +73,11 @@ def create_experiment_outputs_path(persistence_outputs, experiment_name):
 def copy_experiment_outputs(persistence_outputs_from,
                             persistence_outputs_to,
                             experiment_name_from,
-                            experiment_name_to):
+                            experiment_name_to,
+                            is_done=False):
+    """Copies the outputs of an experiment, they are hard linked if the experiment is done."""
     path_from = get_experiment_outputs_path(persistence_outputs_from, experiment_name_from)
     path_to = get_experiment_outputs_path(persistence_outputs_to, experiment_name_to)
-    shutil.copytree(path_from, path_to)
+    return copy_tree(path_from,
+                     path_to,
+                     use_hardlinks=is_done and settings.OUTPUTS_COPY_HARDLINKS)
@@ -1,9 +1,20 @@
+import fcntl
 import logging
 import os
 import shutil
 
 _logger = logging.getLogger('polyaxon.libs.paths')
 
+# Linux ioctl to clone a file's extents (copy-on-write), supported by btrfs, xfs and ocfs2.
+FICLONE = 0x40049409
+
+
+class CopyMethods(object):
+    REFLINK = 'reflink'
+    HARDLINK = 'hardlink'
+    COPY = 'copy'
+    SKIP = 'skip'
+
 
 def delete_path(path):
     if not os.path.exists(path):
@@ -47,3 +58,101 @@ def copy_to_tmp_dir(path, dir_name):
     except FileExistsError as e:
         _logger.warning('Path already exists `%s`, exception %s', path, e)
     return tmp_path
+
+
+def is_same_file(path_from, path_to):
+    """Checks if `path_to` is an unchanged copy of `path_from` based on the size and mtime."""
+    try:
+        stat_to = os.stat(path_to)
+    except FileNotFoundError:
+        return False
+    stat_from = os.stat(path_from)
+    return stat_from.st_size == stat_to.st_size and stat_from.st_mtime == stat_to.st_mtime
+
+
+def reflink_file(path_from, path_to):
+    """Clones a file with copy-on-write, raises `OSError` if the filesystem does not allow it."""
+    with open(path_from, 'rb') as file_from:
+        with open(path_to, 'wb') as file_to:
+            try:
+                fcntl.ioctl(file_to.fileno(), FICLONE, file_from.fileno())
+            except OSError:
+                file_to.close()
+                os.remove(path_to)
+                raise
+    shutil.copystat(path_from, path_to)
+
+
+def link_file(path_from, path_to):
+    """Hard links a file, the link shares its content and its mode with the original file."""
+    os.link(path_from, path_to)
+
+
+def copy_file(path_from, path_to, use_hardlinks=False):
+    """Copies a file with the cheapest method allowed by the filesystem.
+
+    Unchanged files are skipped, then a copy-on-write clone is tried,
+    then a hard link if allowed, and finally a normal copy.
+    Hard links must only be used for files that are not updated anymore.
+
+    Returns:
+        str: the method used.
+    """
+    if is_same_file(path_from, path_to):
+        return CopyMethods.SKIP
+    if os.path.lexists(path_to):
+        os.remove(path_to)
+
+    try:
+        reflink_file(path_from, path_to)
+        return CopyMethods.REFLINK
+    except OSError:
+        pass
+
+    if use_hardlinks:
+        try:
+            link_file(path_from, path_to)
+            return CopyMethods.HARDLINK
+        except OSError:
+            pass
+
+    shutil.copy2(path_from, path_to)
+    return CopyMethods.COPY
+
+
+def copy_tree(path_from, path_to, use_hardlinks=False):
+    """Copies a directory incrementally, only new or changed files are copied.
+
+    Unlike `shutil.copytree`, the destination may already exist,
+    and the copy is proportional to the changed data when the filesystem
+    supports copy-on-write clones or when hard links are allowed.
+
+    Returns:
+        dict: the number of files per copy method.
+    """
+    if not os.path.isdir(path_from):
+        raise FileNotFoundError('Path `{}` does not exist'.format(path_from))
+
+    stats = {method: 0 for method in (CopyMethods.REFLINK,
+                                      CopyMethods.HARDLINK,
+                                      CopyMethods.COPY,
+                                      CopyMethods.SKIP)}
+    for root, dirs, files in os.walk(path_from):
+        root_to = os.path.join(path_to, os.path.relpath(root, path_from))
+        os.makedirs(root_to, exist_ok=True)
+        for dir_name in dirs:
+            dir_path = os.path.join(root, dir_name)
+            if os.path.islink(dir_path):
+                link_to = os.path.join(root_to, dir_name)
+                if not os.path.lexists(link_to):
+                    os.symlink(os.readlink(dir_path), link_to)
+        for file_name in files:
+            file_from = os.path.join(root, file_name)
+            file_to = os.path.join(root_to, file_name)
+            if os.path.islink(file_from):
+                if os.path.lexists(file_to):
+                    os.remove(file_to)
+                os.symlink(os.readlink(file_from), file_to)
+                continue
+            stats[copy_file(file_from, file_to, use_hardlinks=use_hardlinks)] += 1
+    return stats
@@ -1,4 +1,7 @@
+import hashlib
 import json
+import math
+import time
 import uuid
 
 from libs.json_utils import dumps, loads
@@ -192,6 +195,296 @@ class RedisToStream(BaseRedisDb):
         red.hset(cls.KEY_JOB_LATEST_STATS, job, json.dumps(payload))
 
 
+class RedisWatchStates(BaseRedisDb):
+    """Tracks the progress of a Kubernetes watch, so that it can be resumed after a restart.
+
+    The version of every watched object is kept to drop the events that were already processed,
+    and to only process the objects that changed when the watch must list them again.
+    """
+    KEY_RESOURCE_VERSION = 'WATCH_RESOURCE_VERSION:{}'  # Redis string, last processed version
+    KEY_OBJECTS_VERSIONS = 'WATCH_OBJECTS_VERSIONS:{}'  # Redis hash, maps uids to their version
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    def __init__(self, name):
+        self.key_resource_version = self.KEY_RESOURCE_VERSION.format(name)
+        self.key_objects_versions = self.KEY_OBJECTS_VERSIONS.format(name)
+        self._red = self._get_redis()
+
+    def get_resource_version(self):
+        resource_version = self._red.get(self.key_resource_version)
+        return resource_version.decode('utf-8') if resource_version else None
+
+    def clear_resource_version(self):
+        self._red.delete(self.key_resource_version)
+
+    def get_objects_versions(self):
+        return {uid.decode('utf-8'): resource_version.decode('utf-8')
+                for uid, resource_version in self._red.hgetall(self.key_objects_versions).items()}
+
+    def is_processed(self, uid, resource_version):
+        processed_version = self._red.hget(self.key_objects_versions, uid)
+        return processed_version is not None and processed_version.decode('utf-8') == (
+            resource_version)
+
+    def set_processed(self, uid, resource_version, deleted=False):
+        pipe = self._red.pipeline()
+        if deleted:
+            pipe.hdel(self.key_objects_versions, uid)
+        else:
+            pipe.hset(self.key_objects_versions, uid, resource_version)
+        pipe.set(self.key_resource_version, resource_version)
+        pipe.execute()
+
+    def reset(self, objects_versions, resource_version):
+        """Replaces the state with the objects listed at `resource_version`."""
+        pipe = self._red.pipeline()
+        pipe.delete(self.key_objects_versions)
+        if objects_versions:
+            pipe.hmset(self.key_objects_versions, objects_versions)
+        pipe.set(self.key_resource_version, resource_version)
+        pipe.execute()
+
+
+class RedisAuditorEvents(BaseRedisDb):
+    """Queues the serialized auditor events to be recorded in batches."""
+
+    KEY_EVENTS = 'AUDITOR_EVENTS'  # Redis list: serialized events, oldest first
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    @classmethod
+    def push(cls, event):
+        red = cls._get_redis()
+        red.rpush(cls.KEY_EVENTS, dumps(event))
+
+    @classmethod
+    def pop(cls, count):
+        """Removes and returns the oldest `count` events."""
+        pipe = cls._get_redis().pipeline()
+        pipe.lrange(cls.KEY_EVENTS, 0, count - 1)
+        pipe.ltrim(cls.KEY_EVENTS, count, -1)
+        events, _ = pipe.execute()
+        return [loads(event.decode('utf-8')) for event in events]
+
+    @classmethod
+    def push_back(cls, events):
+        """Queues back events that were popped, ahead of the other events."""
+        if not events:
+            return
+        red = cls._get_redis()
+        red.lpush(cls.KEY_EVENTS, *[dumps(event) for event in reversed(events)])
+
+    @classmethod
+    def count(cls):
+        red = cls._get_redis()
+        return red.llen(cls.KEY_EVENTS)
+
+
+class RedisNotifierEvents(BaseRedisDb):
+    """Queues the serialized events of a project to be notified together."""
+
+    KEY_EVENTS = 'NOTIFIER_EVENTS:{}'  # Redis list: serialized events, oldest first
+    KEY_BATCH = 'NOTIFIER_BATCH:{}'  # Redis string: set while a batch is open, with a ttl
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    def __init__(self, project_id):
+        self.key_events = self.KEY_EVENTS.format(project_id)
+        self.key_batch = self.KEY_BATCH.format(project_id)
+        self._red = self._get_redis()
+
+    def push(self, event, ttl):
+        """Queues an event, returns whether it opened a batch.
+
+        A batch is closed when its events are popped, or after `ttl` seconds otherwise,
+        e.g. if they were never popped, so that the next event opens a new batch.
+        """
+        pipe = self._red.pipeline()
+        pipe.rpush(self.key_events, dumps(event))
+        pipe.set(self.key_batch, 1, ex=ttl, nx=True)
+        _, is_opened = pipe.execute()
+        return bool(is_opened)
+
+    def pop(self):
+        pipe = self._red.pipeline()
+        pipe.lrange(self.key_events, 0, -1)
+        pipe.delete(self.key_events, self.key_batch)
+        events, _ = pipe.execute()
+        return [loads(event.decode('utf-8')) for event in events]
+
+
+class RedisNotifierRecipients(BaseRedisDb):
+    """Caches the recipients of the notifications, shared by the api and the workers."""
+
+    KEY_PROJECT_USERS = 'NOTIFIER_PROJECT_USERS:{}'  # Redis string: serialized user ids, with a ttl
+    KEY_USER_EMAIL = 'NOTIFIER_USER_EMAIL:{}'  # Redis string: email of a user, with a ttl
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    @classmethod
+    def get_users_emails(cls, user_ids):
+        """Returns the cached emails of the users, the missing users are not returned."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        red = cls._get_redis()
+        emails = red.mget([cls.KEY_USER_EMAIL.format(user_id) for user_id in user_ids])
+        return {user_id: email.decode('utf-8')
+                for user_id, email in zip(user_ids, emails) if email is not None}
+
+    @classmethod
+    def set_users_emails(cls, emails, ttl):
+        pipe = cls._get_redis().pipeline()
+        for user_id, email in emails.items():
+            pipe.setex(name=cls.KEY_USER_EMAIL.format(user_id), time=ttl, value=email or '')
+        pipe.execute()
+
+    @classmethod
+    def delete_user_email(cls, user_id):
+        cls._get_redis().delete(cls.KEY_USER_EMAIL.format(user_id))
+
+    @classmethod
+    def get_project_users(cls, project_id):
+        user_ids = cls._get_redis().get(cls.KEY_PROJECT_USERS.format(project_id))
+        return set(loads(user_ids.decode('utf-8'))) if user_ids is not None else None
+
+    @classmethod
+    def set_project_users(cls, project_id, user_ids, ttl):
+        cls._get_redis().setex(name=cls.KEY_PROJECT_USERS.format(project_id),
+                               time=ttl,
+                               value=dumps(sorted(user_ids)))
+
+    @classmethod
+    def delete_project_users(cls, project_id):
+        cls._get_redis().delete(cls.KEY_PROJECT_USERS.format(project_id))
+
+
+class RedisWebHookEndpoints(BaseRedisDb):
+    """Tracks the deliveries to a webhook endpoint: rate limit, circuit breaker and digest."""
+
+    KEY_REQUESTS = 'WEBHOOK_REQUESTS:{}:{}'  # Redis string, requests sent in a minute
+    KEY_IN_FLIGHT = 'WEBHOOK_IN_FLIGHT:{}'  # Redis sorted set, requests being sent by expiry
+    KEY_FAILURES = 'WEBHOOK_FAILURES:{}'  # Redis string, consecutive failures
+    KEY_CIRCUIT_OPEN = 'WEBHOOK_CIRCUIT_OPEN:{}'  # Redis string, set while the circuit is open
+    KEY_DIGEST = 'WEBHOOK_DIGEST:{}'  # Redis list, payloads waiting to be sent as a digest
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    def __init__(self, endpoint):
+        # Webhook urls usually contain secrets
+        self.endpoint = hashlib.sha1(endpoint.encode('utf-8')).hexdigest()
+        self.key_in_flight = self.KEY_IN_FLIGHT.format(self.endpoint)
+        self.key_failures = self.KEY_FAILURES.format(self.endpoint)
+        self.key_circuit_open = self.KEY_CIRCUIT_OPEN.format(self.endpoint)
+        self.key_digest = self.KEY_DIGEST.format(self.endpoint)
+        self.lease = None
+        self._red = self._get_redis()
+
+    def acquire(self, rate_limit, concurrency, timeout):
+        """Reserves a request to the endpoint.
+
+        Every request in flight holds a lease expiring after twice the timeout,
+        the leases of the workers that died while sending a request expire on their own.
+
+        Returns:
+            int: 0 if the request can be sent, otherwise the seconds to wait before trying again.
+        """
+        now = time.time()
+        lease = uuid.uuid4().hex
+        lease_ttl = timeout * 2
+        key_requests = self.KEY_REQUESTS.format(self.endpoint, int(now) // 60)
+        pipe = self._red.pipeline()
+        pipe.incr(key_requests)
+        pipe.expire(key_requests, 60)
+        pipe.zremrangebyscore(self.key_in_flight, '-inf', now)
+        pipe.zadd(self.key_in_flight, now + lease_ttl, lease)
+        pipe.zcard(self.key_in_flight)
+        pipe.pexpire(self.key_in_flight, int(math.ceil(lease_ttl * 1000)))
+        requests, _, _, _, in_flight, _ = pipe.execute()
+        if requests <= rate_limit and in_flight <= concurrency:
+            self.lease = lease
+            return 0
+
+        pipe = self._red.pipeline()
+        pipe.decr(key_requests)
+        pipe.zrem(self.key_in_flight, lease)
+        pipe.execute()
+        return 60 - int(now) % 60 if requests > rate_limit else 1
+
+    def release(self):
+        if self.lease:
+            self._red.zrem(self.key_in_flight, self.lease)
+            self.lease = None
+
+    def get_circuit_open_ttl(self):
+        """The seconds left before the circuit closes, 0 if it is closed."""
+        ttl = self._red.ttl(self.key_circuit_open)
+        return ttl if ttl and ttl > 0 else 0
+
+    def set_succeeded(self):
+        self._red.delete(self.key_failures)
+
+    def set_failed(self, max_failures, cooldown):
+        """Records a failed request, the circuit is opened after `max_failures` in a row.
+
+        Returns:
+            bool: whether the circuit was opened.
+        """
+        if self._red.incr(self.key_failures) < max_failures:
+            return False
+        pipe = self._red.pipeline()
+        pipe.setex(self.key_circuit_open, cooldown, 1)
+        pipe.delete(self.key_failures)
+        pipe.execute()
+        return True
+
+    def push_digest(self, payload):
+        """Adds a payload to the digest, returns whether it is the first payload of the digest."""
+        return self._red.rpush(self.key_digest, dumps(payload)) == 1
+
+    def pop_digest(self):
+        pipe = self._red.pipeline()
+        pipe.lrange(self.key_digest, 0, -1)
+        pipe.delete(self.key_digest)
+        payloads, _ = pipe.execute()
+        return [loads(payload.decode('utf-8')) for payload in payloads]
+
+
+class RedisProfiles(BaseRedisDb):
+    """Stores the profiles of the requests and tasks for a time."""
+
+    KEY_PROFILE = 'PROFILES:{}'  # Redis string: serialized profile, with a ttl
+    KEY_PROFILES = 'PROFILES'  # Redis list: profile ids, newest first
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    @classmethod
+    def set_profile(cls, profile, ttl, max_profiles):
+        pipe = cls._get_redis().pipeline()
+        pipe.setex(name=cls.KEY_PROFILE.format(profile['id']), time=ttl, value=dumps(profile))
+        pipe.lpush(cls.KEY_PROFILES, profile['id'])
+        pipe.ltrim(cls.KEY_PROFILES, 0, max_profiles - 1)
+        pipe.execute()
+
+    @classmethod
+    def get_profile(cls, profile_id):
+        red = cls._get_redis()
+        profile = red.get(cls.KEY_PROFILE.format(profile_id))
+        return loads(profile.decode('utf-8')) if profile else None
+
+    @classmethod
+    def get_profiles(cls):
+        """Returns the profiles not expired yet, newest first."""
+        red = cls._get_redis()
+        profile_ids = red.lrange(cls.KEY_PROFILES, 0, -1)
+        if not profile_ids:
+            return []
+        profiles = red.mget([cls.KEY_PROFILE.format(profile_id.decode('utf-8'))
+                             for profile_id in profile_ids])
+        return [loads(profile.decode('utf-8')) for profile in profiles if profile]
+
+
 class RedisSessions(BaseRedisDb):
     """ RedisSessions provides a db to store data related to a request session.
     Useful for storing data too large to be stored into the session cookie.
@@ -14,6 +14,9 @@ from libs.paths.utils import create_path, delete_path
 
 _logger = logging.getLogger('polyaxon.repos.git')
 
+# Per process cache of the commit HEAD points to, keyed by repo path
+_HEADS_CACHE = {}
+
 
 def get_repos(user):
     user_repos_root = os.path.join(settings.REPOS_MOUNT_PATH, user)
@@ -64,6 +67,7 @@ def commit(repo_path, user_email, user_name, message='updated'):
     run_command(cmd='git -c user.email=<{}> -c user.name={} commit -m "{}"'.format(
         user_email, user_name, message),
         data=None, location=repo_path, chw=True)
+    invalidate_head_cache(repo_path)
 
 
 def undo(repo_path):
@@ -71,10 +75,89 @@ def undo(repo_path):
     run_command(cmd='git clean -fd', data=None, location=repo_path, chw=True)
 
 
-def get_last_commit(repo_path):
-    commit_hash = run_command(cmd='git --no-pager log --pretty=oneline -1', data=None,
-                              location=repo_path, chw=True).split(' ')[0]
+def _get_git_dir(repo_path):
+    git_dir = os.path.join(repo_path, '.git')
+    if os.path.isfile(git_dir):
+        # Worktrees and submodules have a `.git` file pointing to the actual git dir
+        content = _read_file(git_dir) or ''
+        if content.startswith('gitdir:'):
+            git_dir = os.path.join(repo_path, content[len('gitdir:'):].strip())
+    return git_dir
+
+
+def _read_file(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _get_file_signature(path):
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _get_refs_signature(git_dir, ref_path):
+    return (_get_file_signature(os.path.join(git_dir, 'HEAD')),
+            _get_file_signature(ref_path) if ref_path else None,
+            _get_file_signature(os.path.join(git_dir, 'packed-refs')))
+
+
+def _read_packed_ref(git_dir, ref):
+    content = _read_file(os.path.join(git_dir, 'packed-refs')) or ''
+    for line in content.splitlines():
+        if not line or line[0] in ('#', '^'):
+            continue
+        commit_hash, _, name = line.partition(' ')
+        if name.strip() == ref:
+            return commit_hash
+    return None
 
+
+def _get_head_ref_path(git_dir):
+    """Returns a tuple (path of the ref HEAD points to, None), or (None, hash) if detached."""
+    head = _read_file(os.path.join(git_dir, 'HEAD'))
+    if not head:
+        return None, None
+    if not head.startswith('ref:'):
+        return None, head
+    return os.path.join(git_dir, head[len('ref:'):].strip()), None
+
+
+def invalidate_head_cache(repo_path):
+    _HEADS_CACHE.pop(repo_path, None)
+
+
+def get_head_commit_hash(repo_path):
+    """Returns the commit hash HEAD points to, or None if the repo has no commits yet.
+
+    The refs are read directly from the git dir without spawning a git process,
+    and the result is cached until HEAD, the ref it points to, or the packed refs change.
+    """
+    git_dir = _get_git_dir(repo_path)
+    cached = _HEADS_CACHE.get(repo_path)
+    if cached:
+        ref_path, signature, commit_hash = cached
+        if signature == _get_refs_signature(git_dir, ref_path):
+            return commit_hash
+
+    ref_path, commit_hash = _get_head_ref_path(git_dir)
+    # The signature is taken before reading the ref,
+    # a concurrent update will invalidate the entry on the next call
+    signature = _get_refs_signature(git_dir, ref_path)
+    if ref_path:
+        ref = os.path.relpath(ref_path, git_dir)
+        commit_hash = _read_file(ref_path) or _read_packed_ref(git_dir, ref)
+    _HEADS_CACHE[repo_path] = (ref_path, signature, commit_hash)
+    return commit_hash
+
+
+def get_last_commit(repo_path):
+    commit_hash = get_head_commit_hash(repo_path)
     return (commit_hash, get_commit(repo_path, commit_hash)) if commit_hash else None
 
 
@@ -101,6 +184,7 @@ def fetch(git_url, repo_path, overwrite=False):
             run_command(cmd='git fetch origin master', data=None, location=repo_path, chw=True)
             run_command(cmd='git reset --hard FETCH_HEAD', data=None, location=repo_path, chw=True)
             run_command(cmd='git clean -df', data=None, location=repo_path, chw=True)
+            invalidate_head_cache(repo_path)
             return
     return clone_git_repo(repo_path=repo_path, git_url=git_url)
 
@@ -112,6 +196,7 @@ def checkout_commit(repo_path, commit=None):  # pylint:disable=redefined-outer-n
     """
     commit = commit or 'master'
     run_command(cmd='git checkout {}'.format(commit), data=None, location=repo_path, chw=True)
+    invalidate_head_cache(repo_path)
 
 
 def run_command(cmd, data, location, chw):
@@ -7,11 +7,11 @@ def get_project_latest_code_reference(project):
 
     # Set the code reference to the experiment
     repo = project.repo
-    last_commit = repo.last_commit
-    if not last_commit:
+    commit_hash = repo.last_commit_hash
+    if not commit_hash:
         return None
 
-    code_reference, _ = CodeReference.objects.get_or_create(repo=repo, commit=last_commit[0])
+    code_reference, _ = CodeReference.objects.get_or_create(repo=repo, commit=commit_hash)
     return code_reference
 
 
@@ -0,0 +1,140 @@
+"""Retention of the recorded events.
+
+The activity logs and the notification events are kept for a time depending on the action
+of their event type, e.g. the views are kept for a shorter time than the writes.
+
+The expired events are deleted by chunks, so that a cleanup is bounded
+and does not hold long locks on the tables, and every chunk is exported first
+to a gzipped json lines file under `EVENTS_ARCHIVE_ROOT`, if it is set.
+The archives are the only copy of the deleted events,
+`EVENTS_ARCHIVE_ROOT` must be on a persistent volume.
+"""
+import gzip
+import operator
+import os
+
+from collections import defaultdict
+from datetime import timedelta
+from functools import reduce
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from db.models.activitylogs import ActivityLog
+from db.models.notification import Notification, NotificationEvent
+from event_manager import event_actions
+from event_manager.event_context import get_event_action
+from libs.archive import check_archive_path
+from libs.json_utils import dumps
+
+
+def is_view_action(action):
+    return action == event_actions.VIEWED or action.endswith('_' + event_actions.VIEWED)
+
+
+def get_event_ttl(event_type):
+    """Returns the number of days the events of this type are kept, 0 to keep them forever."""
+    action = get_event_action(event_type)
+    if action in settings.EVENTS_RETENTION_ACTIONS_TTL:
+        return settings.EVENTS_RETENTION_ACTIONS_TTL[action]
+    if is_view_action(action):
+        return settings.EVENTS_RETENTION_VIEWS_TTL
+    return settings.EVENTS_RETENTION_TTL
+
+
+def get_expired_events(model, now=None):
+    """Returns the queryset of the expired events of a model."""
+    # Load default event types
+    import auditor.events  # noqa
+    from auditor.manager import default_manager
+
+    now = now or timezone.now()
+    default_ttl = settings.EVENTS_RETENTION_TTL
+    event_types_by_ttl = defaultdict(list)
+    for event_type in default_manager.keys:
+        ttl = get_event_ttl(event_type)
+        if ttl != default_ttl:
+            event_types_by_ttl[ttl].append(event_type)
+
+    conditions = [Q(event_type__in=event_types, created_at__lt=now - timedelta(days=ttl))
+                  for ttl, event_types in event_types_by_ttl.items() if ttl]
+    if default_ttl:
+        # Unknown event types, e.g. removed ones, are kept for the default ttl
+        excluded_event_types = [event_type for event_types in event_types_by_ttl.values()
+                                for event_type in event_types]
+        conditions.append(Q(created_at__lt=now - timedelta(days=default_ttl)) &
+                          ~Q(event_type__in=excluded_event_types))
+
+    if not conditions:
+        return model.objects.none()
+    return model.objects.filter(reduce(operator.or_, conditions))
+
+
+def get_archive_path(model, now):
+    return os.path.join(settings.EVENTS_ARCHIVE_ROOT,
+                        model._meta.model_name,  # pylint:disable=protected-access
+                        now.strftime('%Y-%m-%d'))
+
+
+def get_archive_values(model, ids):
+    values = list(model.objects.filter(id__in=ids).order_by('id').values())
+    if model is NotificationEvent:
+        notifications = defaultdict(list)
+        for notification in Notification.objects.filter(event_id__in=ids).values(
+                'event_id', 'user_id', 'is_active'):
+            notifications[notification.pop('event_id')].append(notification)
+        for value in values:
+            value['notifications'] = notifications[value['id']]
+    return values
+
+
+def archive_events(model, ids, now):
+    """Exports the events to a gzipped json lines file, one event per line."""
+    values = get_archive_values(model, ids)
+    archive_path = get_archive_path(model, now)
+    check_archive_path(archive_path)
+    archive_file = os.path.join(archive_path, '{}-{}.jsonl.gz'.format(ids[0], ids[-1]))
+    with gzip.open(archive_file, 'wt') as archive:
+        for value in values:
+            archive.write(dumps(value))
+            archive.write('\n')
+    return archive_file
+
+
+def clean_expired_events(model, now=None):
+    """Archives and deletes the expired events of a model, by chunks.
+
+    The oldest events are cleaned first, and the cleanup stops after
+    `EVENTS_RETENTION_MAX_CHUNKS` chunks, the next cleanup continues with the remaining events.
+
+    Returns:
+        int: the number of deleted events.
+    """
+    now = now or timezone.now()
+    chunk_size = settings.EVENTS_RETENTION_CHUNK_SIZE
+    # The expired events are read from the beginning of the `created_at` index,
+    # instead of scanning the ids of the events kept by the previous cleanups
+    expired_ids = get_expired_events(model, now).order_by(
+        'created_at', 'id').values_list('id', flat=True)
+    deleted = 0
+    for _ in range(settings.EVENTS_RETENTION_MAX_CHUNKS):
+        ids = list(expired_ids[:chunk_size])
+        if not ids:
+            break
+
+        with transaction.atomic():
+            if settings.EVENTS_ARCHIVE_ROOT:
+                archive_events(model, ids, now)
+            # The notifications of the notification events are deleted in cascade
+            model.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+        if len(ids) < chunk_size:
+            break
+    return deleted
+
+
+def clean_all_expired_events(now=None):
+    now = now or timezone.now()
+    return {model: clean_expired_events(model, now) for model in (ActivityLog, NotificationEvent)}
@@ -1,7 +1,8 @@
 import logging
 
-from kubernetes import watch
+import stats
 
+from libs import k8s_watch
 from polyaxon.celery_api import app as celery_app
 from polyaxon.settings import EventsCeleryTasks
 
@@ -13,11 +14,11 @@ LEVEL_MAPPING = {
 
 
 def run(k8s_manager, cluster):  # pylint:disable=too-many-branches
-    w = watch.Watch()
-
-    for event in w.stream(k8s_manager.k8s_api.list_namespaced_event,
-                          namespace=k8s_manager.namespace):
+    for event in k8s_watch.stream('namespace',
+                                  k8s_manager.k8s_api.list_namespaced_event,
+                                  namespace=k8s_manager.namespace):
         logger.debug("event: %s", event)
+        stats.incr('monitors.namespace.events')
 
         event_type = event['type'].lower()
         event = event['object']
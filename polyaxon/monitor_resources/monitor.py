@@ -9,6 +9,7 @@ from docker.errors import NotFound
 from django.conf import settings
 
 import polyaxon_gpustat
+import stats
 
 from constants.containers import ContainerStatuses
 from db.models.nodes import ClusterNode, NodeGPU
@@ -144,6 +145,11 @@ def update_cluster_node(node_gpus):
 
 
 def run(containers, node, persist):
+    with stats.timer('monitors.resources.sweep'):
+        sweep(containers, node, persist)
+
+
+def sweep(containers, node, persist):
     container_ids = RedisJobContainers.get_containers()
     gpu_resources = get_gpu_resources()
     if gpu_resources:
@@ -1,10 +1,15 @@
 import logging
+import threading
+import time
 
-from kubernetes import watch
+from collections import OrderedDict
 
 from django.conf import settings
 
+import stats
+
 from constants.jobs import JobLifeCycle
+from libs import k8s_watch
 from libs.redis_db import RedisJobContainers
 from monitor_statuses.jobs import get_job_state
 from polyaxon.celery_api import app as celery_app
@@ -46,6 +51,87 @@ def update_job_containers(event, status, job_container_name):
                 RedisJobContainers.remove_container(container_id=container_id)
 
 
+class JobStatusesBuffer(object):
+    """Coalesces the statuses of the experiment jobs and sends them in batches.
+
+    Only the last status received for a job during the window is sent,
+    and the statuses that do not change the last sent status of a job are dropped.
+
+    The buffer is flushed by the watch loop once the window or the batch size is reached,
+    and by a background thread when no events are received.
+    If `acks` is passed, the watch events consumed before a flush are acknowledged once sent.
+    """
+
+    def __init__(self, window, batch_size, acks=None):
+        self.window = window
+        self.batch_size = batch_size
+        self.acks = acks
+        self._statuses = OrderedDict()
+        self._last_statuses = {}
+        self._first_added_at = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    @staticmethod
+    def get_key(job_state):
+        return job_state['status'], job_state['details'].get('node_name')
+
+    def add(self, job_uuid, job_state):
+        with self._lock:
+            if not self._statuses:
+                self._first_added_at = time.time()
+            # Keep the order of the first event, the handlers process the jobs in that order
+            self._statuses[job_uuid] = job_state
+            is_full = len(self._statuses) >= self.batch_size
+        if is_full or self.is_expired():
+            self.flush()
+
+    def is_expired(self):
+        with self._lock:
+            return bool(self._statuses) and time.time() - self._first_added_at >= self.window
+
+    def flush(self):
+        with stats.timer('monitors.statuses.flush'):
+            return self._flush()
+
+    def _flush(self):
+        # The events acknowledged were all added before the statuses are taken
+        n_acks = self.acks.count() if self.acks else 0
+        with self._lock:
+            statuses, self._statuses = self._statuses, OrderedDict()
+            payloads = []
+            for job_uuid, job_state in statuses.items():
+                key = self.get_key(job_state)
+                if self._last_statuses.get(job_uuid) == key:
+                    continue
+                if JobLifeCycle.is_done(job_state['status']):
+                    self._last_statuses.pop(job_uuid, None)
+                else:
+                    self._last_statuses[job_uuid] = key
+                payloads.append(job_state)
+
+        for i in range(0, len(payloads), self.batch_size):
+            celery_app.send_task(
+                EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES_BATCH,
+                kwargs={'payloads': payloads[i:i + self.batch_size]})
+        if n_acks:
+            self.acks.acknowledge(n_acks)
+        return len(payloads)
+
+    def _run(self):
+        while not self._stopped.wait(self.window):
+            if self.is_expired() or (self.acks and self.acks.count()):
+                self.flush()
+
+    def start(self):
+        if self.window:
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        self.flush()
+
+
 def get_label_selector():
     type_label = settings.TYPE_LABELS_EXPERIMENT
     return 'role in ({},{}),type={}'.format(
@@ -55,11 +141,24 @@ def get_label_selector():
 
 
 def run(k8s_manager):
-    w = watch.Watch()
-
-    for event in w.stream(k8s_manager.k8s_api.list_namespaced_pod,
-                          namespace=k8s_manager.namespace,
-                          label_selector=get_label_selector()):
+    # The buffered events are only marked as processed once sent
+    acks = k8s_watch.WatchAcks('statuses') if settings.K8S_STATUSES_COALESCE_WINDOW else None
+    statuses_buffer = JobStatusesBuffer(window=settings.K8S_STATUSES_COALESCE_WINDOW,
+                                        batch_size=settings.K8S_STATUSES_BATCH_SIZE,
+                                        acks=acks)
+    statuses_buffer.start()
+    try:
+        watch_statuses(k8s_manager, statuses_buffer, acks=acks)
+    finally:
+        statuses_buffer.stop()
+
+
+def watch_statuses(k8s_manager, statuses_buffer, acks=None):
+    for event in k8s_watch.stream('statuses',
+                                  k8s_manager.k8s_api.list_namespaced_pod,
+                                  acks=acks,
+                                  namespace=k8s_manager.namespace,
+                                  label_selector=get_label_selector()):
         logger.debug("Received event: %s", event['type'])
         event_object = event['object'].to_dict()
         job_state = get_job_state(
@@ -99,10 +198,9 @@ def run(k8s_manager):
 
             if experiment_job_condition:
                 update_job_containers(event_object, status, settings.CONTAINER_NAME_EXPERIMENT_JOB)
-                # Handle experiment job statuses
-                celery_app.send_task(
-                    EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
-                    kwargs={'payload': job_state})
+                # Handle experiment job statuses in batches
+                statuses_buffer.add(job_uuid=job_state['details']['labels']['job_uuid'],
+                                    job_state=job_state)
 
             elif job_condition:
                 update_job_containers(event_object, status, settings.CONTAINER_NAME_JOB)
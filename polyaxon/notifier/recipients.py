@@ -1,21 +1,59 @@
 from collections import namedtuple
 
+from django.conf import settings
+
+from libs.redis_db import RedisNotifierRecipients
+
 
 class RecipientSpec(namedtuple('RecipientSpec', 'id email')):
     pass
 
 
+def get_users_recipients(user_ids):
+    """Returns the recipients of a set of users, the missing ones are loaded with one query."""
+    from django.contrib.auth import get_user_model
+
+    # The recipients are cached in redis, the api invalidates them for the workers
+    emails = RedisNotifierRecipients.get_users_emails(user_ids)
+    missing_user_ids = [user_id for user_id in user_ids if user_id not in emails]
+    if missing_user_ids:
+        missing_emails = dict(
+            get_user_model().objects.filter(id__in=missing_user_ids).values_list('id', 'email'))
+        RedisNotifierRecipients.set_users_emails(missing_emails,
+                                                 ttl=settings.NOTIFIER_RECIPIENTS_CACHE_TTL)
+        emails.update(missing_emails)
+    return {RecipientSpec(user_id, email) for user_id, email in emails.items()}
+
+
+def get_project_users(project_id):
+    """Returns the ids of the users notified for the events of a project."""
+    from db.models.projects import Project
+
+    user_ids = RedisNotifierRecipients.get_project_users(project_id)
+    if user_ids is None:
+        user_ids = set(Project.objects.filter(id=project_id).values_list('user_id', flat=True))
+        RedisNotifierRecipients.set_project_users(project_id,
+                                                  user_ids,
+                                                  ttl=settings.NOTIFIER_RECIPIENTS_CACHE_TTL)
+    return user_ids
+
+
+def invalidate_project_recipients(project_id):
+    RedisNotifierRecipients.delete_project_users(project_id)
+
+
+def invalidate_user_recipients(user_id):
+    RedisNotifierRecipients.delete_user_email(user_id)
+
+
 def get_project_recipients(project):
-    return {RecipientSpec(project.user.id, project.user.email), }
+    # The events of deleted projects are notified, the user is read from the instance
+    return get_users_recipients({project.user_id})
 
 
 def get_build_recipients(build):
-    recipients = {RecipientSpec(build.user.id, build.user.email), }
-    recipients |= get_project_recipients(build.project)
-    return recipients
+    return get_instance_and_project_recipients(build)
 
 
 def get_instance_and_project_recipients(instance):
-    recipients = {RecipientSpec(instance.user.id, instance.user.email), }
-    recipients |= get_project_recipients(instance.project)
-    return recipients
+    return get_users_recipients({instance.user_id} | get_project_users(instance.project_id))
@@ -1,14 +1,27 @@
+from django.conf import settings
+
 from action_manager.actions.email import EmailAction
 from constants import user_system
 from event_manager import event_subjects
 from event_manager.event_service import EventService
+from libs.redis_db import RedisNotifierEvents
 from notifier.managers import default_action_manager, default_event_manager
 from notifier.recipients import get_instance_and_project_recipients, get_project_recipients
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import NotifierCeleryTasks
 
 
 class NotifierService(EventService):
+    """A service that notifies the users of a project about its events.
+
+    When `NOTIFIER_BATCH_WINDOW` is set, the events of a project are queued and notified
+    together at the end of the window, so that the notifications are created with bulk inserts.
+    """
+    __all__ = ('record', 'record_queued_events', 'setup')
+
     event_manager = default_event_manager
     action_manager = default_action_manager
+    requires_instance = True
 
     def __init__(self):
         self.notification_event = None
@@ -20,25 +33,53 @@ class NotifierService(EventService):
             return get_project_recipients(event.instance)
         return get_instance_and_project_recipients(event.instance)
 
-    def create_notification(self, event, recipients):
+    @staticmethod
+    def get_project_id(event):
+        if event.get_event_subject() == event_subjects.PROJECT:
+            return event.instance.id
+        return event.instance.project_id
+
+    @staticmethod
+    def get_digest(events):
+        """Keeps the last event of every event type and instance, e.g. the last new status."""
+        digest = {}
+        for event in events:
+            key = (event.event_type, event.instance.__class__, event.instance.pk)
+            digest.pop(key, None)
+            digest[key] = event
+        return list(digest.values())
+
+    def get_notification_event(self, event):
         actor_id = event.data.get(event.actor_id)
-        actor_id = actor_id if actor_id != user_system.USER_SYSTEM_ID else None
-        notification_event = self.notification_event.objects.create(
+        return self.notification_event(
             event_type=event.event_type,
             actor_id=actor_id if actor_id != user_system.USER_SYSTEM_ID else None,
             context=event.data,
             created_at=event.datetime,
-            content_object=event.instance,
+            **event.get_content_object_fields()
         )
 
+    def create_notification(self, event, recipients):
+        notification_event = self.get_notification_event(event)
+        notification_event.save()
+
         self.notification.objects.bulk_create([
             self.notification(event=notification_event, user_id=recipient.id)
             for recipient in recipients
         ])
 
-    def record_event(self, event):
-        recipients = self.get_recipients(event)
-        self.create_notification(event, recipients)
+    def create_notifications(self, events, recipients):
+        """Creates the notifications of a batch of events with two inserts."""
+        notification_events = self.notification_event.objects.bulk_create(
+            [self.get_notification_event(event) for event in events])
+
+        self.notification.objects.bulk_create([
+            self.notification(event=notification_event, user_id=recipient.id)
+            for notification_event, event_recipients in zip(notification_events, recipients)
+            for recipient in event_recipients
+        ])
+
+    def execute_actions(self, event, recipients):
         for action in self.action_manager.values:
             config = None
             if action == EmailAction:
@@ -49,6 +90,50 @@ class NotifierService(EventService):
             except Exception as e:
                 action.logger.warning('Action execution failed %s', e, exc_info=True)
 
+    def record_event(self, event):
+        if settings.NOTIFIER_BATCH_WINDOW:
+            self.queue_event(event)
+            return
+
+        recipients = self.get_recipients(event)
+        self.create_notification(event, recipients)
+        self.execute_actions(event, recipients)
+
+    def record_events(self, events):
+        # The recipients and the actions depend on the instance, events of deleted instances
+        # are not notified
+        events = [event for event in events if event.instance is not None]
+        if not events:
+            return
+        if settings.NOTIFIER_DIGEST:
+            events = self.get_digest(events)
+        recipients = [self.get_recipients(event) for event in events]
+        self.create_notifications(events, recipients)
+        for event, event_recipients in zip(events, recipients):
+            self.execute_actions(event, event_recipients)
+
+    def queue_event(self, event):
+        """Queues an event with the events of its project, until the end of the batch window."""
+        from auditor.transports import serialize_event
+
+        project_id = self.get_project_id(event)
+        # The batch is reopened if its task is lost
+        ttl = settings.NOTIFIER_BATCH_WINDOW + settings.NOTIFIER_BATCH_TIMEOUT
+        if RedisNotifierEvents(project_id).push(serialize_event(event), ttl=ttl):
+            celery_app.send_task(NotifierCeleryTasks.NOTIFIER_RECORD_EVENTS,
+                                 kwargs={'project_id': project_id},
+                                 countdown=settings.NOTIFIER_BATCH_WINDOW)
+
+    def record_queued_events(self, project_id):
+        """Records the events queued for a project, returns the number of events."""
+        from auditor.transports import deserialize_events, load_instances
+
+        events = deserialize_events(RedisNotifierEvents(project_id).pop(),
+                                    event_manager=self.event_manager)
+        load_instances(events)
+        self.record_events(events)
+        return len(events)
+
     def setup(self):
         super().setup()
         # Load default event types and actions
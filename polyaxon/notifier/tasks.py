@@ -0,0 +1,9 @@
+import notifier
+
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import NotifierCeleryTasks
+
+
+@celery_app.task(name=NotifierCeleryTasks.NOTIFIER_RECORD_EVENTS, ignore_result=True)
+def notifier_record_events(project_id):
+    notifier.record_queued_events(project_id)
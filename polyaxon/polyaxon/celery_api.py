@@ -2,8 +2,12 @@ import logging
 import os
 
 from celery import Celery, Task, states
+from celery.signals import celeryd_init
 
 from django.apps import apps
+from django.conf import settings
+
+from libs.events_serializer import register_serializer
 
 _logger = logging.getLogger("polyaxon.tasks")
 
@@ -42,5 +46,15 @@ app.Task = CeleryTask  # Custom base class for logging
 # the configuration object to child processes.
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
+# The compact serializer of the events, if msgpack is installed
+register_serializer()
+
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks(lambda: [n.name for n in apps.get_app_configs()])
+
+
+@celeryd_init.connect
+def select_workload_queues(options=None, **kwargs):
+    """The workers of a workload consume its queues, unless the queues are passed with `-Q`."""
+    if settings.CELERY_WORKLOAD_QUEUES and not (options or {}).get('queues'):
+        app.amqp.queues.select(settings.CELERY_WORKLOAD_QUEUES)
@@ -1,15 +1,19 @@
 # Default configs
 from .admin import *
 from .api_host import *
+from .auditor import *
 from .celery_settings import *
 from .context_processors import *
 from .core import *
 from .email import *
 from .integrations import *
 from .logging import *
+from .notifier import *
 from .oauth import *
+from .profiler import *
 from .secrets import *
 from .redis_settings import *
+from .stats import *
 from .tracker import *
 from .versions import *
 
@@ -1,6 +1,8 @@
 DEFAULT_APPS = (
     'polyaxon',
     'db.apps.DBConfig',
+    'profiler.apps.ProfilerConfig',
+    'stats.apps.StatsConfig',
 )
 
 THIRD_PARTY_APPS = (
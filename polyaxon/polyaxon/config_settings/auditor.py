@@ -0,0 +1,23 @@
+from polyaxon.config_manager import config
+
+AUDITOR_TRANSPORT_SYNC = 'sync'
+AUDITOR_TRANSPORT_MEMORY = 'memory'
+AUDITOR_TRANSPORT_REDIS = 'redis'
+AUDITOR_TRANSPORT_CELERY = 'celery'
+# The events are recorded in batches by the other transports, see `auditor.transports`
+AUDITOR_TRANSPORT = config.get_string(
+    'POLYAXON_AUDITOR_TRANSPORT',
+    is_optional=True,
+    default=AUDITOR_TRANSPORT_SYNC,
+    options=(AUDITOR_TRANSPORT_SYNC,
+             AUDITOR_TRANSPORT_MEMORY,
+             AUDITOR_TRANSPORT_REDIS,
+             AUDITOR_TRANSPORT_CELERY))
+# The maximum number of events recorded together by the batch consumers
+AUDITOR_BATCH_SIZE = config.get_int('POLYAXON_AUDITOR_BATCH_SIZE',
+                                    is_optional=True,
+                                    default=100)
+# The delay in seconds after which the events queued in memory are recorded
+AUDITOR_FLUSH_INTERVAL = config.get_float('POLYAXON_AUDITOR_FLUSH_INTERVAL',
+                                          is_optional=True,
+                                          default=1)
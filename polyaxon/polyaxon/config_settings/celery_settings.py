@@ -2,6 +2,7 @@ from datetime import timedelta
 
 from kombu import Exchange, Queue
 
+from libs import events_serializer
 from polyaxon.config_manager import config
 
 CELERY_TRACK_STARTED = True
@@ -25,7 +26,8 @@ INTERNAL_EXCHANGE = config.get_string('POLYAXON_INTERNAL_EXCHANGE',
                                       default='internal')
 
 # CELERY_RESULT_BACKEND = config.get_string('POLYAXON_REDIS_CELERY_RESULT_BACKEND_URL')
-CELERYD_PREFETCH_MULTIPLIER = config.get_int('POLYAXON_CELERYD_PREFETCH_MULTIPLIER')
+# The settings are read with the `CELERY_` namespace, the workload profiles override them
+CELERY_WORKER_PREFETCH_MULTIPLIER = config.get_int('POLYAXON_CELERYD_PREFETCH_MULTIPLIER')
 
 CELERY_TASK_ALWAYS_EAGER = config.get_boolean('POLYAXON_CELERY_ALWAYS_EAGER')
 if CELERY_TASK_ALWAYS_EAGER:
@@ -63,6 +65,10 @@ class Intervals(object):
         'POLYAXON_INTERVALS_EXPERIMENTS_SYNC',
         is_optional=True,
         default=30)
+    EXPERIMENTS_ADMISSION = config.get_int(
+        'POLYAXON_INTERVALS_EXPERIMENTS_ADMISSION',
+        is_optional=True,
+        default=30)
     CLUSTERS_UPDATE_SYSTEM_INFO = config.get_int(
         'POLYAXON_INTERVALS_CLUSTERS_UPDATE_SYSTEM_INFO',
         is_optional=True,
@@ -72,6 +78,22 @@ class Intervals(object):
         is_optional=True,
         default=150)
     CLUSTERS_NOTIFICATION_ALIVE = 150
+    AUDITOR_FLUSH_EVENTS = config.get_int(
+        'POLYAXON_INTERVALS_AUDITOR_FLUSH_EVENTS',
+        is_optional=True,
+        default=10)
+    EXPERIMENTS_COMPACT_METRICS = config.get_int(
+        'POLYAXON_INTERVALS_EXPERIMENTS_COMPACT_METRICS',
+        is_optional=True,
+        default=60 * 60)
+    EVENTS_CLEAN_EXPIRED = config.get_int(
+        'POLYAXON_INTERVALS_EVENTS_CLEAN_EXPIRED',
+        is_optional=True,
+        default=10 * 60)
+    ARCHIVES_CLEAN = config.get_int(
+        'POLYAXON_INTERVALS_ARCHIVES_CLEAN',
+        is_optional=True,
+        default=60 * 60)
 
     @staticmethod
     def get_schedule(interval):
@@ -107,6 +129,9 @@ class CronsCeleryTasks(object):
     N.B. make sure that the task name is not < 128.
     """
     EXPERIMENTS_SYNC_JOBS_STATUSES = 'experiments_sync_jobs_statuses'
+    EXPERIMENTS_COMPACT_METRICS = 'experiments_compact_metrics'
+    EVENTS_CLEAN_EXPIRED = 'events_clean_expired'
+    ARCHIVES_CLEAN = 'archives_clean'
     CLUSTERS_NOTIFICATION_ALIVE = 'clusters_notification_alive'
     CLUSTERS_NODES_NOTIFICATION_ALIVE = 'clusters_nodes_notification_alive'
     CLUSTERS_UPDATE_SYSTEM_NODES = 'clusters_update_system_nodes'
@@ -149,6 +174,7 @@ class EventsCeleryTasks(object):
     EVENTS_HANDLE_NAMESPACE = 'events_handle_namespace'
     EVENTS_HANDLE_RESOURCES = 'events_handle_resources'
     EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES = 'events_handle_experiment_job_statuses'
+    EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES_BATCH = 'events_handle_experiment_job_statuses_batch'
     EVENTS_HANDLE_JOB_STATUSES = 'events_handle_job_statuses'
     EVENTS_HANDLE_PLUGIN_JOB_STATUSES = 'events_handle_plugin_job_statuses'
     EVENTS_HANDLE_BUILD_JOB_STATUSES = 'events_handle_build_job_statuses'
@@ -157,6 +183,32 @@ class EventsCeleryTasks(object):
     EVENTS_HANDLE_LOGS_BUILD_JOB = 'events_handle_logs_build_job'
 
 
+class ActionsCeleryTasks(object):
+    """Actions celery tasks.
+
+    N.B. make sure that the task name is not < 128.
+    """
+    ACTIONS_DELIVER_WEBHOOK = 'actions_deliver_webhook'
+    ACTIONS_SEND_WEBHOOK_DIGEST = 'actions_send_webhook_digest'
+
+
+class AuditorCeleryTasks(object):
+    """Auditor celery tasks.
+
+    N.B. make sure that the task name is not < 128.
+    """
+    AUDITOR_RECORD_EVENTS = 'auditor_record_events'
+    AUDITOR_FLUSH_EVENTS = 'auditor_flush_events'
+
+
+class NotifierCeleryTasks(object):
+    """Notifier celery tasks.
+
+    N.B. make sure that the task name is not < 128.
+    """
+    NOTIFIER_RECORD_EVENTS = 'notifier_record_events'
+
+
 class SchedulerCeleryTasks(object):
     """Scheduler celery tasks.
 
@@ -167,6 +219,7 @@ class SchedulerCeleryTasks(object):
     EXPERIMENTS_STOP = 'experiments_stop'
     EXPERIMENTS_CHECK_STATUS = 'experiments_check_status'
     EXPERIMENTS_SET_METRICS = 'experiments_set_metrics'
+    EXPERIMENTS_ADMIT = 'experiments_admit'
 
     EXPERIMENTS_GROUP_CREATE = 'experiments_group_create'
     EXPERIMENTS_GROUP_STOP_EXPERIMENTS = 'experiments_group_stop_experiments'
@@ -234,16 +287,115 @@ class CeleryQueues(object):
     CRONS_EXPERIMENTS = config.get_string('POLYAXON_QUEUES_CRONS_EXPERIMENTS')
     CRONS_PIPELINES = config.get_string('POLYAXON_QUEUES_CRONS_PIPELINES')
     CRONS_CLUSTERS = config.get_string('POLYAXON_QUEUES_CRONS_CLUSTERS')
+    CRONS_EVENTS = config.get_string('POLYAXON_QUEUES_CRONS_EVENTS',
+                                     is_optional=True,
+                                     default='queues.crons.events')
 
     HP = config.get_string('POLYAXON_QUEUES_HP')
 
     EVENTS_NAMESPACE = config.get_string('POLYAXON_QUEUES_EVENTS_NAMESPACE')
     EVENTS_RESOURCES = config.get_string('POLYAXON_QUEUES_EVENTS_RESOURCES')
     EVENTS_JOB_STATUSES = config.get_string('POLYAXON_QUEUES_EVENTS_JOB_STATUSES')
+    EVENTS_AUDITOR = config.get_string('POLYAXON_QUEUES_EVENTS_AUDITOR',
+                                       is_optional=True,
+                                       default='queues.events.auditor')
+    EVENTS_ACTIONS = config.get_string('POLYAXON_QUEUES_EVENTS_ACTIONS',
+                                       is_optional=True,
+                                       default='queues.events.actions')
     LOGS_SIDECARS = config.get_string('POLYAXON_QUEUES_LOGS_SIDECARS')
     STREAM_LOGS_SIDECARS = config.get_string('POLYAXON_QUEUES_STREAM_LOGS_SIDECARS')
 
 
+class CeleryWorkloads(object):
+    """Celery workloads.
+
+    The queues are grouped by workload, so that the high volume events,
+    e.g. the logs during a burst, do not delay the latency sensitive tasks, e.g. the scheduling.
+    A worker started with `POLYAXON_CELERY_WORKLOAD` consumes the queues of its workload,
+    with its own prefetch, acks late and concurrency profile.
+    """
+    LOGS = 'logs'
+    EVENTS = 'events'
+    SCHEDULER = 'scheduler'
+    HP = 'hp'
+    CRONS = 'crons'
+
+    VALUES = (LOGS, EVENTS, SCHEDULER, HP, CRONS)
+
+
+CELERY_WORKLOADS_QUEUES = {
+    CeleryWorkloads.LOGS: (CeleryQueues.LOGS_SIDECARS,
+                           CeleryQueues.EVENTS_RESOURCES),
+    CeleryWorkloads.EVENTS: (CeleryQueues.EVENTS_JOB_STATUSES,
+                             CeleryQueues.EVENTS_NAMESPACE,
+                             CeleryQueues.EVENTS_AUDITOR,
+                             CeleryQueues.EVENTS_ACTIONS),
+    CeleryWorkloads.SCHEDULER: (CeleryQueues.SCHEDULER_EXPERIMENTS,
+                                CeleryQueues.SCHEDULER_EXPERIMENT_GROUPS,
+                                CeleryQueues.SCHEDULER_PROJECTS,
+                                CeleryQueues.SCHEDULER_BUILD_JOBS,
+                                CeleryQueues.PIPELINES,
+                                CeleryQueues.REPOS),
+    CeleryWorkloads.HP: (CeleryQueues.HP,),
+    CeleryWorkloads.CRONS: (CeleryQueues.CRONS_EXPERIMENTS,
+                            CeleryQueues.CRONS_PIPELINES,
+                            CeleryQueues.CRONS_CLUSTERS,
+                            CeleryQueues.CRONS_EVENTS),
+}
+
+
+def get_workload_profile(workload, prefetch_multiplier, acks_late, concurrency):
+    key = 'POLYAXON_CELERY_WORKLOADS_{}_'.format(workload.upper())
+    return {
+        'prefetch_multiplier': config.get_int(key + 'PREFETCH_MULTIPLIER',
+                                              is_optional=True,
+                                              default=prefetch_multiplier),
+        'acks_late': config.get_boolean(key + 'ACKS_LATE',
+                                        is_optional=True,
+                                        default=acks_late),
+        'concurrency': config.get_int(key + 'CONCURRENCY',
+                                      is_optional=True,
+                                      default=concurrency),
+    }
+
+
+CELERY_WORKLOADS_PROFILES = {
+    # Many short tasks: prefetched in bulk, a lost batch of logs is not redelivered
+    CeleryWorkloads.LOGS: get_workload_profile(CeleryWorkloads.LOGS,
+                                               prefetch_multiplier=32,
+                                               acks_late=False,
+                                               concurrency=8),
+    CeleryWorkloads.EVENTS: get_workload_profile(CeleryWorkloads.EVENTS,
+                                                 prefetch_multiplier=8,
+                                                 acks_late=False,
+                                                 concurrency=4),
+    # Long tasks: no task waits behind a slow one, and the tasks of a lost worker are redelivered
+    CeleryWorkloads.SCHEDULER: get_workload_profile(CeleryWorkloads.SCHEDULER,
+                                                    prefetch_multiplier=1,
+                                                    acks_late=True,
+                                                    concurrency=4),
+    CeleryWorkloads.HP: get_workload_profile(CeleryWorkloads.HP,
+                                             prefetch_multiplier=1,
+                                             acks_late=True,
+                                             concurrency=2),
+    CeleryWorkloads.CRONS: get_workload_profile(CeleryWorkloads.CRONS,
+                                                prefetch_multiplier=1,
+                                                acks_late=True,
+                                                concurrency=1),
+}
+
+CELERY_WORKLOAD = config.get_string('POLYAXON_CELERY_WORKLOAD',
+                                    is_optional=True,
+                                    options=CeleryWorkloads.VALUES)
+CELERY_WORKLOAD_QUEUES = ()
+if CELERY_WORKLOAD:
+    CELERY_WORKLOAD_QUEUES = CELERY_WORKLOADS_QUEUES[CELERY_WORKLOAD]
+    CELERY_WORKER_PREFETCH_MULTIPLIER = CELERY_WORKLOADS_PROFILES[CELERY_WORKLOAD][
+        'prefetch_multiplier']
+    CELERY_TASK_ACKS_LATE = CELERY_WORKLOADS_PROFILES[CELERY_WORKLOAD]['acks_late']
+    CELERY_WORKER_CONCURRENCY = CELERY_WORKLOADS_PROFILES[CELERY_WORKLOAD]['concurrency']
+
+
 # Queues on non default exchange
 CELERY_TASK_QUEUES = (
     Queue(CeleryQueues.STREAM_LOGS_SIDECARS,
@@ -298,6 +450,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
     SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
+    SchedulerCeleryTasks.EXPERIMENTS_ADMIT:
+        {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
 
     SchedulerCeleryTasks.EXPERIMENTS_GROUP_CREATE:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENT_GROUPS},
@@ -337,6 +491,12 @@ CELERY_TASK_ROUTES = {
 
     CronsCeleryTasks.EXPERIMENTS_SYNC_JOBS_STATUSES:
         {'queue': CeleryQueues.CRONS_EXPERIMENTS},
+    CronsCeleryTasks.EXPERIMENTS_COMPACT_METRICS:
+        {'queue': CeleryQueues.CRONS_EXPERIMENTS},
+    CronsCeleryTasks.EVENTS_CLEAN_EXPIRED:
+        {'queue': CeleryQueues.CRONS_EVENTS},
+    CronsCeleryTasks.ARCHIVES_CLEAN:
+        {'queue': CeleryQueues.CRONS_EXPERIMENTS},
     CronsCeleryTasks.CLUSTERS_NOTIFICATION_ALIVE:
         {'queue': CeleryQueues.CRONS_CLUSTERS},
     CronsCeleryTasks.CLUSTERS_UPDATE_SYSTEM_INFO:
@@ -375,12 +535,25 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.EVENTS_RESOURCES},
     EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES:
         {'queue': CeleryQueues.EVENTS_JOB_STATUSES},
+    EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES_BATCH:
+        {'queue': CeleryQueues.EVENTS_JOB_STATUSES},
     EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES:
         {'queue': CeleryQueues.EVENTS_JOB_STATUSES},
     EventsCeleryTasks.EVENTS_HANDLE_PLUGIN_JOB_STATUSES:
         {'queue': CeleryQueues.EVENTS_JOB_STATUSES},
     EventsCeleryTasks.EVENTS_HANDLE_BUILD_JOB_STATUSES:
         {'queue': CeleryQueues.EVENTS_JOB_STATUSES},
+    ActionsCeleryTasks.ACTIONS_DELIVER_WEBHOOK:
+        {'queue': CeleryQueues.EVENTS_ACTIONS},
+    ActionsCeleryTasks.ACTIONS_SEND_WEBHOOK_DIGEST:
+        {'queue': CeleryQueues.EVENTS_ACTIONS},
+    AuditorCeleryTasks.AUDITOR_RECORD_EVENTS:
+        {'queue': CeleryQueues.EVENTS_AUDITOR},
+    AuditorCeleryTasks.AUDITOR_FLUSH_EVENTS:
+        {'queue': CeleryQueues.EVENTS_AUDITOR},
+    NotifierCeleryTasks.NOTIFIER_RECORD_EVENTS:
+        {'queue': CeleryQueues.EVENTS_AUDITOR},
+
     EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB:
         {'queue': CeleryQueues.LOGS_SIDECARS},
     EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB:
@@ -389,6 +562,27 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.LOGS_SIDECARS},
 }
 
+# The high volume events, i.e. the logs, resources and job statuses,
+# are sent with a compact binary serializer, it requires msgpack,
+# i.e. the services must be installed with `requirements/requirements-events-serializer.txt`
+EVENTS_SERIALIZER_MSGPACK = config.get_boolean('POLYAXON_EVENTS_SERIALIZER_MSGPACK',
+                                               is_optional=True,
+                                               default=False)
+# The events larger than this number of bytes are compressed, 0 to disable
+EVENTS_SERIALIZER_COMPRESS_THRESHOLD = config.get_int(
+    'POLYAXON_EVENTS_SERIALIZER_COMPRESS_THRESHOLD',
+    is_optional=True,
+    default=4 * 1024)
+if EVENTS_SERIALIZER_MSGPACK:
+    CELERY_ACCEPT_CONTENT += [events_serializer.CONTENT_TYPE]
+    CELERY_TASK_ROUTES = {
+        task: dict(route, serializer=events_serializer.NAME)
+        if route.get('queue') in (CeleryQueues.LOGS_SIDECARS,
+                                  CeleryQueues.EVENTS_RESOURCES,
+                                  CeleryQueues.EVENTS_JOB_STATUSES) else route
+        for task, route in CELERY_TASK_ROUTES.items()
+    }
+
 CELERY_BEAT_SCHEDULE = {
     CronsCeleryTasks.CLUSTERS_NOTIFICATION_ALIVE + '_beat': {
         'task': CronsCeleryTasks.CLUSTERS_NOTIFICATION_ALIVE,
@@ -404,6 +598,34 @@ CELERY_BEAT_SCHEDULE = {
             'expires': Intervals.get_expires(Intervals.EXPERIMENTS_SYNC),
         },
     },
+    SchedulerCeleryTasks.EXPERIMENTS_ADMIT + '_beat': {
+        'task': SchedulerCeleryTasks.EXPERIMENTS_ADMIT,
+        'schedule': Intervals.get_schedule(Intervals.EXPERIMENTS_ADMISSION),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.EXPERIMENTS_ADMISSION),
+        },
+    },
+    CronsCeleryTasks.EXPERIMENTS_COMPACT_METRICS + '_beat': {
+        'task': CronsCeleryTasks.EXPERIMENTS_COMPACT_METRICS,
+        'schedule': Intervals.get_schedule(Intervals.EXPERIMENTS_COMPACT_METRICS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.EXPERIMENTS_COMPACT_METRICS),
+        },
+    },
+    CronsCeleryTasks.EVENTS_CLEAN_EXPIRED + '_beat': {
+        'task': CronsCeleryTasks.EVENTS_CLEAN_EXPIRED,
+        'schedule': Intervals.get_schedule(Intervals.EVENTS_CLEAN_EXPIRED),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.EVENTS_CLEAN_EXPIRED),
+        },
+    },
+    CronsCeleryTasks.ARCHIVES_CLEAN + '_beat': {
+        'task': CronsCeleryTasks.ARCHIVES_CLEAN,
+        'schedule': Intervals.get_schedule(Intervals.ARCHIVES_CLEAN),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.ARCHIVES_CLEAN),
+        },
+    },
     CronsCeleryTasks.CLUSTERS_UPDATE_SYSTEM_INFO + '_beat': {
         'task': CronsCeleryTasks.CLUSTERS_UPDATE_SYSTEM_INFO,
         'schedule': Intervals.get_schedule(Intervals.CLUSTERS_UPDATE_SYSTEM_INFO),
@@ -418,6 +640,13 @@ CELERY_BEAT_SCHEDULE = {
             'expires': Intervals.get_expires(Intervals.CLUSTERS_UPDATE_SYSTEM_NODES),
         },
     },
+    AuditorCeleryTasks.AUDITOR_FLUSH_EVENTS + '_beat': {
+        'task': AuditorCeleryTasks.AUDITOR_FLUSH_EVENTS,
+        'schedule': Intervals.get_schedule(Intervals.AUDITOR_FLUSH_EVENTS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.AUDITOR_FLUSH_EVENTS),
+        },
+    },
     CronsCeleryTasks.CLUSTERS_NODES_NOTIFICATION_ALIVE + '_beat': {
         'task': CronsCeleryTasks.CLUSTERS_NODES_NOTIFICATION_ALIVE,
         'schedule': Intervals.get_schedule(Intervals.CLUSTERS_NOTIFICATION_ALIVE),
@@ -9,6 +9,44 @@ K8S_GPU_RESOURCE_KEY = config.get_string('POLYAXON_K8S_GPU_RESOURCE_KEY')
 CLUSTER_ID = config.get_string('POLYAXON_CLUSTER_ID', is_optional=True)
 REPOS_ARCHIVE_ROOT = '/tmp/archived_repos'
 OUTPUTS_ARCHIVE_ROOT = '/tmp/archived_outputs'
+# The cached archives of the repos and outputs are removed after this number of seconds.
+# N.B. the archives are removed by the crons, the archive roots must be shared with them
+ARCHIVES_TTL = config.get_int('POLYAXON_ARCHIVES_TTL',
+                              is_optional=True,
+                              default=24 * 60 * 60)
+# Raw metrics of experiments finished since more than `METRICS_COMPACTION_DELAY` seconds,
+# and having more than `METRICS_COMPACTION_MIN_COUNT` rows, are compacted into chunks
+METRICS_COMPACTION_DELAY = config.get_int('POLYAXON_METRICS_COMPACTION_DELAY',
+                                          is_optional=True,
+                                          default=24 * 60 * 60)
+METRICS_COMPACTION_MIN_COUNT = config.get_int('POLYAXON_METRICS_COMPACTION_MIN_COUNT',
+                                              is_optional=True,
+                                              default=1000)
+# The activity logs and notification events are kept `EVENTS_RETENTION_TTL` days,
+# and `EVENTS_RETENTION_VIEWS_TTL` days for the view events, unless their action has a ttl
+# in `EVENTS_RETENTION_ACTIONS_TTL`, e.g. `{"deleted_triggered": 730}`, 0 keeps them forever
+EVENTS_RETENTION_TTL = config.get_int('POLYAXON_EVENTS_RETENTION_TTL',
+                                      is_optional=True,
+                                      default=365)
+EVENTS_RETENTION_VIEWS_TTL = config.get_int('POLYAXON_EVENTS_RETENTION_VIEWS_TTL',
+                                            is_optional=True,
+                                            default=30)
+EVENTS_RETENTION_ACTIONS_TTL = config.get_dict('POLYAXON_EVENTS_RETENTION_ACTIONS_TTL',
+                                               is_optional=True,
+                                               default={})
+# The expired events are deleted by chunks of `EVENTS_RETENTION_CHUNK_SIZE` rows,
+# at most `EVENTS_RETENTION_MAX_CHUNKS` chunks per table and cleanup
+EVENTS_RETENTION_CHUNK_SIZE = config.get_int('POLYAXON_EVENTS_RETENTION_CHUNK_SIZE',
+                                             is_optional=True,
+                                             default=1000)
+EVENTS_RETENTION_MAX_CHUNKS = config.get_int('POLYAXON_EVENTS_RETENTION_MAX_CHUNKS',
+                                             is_optional=True,
+                                             default=10)
+# The expired events are exported to this path before being deleted, if it is set.
+# N.B. the archives are the only copy of the deleted events, the path must be a persistent volume
+EVENTS_ARCHIVE_ROOT = config.get_string('POLYAXON_EVENTS_ARCHIVE_ROOT',
+                                        is_optional=True,
+                                        default='')
 
 ALLOWED_HOSTS = ['*']
 
@@ -0,0 +1,36 @@
+from polyaxon.config_manager import config
+
+# The requests timeout in seconds
+INTEGRATIONS_WEBHOOKS_TIMEOUT = config.get_int('POLYAXON_INTEGRATIONS_WEBHOOKS_TIMEOUT',
+                                               is_optional=True,
+                                               default=10)
+# The failed deliveries are retried with an exponential backoff, starting at the retry delay
+INTEGRATIONS_WEBHOOKS_MAX_RETRIES = config.get_int('POLYAXON_INTEGRATIONS_WEBHOOKS_MAX_RETRIES',
+                                                   is_optional=True,
+                                                   default=5)
+INTEGRATIONS_WEBHOOKS_RETRY_DELAY = config.get_int('POLYAXON_INTEGRATIONS_WEBHOOKS_RETRY_DELAY',
+                                                   is_optional=True,
+                                                   default=30)
+# The maximum number of requests per minute, and of concurrent requests, to an endpoint
+INTEGRATIONS_WEBHOOKS_RATE_LIMIT = config.get_int('POLYAXON_INTEGRATIONS_WEBHOOKS_RATE_LIMIT',
+                                                  is_optional=True,
+                                                  default=30)
+INTEGRATIONS_WEBHOOKS_CONCURRENCY = config.get_int('POLYAXON_INTEGRATIONS_WEBHOOKS_CONCURRENCY',
+                                                   is_optional=True,
+                                                   default=2)
+# The deliveries to an endpoint are suspended for the cooldown in seconds,
+# after the number of consecutive failures
+INTEGRATIONS_WEBHOOKS_CIRCUIT_FAILURES = config.get_int(
+    'POLYAXON_INTEGRATIONS_WEBHOOKS_CIRCUIT_FAILURES',
+    is_optional=True,
+    default=5)
+INTEGRATIONS_WEBHOOKS_CIRCUIT_COOLDOWN = config.get_int(
+    'POLYAXON_INTEGRATIONS_WEBHOOKS_CIRCUIT_COOLDOWN',
+    is_optional=True,
+    default=300)
+# The notifications sent to an endpoint within the window in seconds are sent as one digest,
+# 0 disables the digests
+INTEGRATIONS_WEBHOOKS_DIGEST_WINDOW = config.get_int(
+    'POLYAXON_INTEGRATIONS_WEBHOOKS_DIGEST_WINDOW',
+    is_optional=True,
+    default=10)
@@ -13,6 +13,16 @@ K8S_AUTHORISATION = config.get_string('POLYAXON_K8S_AUTHORISATION',
                                       is_secret=True)
 K8S_HOST = config.get_string('POLYAXON_K8S_HOST', is_optional=True)
 SSL_CA_CERT = config.get_string('POLYAXON_K8S_SSL_CA_CERT', is_optional=True)
+# Max number of concurrent Kubernetes API calls used to create the replicas of an experiment
+K8S_SPAWN_WORKERS = config.get_int('POLYAXON_K8S_SPAWN_WORKERS', is_optional=True, default=8)
+# Seconds the statuses monitor coalesces the statuses of the experiment jobs before sending them
+K8S_STATUSES_COALESCE_WINDOW = config.get_float('POLYAXON_K8S_STATUSES_COALESCE_WINDOW',
+                                                is_optional=True,
+                                                default=1)
+# Max number of experiment job statuses sent in one batch by the statuses monitor
+K8S_STATUSES_BATCH_SIZE = config.get_int('POLYAXON_K8S_STATUSES_BATCH_SIZE',
+                                         is_optional=True,
+                                         default=100)
 
 K8S_CONFIG = None
 if K8S_AUTHORISATION and K8S_HOST:
@@ -0,0 +1,19 @@
+from polyaxon.config_manager import config
+
+# The recipients of the projects and users are cached for this number of seconds
+NOTIFIER_RECIPIENTS_CACHE_TTL = config.get_int('POLYAXON_NOTIFIER_RECIPIENTS_CACHE_TTL',
+                                               is_optional=True,
+                                               default=10 * 60)
+# The events of a project are notified together after this number of seconds, 0 to disable
+NOTIFIER_BATCH_WINDOW = config.get_int('POLYAXON_NOTIFIER_BATCH_WINDOW',
+                                       is_optional=True,
+                                       default=2)
+# The events of a project are notified with the next batch, if their batch was not notified
+# this number of seconds after the end of its window
+NOTIFIER_BATCH_TIMEOUT = config.get_int('POLYAXON_NOTIFIER_BATCH_TIMEOUT',
+                                        is_optional=True,
+                                        default=60)
+# Whether the events of a batch with the same type and instance are notified only once
+NOTIFIER_DIGEST = config.get_boolean('POLYAXON_NOTIFIER_DIGEST',
+                                     is_optional=True,
+                                     default=False)
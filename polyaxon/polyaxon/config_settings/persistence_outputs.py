@@ -1,3 +1,10 @@
 from polyaxon.config_manager import config
 
 PERSISTENCE_OUTPUTS = config.get_dict('POLYAXON_PERSISTENCE_OUTPUTS')
+# The outputs of the done experiments can be copied with hard links when copy-on-write is not
+# supported, the linked files share their content and their mode with the original outputs.
+# N.B. the jobs updating the copied files in place update the original outputs with them,
+# it should only be enabled when the copied outputs are not updated.
+OUTPUTS_COPY_HARDLINKS = config.get_boolean('POLYAXON_OUTPUTS_COPY_HARDLINKS',
+                                            is_optional=True,
+                                            default=False)
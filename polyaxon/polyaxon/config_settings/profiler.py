@@ -0,0 +1,35 @@
+from polyaxon.config_manager import config
+
+from .celery_settings import (
+    EventsCeleryTasks,
+    HPCeleryTasks,
+    PipelineCeleryTasks,
+    SchedulerCeleryTasks
+)
+
+# The requests of staff users with this header, or this query param, are profiled
+PROFILER_HEADER = 'HTTP_X_POLYAXON_PROFILE'
+PROFILER_QUERY_PARAM = 'profile'
+# The fraction of the requests and tasks profiled without being asked, 0 to disable
+PROFILER_SAMPLE_RATE = config.get_float('POLYAXON_PROFILER_SAMPLE_RATE',
+                                        is_optional=True,
+                                        default=0.)
+# The profiles are kept for this number of seconds
+PROFILER_TTL = config.get_int('POLYAXON_PROFILER_TTL',
+                              is_optional=True,
+                              default=24 * 60 * 60)
+# The number of profiles listed
+PROFILER_MAX_PROFILES = config.get_int('POLYAXON_PROFILER_MAX_PROFILES',
+                                       is_optional=True,
+                                       default=100)
+# The number of functions, by cumulative time, kept in a profile
+PROFILER_MAX_FUNCTIONS = config.get_int('POLYAXON_PROFILER_MAX_FUNCTIONS',
+                                        is_optional=True,
+                                        default=50)
+
+# The celery tasks that can be profiled
+PROFILER_TASKS = {value for tasks_class in (SchedulerCeleryTasks,
+                                            HPCeleryTasks,
+                                            EventsCeleryTasks,
+                                            PipelineCeleryTasks)
+                  for key, value in vars(tasks_class).items() if key.isupper()}
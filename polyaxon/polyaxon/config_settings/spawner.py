@@ -11,6 +11,19 @@ K8S_RBAC_ENABLED = config.get_boolean('POLYAXON_K8S_RBAC_ENABLED')
 K8S_PROVISIONER_ENABLED = config.get_boolean('POLYAXON_K8S_PROVISIONER_ENABLED')
 K8S_INGRESS_ENABLED = config.get_boolean('POLYAXON_K8S_INGRESS_ENABLED')
 K8S_INGRESS_ANNOTATIONS = config.get_string('POLYAXON_K8S_INGRESS_ANNOTATIONS', is_optional=True)
+# Admission, the experiments waiting for resources share the cluster by `user` or `project`
+ADMISSION_FAIR_SHARE = config.get_string('POLYAXON_ADMISSION_FAIR_SHARE',
+                                         is_optional=True,
+                                         default='user')
+# Seconds a distributed experiment holds its reserved resources without any progress of its pods
+GANG_SCHEDULING_TIMEOUT = config.get_int('POLYAXON_GANG_SCHEDULING_TIMEOUT',
+                                         is_optional=True,
+                                         default=600)
+# Seconds a released experiment waits before being admitted again,
+# should be longer than the termination grace period of its pods
+GANG_SCHEDULING_RELEASE_COOLDOWN = config.get_int('POLYAXON_GANG_SCHEDULING_RELEASE_COOLDOWN',
+                                                  is_optional=True,
+                                                  default=60)
 TENSORBOARD_PORT_RANGE = [5700, 6700]
 NOTEBOOK_PORT_RANGE = [6700, 7700]
 
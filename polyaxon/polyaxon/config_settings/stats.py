@@ -8,3 +8,17 @@ STATS_BACKEND = config.get_string(
     is_optional=True,
     default=STATS_BACKEND_NOOP,
     options=(STATS_BACKEND_NOOP, STATS_BACKEND_DATADOG, STATS_BACKEND_STATSD))
+DEFAULT_STATS_PREFIX = config.get_string('POLYAXON_STATS_PREFIX',
+                                         is_optional=True,
+                                         default='polyaxon')
+# The fraction of the timings, gauges and histograms sent to the backend,
+# the hot paths are sampled to keep the overhead bounded
+STATS_SAMPLE_RATE = config.get_float('POLYAXON_STATS_SAMPLE_RATE',
+                                     is_optional=True,
+                                     default=1.)
+STATS_STATSD_HOST = config.get_string('POLYAXON_STATS_STATSD_HOST',
+                                      is_optional=True,
+                                      default='localhost')
+STATS_STATSD_PORT = config.get_int('POLYAXON_STATS_STATSD_PORT',
+                                   is_optional=True,
+                                   default=8125)
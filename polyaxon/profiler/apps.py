@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ProfilerConfig(AppConfig):
+    name = 'profiler'
+    verbose_name = 'Profiler'
+
+    def ready(self):
+        import profiler.signals  # noqa
@@ -0,0 +1,61 @@
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from django.conf import settings
+
+from profiler.profiler import Profiler, get_current_profiler, should_sample
+
+PROFILE_ID_HEADER = 'X-Polyaxon-Profile-Id'
+
+
+def is_profile_requested(request):
+    return bool(request.META.get(settings.PROFILER_HEADER) or
+                request.GET.get(settings.PROFILER_QUERY_PARAM))
+
+
+def get_request_user(request):
+    """Authenticates the user of a request before the views, e.g. with the api token."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+
+    # The authenticators are called directly, the request is not modified for the views
+    api_request = Request(request)
+    for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            user_auth = authentication().authenticate(api_request)
+        except APIException:
+            return None
+        if user_auth is not None:
+            return user_auth[0]
+    return None
+
+
+def is_staff_request(request):
+    user = get_request_user(request)
+    return bool(user and user.is_staff)
+
+
+class ProfilerMiddleware(object):
+    """Profiles the requests asked by the staff users, and a sample of all the requests.
+
+    The user is authenticated before the profiler is started,
+    the profiles requested by other users are ignored, and do not slow down their requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if get_current_profiler() is not None:
+            return self.get_response(request)
+
+        is_requested = is_profile_requested(request) and is_staff_request(request)
+        if not is_requested and not should_sample():
+            return self.get_response(request)
+
+        with Profiler(name='{} {}'.format(request.method, request.path)) as profiler:
+            response = self.get_response(request)
+        response[PROFILE_ID_HEADER] = profiler.save()
+        return response
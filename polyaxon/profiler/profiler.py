@@ -0,0 +1,159 @@
+import cProfile
+import pstats
+import threading
+import time
+import uuid
+
+from random import random
+
+import redis
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from libs.redis_db import RedisProfiles
+
+_local = threading.local()
+_redis_hooks_lock = threading.Lock()
+_redis_hooks_users = 0
+# The methods counted as redis calls, and their original implementation while hooked
+_redis_hooks = {(redis.StrictRedis, 'execute_command'): None,
+                (redis.client.BasePipeline, 'execute'): None}
+
+
+def get_current_profiler():
+    return getattr(_local, 'profiler', None)
+
+
+def should_sample():
+    sample_rate = settings.PROFILER_SAMPLE_RATE
+    return sample_rate > 0 and random() < sample_rate
+
+
+def _count_redis_calls(func):
+    def wrapper(*args, **kwargs):
+        profiler = get_current_profiler()
+        if profiler is not None:
+            profiler.redis_calls += 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def install_redis_hooks():
+    """Counts the redis commands, a pipeline counts as one call, of the profiled threads.
+
+    The redis client is patched only while at least one profiler is active,
+    every call must be followed by a call to `uninstall_redis_hooks`.
+    """
+    global _redis_hooks_users  # pylint:disable=global-statement
+    with _redis_hooks_lock:
+        if not _redis_hooks_users:
+            for klass, name in _redis_hooks:
+                original = klass.__dict__[name]
+                _redis_hooks[(klass, name)] = original
+                setattr(klass, name, _count_redis_calls(original))
+        _redis_hooks_users += 1
+
+
+def uninstall_redis_hooks():
+    """Restores the redis client once the last active profiler is stopped."""
+    global _redis_hooks_users  # pylint:disable=global-statement
+    with _redis_hooks_lock:
+        _redis_hooks_users -= 1
+        if not _redis_hooks_users:
+            for (klass, name), original in _redis_hooks.items():
+                setattr(klass, name, original)
+                _redis_hooks[(klass, name)] = None
+
+
+def get_functions_stats(profile, max_functions):
+    """Returns the functions with the highest cumulative times."""
+    functions = []
+    for (file_name, line, name), (_, calls, total_time, cumulative_time, _) in (
+            pstats.Stats(profile).stats.items()):
+        functions.append({
+            'function': '{}:{}({})'.format(file_name, line, name),
+            'calls': calls,
+            'total_time': total_time,
+            'cumulative_time': cumulative_time,
+        })
+    functions.sort(key=lambda function: function['cumulative_time'], reverse=True)
+    return functions[:max_functions]
+
+
+class Profiler(object):
+    """Profiles the calls, the sql queries, and the redis and amqp calls of a block of code.
+
+    Only one profiler is active per thread, the profilers started inside an active one,
+    e.g. the eager celery tasks of a profiled request, are included in it.
+
+    >>> with Profiler(name='GET /api/v1/users') as profiler:
+    ...     pass
+    >>> profiler.save()
+    """
+
+    def __init__(self, name, parent_id=None):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.parent_id = parent_id
+        self.sql_queries = 0
+        self.sql_time = 0
+        self.redis_calls = 0
+        self.amqp_calls = 0
+        self._profile = cProfile.Profile()
+        self._sql_wrapper = None
+        self._created_at = None
+        self._started_at = None
+        self._duration = None
+
+    def _record_sql(self, execute, sql, params, many, context):
+        started_at = time.time()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_queries += 1
+            self.sql_time += time.time() - started_at
+
+    def start(self):
+        install_redis_hooks()
+        _local.profiler = self
+        self._created_at = timezone.now()
+        self._sql_wrapper = connection.execute_wrapper(self._record_sql)
+        self._sql_wrapper.__enter__()
+        self._started_at = time.time()
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self._duration = time.time() - self._started_at
+        self._sql_wrapper.__exit__(None, None, None)
+        _local.profiler = None
+        uninstall_redis_hooks()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'parent_id': self.parent_id,
+            'created_at': self._created_at,
+            'duration': self._duration,
+            'sql': {'queries': self.sql_queries, 'time': self.sql_time},
+            'redis': {'calls': self.redis_calls},
+            'amqp': {'calls': self.amqp_calls},
+            'functions': get_functions_stats(self._profile, settings.PROFILER_MAX_FUNCTIONS),
+        }
+
+    def save(self):
+        RedisProfiles.set_profile(self.to_dict(),
+                                  ttl=settings.PROFILER_TTL,
+                                  max_profiles=settings.PROFILER_MAX_PROFILES)
+        return self.id
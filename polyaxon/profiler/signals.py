@@ -0,0 +1,41 @@
+from celery.signals import before_task_publish, task_postrun, task_prerun
+
+from django.conf import settings
+
+from profiler.profiler import Profiler, get_current_profiler, should_sample
+
+PROFILE_HEADER = 'polyaxon_profile'
+
+_profilers = {}
+
+
+@before_task_publish.connect(weak=False)
+def task_before_publish(headers=None, **kwargs):
+    profiler = get_current_profiler()
+    if profiler is None:
+        return
+    profiler.amqp_calls += 1
+    if headers is not None:
+        # The tasks sent by a profiled request or task are profiled as well,
+        # the profilers are only started for the staff users or by sampling
+        headers[PROFILE_HEADER] = profiler.id
+
+
+@task_prerun.connect(weak=False)
+def task_before_run(task_id=None, task=None, **kwargs):
+    if task.name not in settings.PROFILER_TASKS or get_current_profiler() is not None:
+        return
+    parent_id = getattr(task.request, PROFILE_HEADER, None)
+    if not parent_id and not should_sample():
+        return
+    profiler = Profiler(name=task.name, parent_id=parent_id)
+    _profilers[task_id] = profiler
+    profiler.start()
+
+
+@task_postrun.connect(weak=False)
+def task_after_run(task_id=None, **kwargs):
+    profiler = _profilers.pop(task_id, None)
+    if profiler is not None:
+        profiler.stop()
+        profiler.save()
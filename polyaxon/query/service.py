@@ -1,3 +1,5 @@
+import stats
+
 from libs.services import Service
 from query.managers.build import BuildQueryManager
 from query.managers.experiment import ExperimentQueryManager
@@ -12,6 +14,11 @@ class QueryService(Service):
 
     @classmethod
     def filter_queryset(cls, manager, query_spec, queryset):
+        with stats.timer('query.{}.build'.format(manager)):
+            return cls._filter_queryset(manager=manager, query_spec=query_spec, queryset=queryset)
+
+    @staticmethod
+    def _filter_queryset(manager, query_spec, queryset):
         if manager == ExperimentQueryManager.NAME:
             return ExperimentQueryManager.apply(query_spec=query_spec, queryset=queryset)
         if manager == ExperimentGroupQueryManager.NAME:
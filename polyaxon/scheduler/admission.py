@@ -0,0 +1,233 @@
+"""Admission of experiments based on the cluster capacity.
+
+Experiments that do not fit in the cluster are kept in the db with a `queued` status,
+instead of creating pods that would stay pending in Kubernetes,
+and are admitted once enough resources are released.
+
+Distributed experiments are admitted all or nothing: the resources of all their replicas
+are reserved before any pod is created. Replicas that are scheduled while their peers
+are pending hold resources that other experiments could use, so the reservation is
+released, and the experiment queued again, if its replicas stop making progress.
+A released experiment is only admitted again after a cooldown,
+so that its pods are terminated before being created again.
+"""
+import logging
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from constants.experiments import ExperimentLifeCycle
+from db.locks import advisory_xact_lock
+from db.models.experiments import Experiment
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import SchedulerCeleryTasks
+from scheduler import experiment_scheduler
+from scheduler.capacity import ClusterCapacity, Resources, get_experiment_replicas
+
+_logger = logging.getLogger('polyaxon.scheduler.admission')
+
+ADMISSION_LOCK_KEY = 'scheduler:admission'
+
+FAIR_SHARE_USER = 'user'
+FAIR_SHARE_PROJECT = 'project'
+
+
+def get_owner(experiment):
+    """The key the experiments share the cluster by."""
+    if settings.ADMISSION_FAIR_SHARE == FAIR_SHARE_PROJECT:
+        return FAIR_SHARE_PROJECT, experiment.project_id
+    return FAIR_SHARE_USER, experiment.user_id
+
+
+def get_demands(experiment):
+    return [resources for _, _, resources in get_experiment_replicas(experiment.specification)]
+
+
+def is_gang(demands):
+    """Distributed experiments need all their replicas running to make any progress."""
+    return len(demands) > 1
+
+
+def get_queued_experiments():
+    return Experiment.objects.filter(
+        status__status=ExperimentLifeCycle.QUEUED).order_by('status__created_at')
+
+
+def get_admissible_experiments():
+    """The queued experiments, without the ones released during the cooldown.
+
+    The pods of a released experiment could still be terminating,
+    and their names are the same when the experiment is started again.
+    """
+    cooldown = timezone.now() - timedelta(seconds=settings.GANG_SCHEDULING_RELEASE_COOLDOWN)
+    return get_queued_experiments().annotate(
+        scheduled_at=Max('statuses__created_at',
+                         filter=Q(statuses__status=ExperimentLifeCycle.SCHEDULED))
+    ).exclude(scheduled_at__isnull=False, status__created_at__gt=cooldown)
+
+
+def admit_experiment(experiment):
+    """Decides if an experiment can start now, otherwise the experiment is queued.
+
+    An admitted experiment is moved to the `scheduled` status while holding the admission lock,
+    so that its resources are accounted for by the next admissions.
+    Distributed experiments that cannot fit in the cluster, even when empty, are failed.
+
+    Returns:
+        bool: whether the experiment was admitted.
+    """
+    with advisory_xact_lock(ADMISSION_LOCK_KEY):
+        capacity = ClusterCapacity.load()
+        if capacity is None:
+            # No node is known yet, Kubernetes will do the scheduling
+            return True
+
+        demands = get_demands(experiment)
+        if not capacity.can_ever_place(demands):
+            if is_gang(demands):
+                # Some replicas would wait forever on peers that cannot be scheduled
+                experiment.set_status(ExperimentLifeCycle.FAILED,
+                                      message='The cluster cannot fit all the replicas '
+                                              'of the experiment.')
+                return False
+            _logger.warning('Experiment `%s` requests more resources than the cluster can '
+                            'provide, it will not be queued.', experiment.unique_name)
+        elif get_queued_experiments().exists() or not capacity.place(demands):
+            experiment.set_status(ExperimentLifeCycle.QUEUED,
+                                  message='Waiting for cluster resources.')
+            return False
+
+        experiment.set_status(ExperimentLifeCycle.SCHEDULED)
+        return True
+
+
+def admit_experiments():
+    """Admits the queued experiments that fit in the cluster.
+
+    The owners (users or projects) using the least resources go first,
+    and the experiments of an owner are admitted in the order they were queued.
+    Smaller experiments can be admitted before larger ones that do not fit yet.
+
+    Returns:
+        list: the ids of the admitted experiments.
+    """
+    admitted = []
+    with advisory_xact_lock(ADMISSION_LOCK_KEY):
+        queued = list(get_admissible_experiments())
+        if not queued:
+            return admitted
+
+        capacity = ClusterCapacity.load()
+        if capacity is None:
+            admitted = queued
+        else:
+            shares = defaultdict(Resources)
+            for experiment, resources in capacity.experiments:
+                shares[get_owner(experiment)] += resources
+            demands = {experiment.id: get_demands(experiment) for experiment in queued}
+
+            while queued:
+                # Sorting is stable, so the queue order is kept between equal shares
+                queued.sort(key=lambda experiment: shares[get_owner(experiment)].key)
+                for experiment in queued:
+                    if capacity.place(demands[experiment.id]):
+                        break
+                else:
+                    break
+                queued.remove(experiment)
+                admitted.append(experiment)
+                for resources in demands[experiment.id]:
+                    shares[get_owner(experiment)] += resources
+
+        for experiment in admitted:
+            experiment.set_status(ExperimentLifeCycle.SCHEDULED)
+
+    for experiment in admitted:
+        _logger.info('Experiment `%s` was admitted.', experiment.unique_name)
+        celery_app.send_task(
+            SchedulerCeleryTasks.EXPERIMENTS_START,
+            kwargs={'experiment_id': experiment.id, 'admitted': True})
+    return [experiment.id for experiment in admitted]
+
+
+def get_expired_reservations():
+    """The experiments whose pods did not make any progress during the gang scheduling timeout.
+
+    The replicas of an experiment only run once all of them are scheduled by Kubernetes,
+    before that the experiment is `scheduled` or `starting`.
+    The timeout is measured from the last status change of the jobs,
+    and the experiments whose replicas are all bound to a node, e.g. pulling their images,
+    are not waiting for resources anymore.
+    """
+    deadline = timezone.now() - timedelta(seconds=settings.GANG_SCHEDULING_TIMEOUT)
+    return Experiment.objects.filter(
+        status__status__in={ExperimentLifeCycle.SCHEDULED, ExperimentLifeCycle.STARTING}
+    ).annotate(
+        scheduled_at=Max('statuses__created_at',
+                         filter=Q(statuses__status=ExperimentLifeCycle.SCHEDULED))
+    ).annotate(
+        progressed_at=Greatest('scheduled_at',
+                               Coalesce(Max('jobs__statuses__created_at'), 'scheduled_at')),
+        jobs_count=Count('jobs', distinct=True),
+        unbound_jobs_count=Count('jobs',
+                                 filter=Q(jobs__node_scheduled__isnull=True),
+                                 distinct=True)
+    ).filter(
+        Q(jobs_count=0) | Q(unbound_jobs_count__gt=0),
+        progressed_at__lt=deadline
+    ).select_related('project', 'experiment_group')
+
+
+def release_reservation(experiment):
+    """Stops the pods of the experiment, a failure to do so is logged but does not prevent
+    the release, the pods left are deleted when the experiment is started again.
+    """
+    group = experiment.experiment_group
+    try:
+        experiment_scheduler.stop_experiment(
+            project_name=experiment.project.unique_name,
+            project_uuid=experiment.project.uuid.hex,
+            experiment_name=experiment.unique_name,
+            experiment_uuid=experiment.uuid.hex,
+            specification=experiment.specification,
+            experiment_group_name=group.unique_name if group else None,
+            experiment_group_uuid=group.uuid.hex if group else None)
+    except Exception:  # pylint:disable=broad-except
+        _logger.warning('Could not stop the pods of experiment `%s`.',
+                        experiment.unique_name, exc_info=True)
+    experiment.jobs.all().delete()
+    experiment.set_status(ExperimentLifeCycle.QUEUED,
+                          message='Not all the replicas were scheduled in time, '
+                                  'waiting for cluster resources.')
+
+
+def release_reservations():
+    """Queues again the distributed experiments whose replicas did not all run in time.
+
+    Their pods are stopped, and their jobs deleted, while holding the admission lock,
+    so that the resources they reserved can be used by the next admissions,
+    the experiment is started again once admitted after the release cooldown.
+
+    Returns:
+        list: the ids of the released experiments.
+    """
+    if not settings.GANG_SCHEDULING_TIMEOUT:
+        return []
+
+    with advisory_xact_lock(ADMISSION_LOCK_KEY):
+        released = [experiment for experiment in get_expired_reservations()
+                    if is_gang(get_demands(experiment))]
+        # Without a capacity model, the experiments would be admitted again right away
+        if not released or ClusterCapacity.load() is None:
+            return []
+
+        for experiment in released:
+            _logger.info('The reservation of experiment `%s` expired.', experiment.unique_name)
+            release_reservation(experiment)
+
+    return [experiment.id for experiment in released]
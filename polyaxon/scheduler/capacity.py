@@ -0,0 +1,217 @@
+"""An in-memory view of the cluster capacity used to admit experiments.
+
+The capacity of the nodes comes from `ClusterNode`, and the usage from the resources
+requested by the running experiments and jobs. Resources are tracked in cpu cores,
+memory bytes and gpus, based on the requests (or the limits if no requests were set).
+"""
+import logging
+
+from constants.experiments import ExperimentLifeCycle
+from constants.jobs import JobLifeCycle
+from constants.nodes import NodeLifeCycle
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from db.models.nodes import ClusterNode
+from db.models.notebooks import NotebookJob
+from db.models.tensorboards import TensorboardJob
+from schemas.frameworks import Frameworks
+from schemas.specifications import (
+    HorovodSpecification,
+    MXNetSpecification,
+    PytorchSpecification,
+    TensorflowSpecification
+)
+from schemas.tasks import TaskType
+
+_logger = logging.getLogger('polyaxon.scheduler.capacity')
+
+MB = 1024 * 1024
+
+FRAMEWORK_SPECIFICATIONS = {
+    Frameworks.TENSORFLOW: TensorflowSpecification,
+    Frameworks.HOROVOD: HorovodSpecification,
+    Frameworks.MXNET: MXNetSpecification,
+    Frameworks.PYTORCH: PytorchSpecification,
+}
+
+# Experiments holding resources on the cluster
+ACTIVE_EXPERIMENT_STATUSES = {ExperimentLifeCycle.SCHEDULED,
+                              ExperimentLifeCycle.STARTING,
+                              ExperimentLifeCycle.RUNNING}
+
+
+class Resources(object):
+    def __init__(self, cpu=0, memory=0, gpu=0):
+        self.cpu = cpu
+        self.memory = memory
+        self.gpu = gpu
+
+    def __add__(self, other):
+        return Resources(cpu=self.cpu + other.cpu,
+                         memory=self.memory + other.memory,
+                         gpu=self.gpu + other.gpu)
+
+    def __sub__(self, other):
+        return Resources(cpu=self.cpu - other.cpu,
+                         memory=self.memory - other.memory,
+                         gpu=self.gpu - other.gpu)
+
+    def __le__(self, other):
+        return self.cpu <= other.cpu and self.memory <= other.memory and self.gpu <= other.gpu
+
+    def __repr__(self):
+        return '<Resources cpu={} memory={} gpu={}>'.format(self.cpu, self.memory, self.gpu)
+
+    @property
+    def key(self):
+        """Sorting key, gpus are the scarcest resource."""
+        return self.gpu, self.cpu, self.memory
+
+    @classmethod
+    def from_config(cls, resources):
+        """Creates the requested resources from a `PodResourcesConfig` or its dict."""
+        if not resources:
+            return cls()
+
+        def get_value(resource):
+            if not resource:
+                return 0
+            if isinstance(resource, dict):
+                return resource.get('requests') or resource.get('limits') or 0
+            return resource.requests or resource.limits or 0
+
+        if isinstance(resources, dict):
+            cpu, memory, gpu = resources.get('cpu'), resources.get('memory'), resources.get('gpu')
+        else:
+            cpu, memory, gpu = resources.cpu, resources.memory, resources.gpu
+        return cls(cpu=get_value(cpu), memory=get_value(memory) * MB, gpu=get_value(gpu))
+
+
+def get_experiment_replicas(specification):
+    """Returns the (task type, task index, `Resources`) of every replica of an experiment."""
+    replicas = [(TaskType.MASTER, 0, Resources.from_config(specification.master_resources))]
+    spec_class = FRAMEWORK_SPECIFICATIONS.get(specification.framework)
+    if not spec_class:
+        return replicas
+
+    cluster, is_distributed = specification.cluster_def
+    tasks = ((spec_class.TASK_WORKER, spec_class.get_worker_resources),
+             (spec_class.TASK_PS, spec_class.get_ps_resources))
+    for task_type, get_task_resources in tasks:
+        task_resources = get_task_resources(environment=specification.environment,
+                                            cluster=cluster,
+                                            is_distributed=is_distributed) or {}
+        for task_idx in range(cluster.get(task_type, 0)):
+            replicas.append(
+                (task_type, task_idx, Resources.from_config(task_resources.get(task_idx))))
+    return replicas
+
+
+class NodeCapacity(object):
+    def __init__(self, name, capacity):
+        self.name = name
+        self.capacity = capacity
+        self.used = Resources()
+
+    @property
+    def free(self):
+        return self.capacity - self.used
+
+
+class ClusterCapacity(object):
+    """The capacity of the schedulable nodes and the resources used on each of them."""
+
+    def __init__(self, nodes):
+        self.nodes = {node.name: node for node in nodes}
+        # The experiments holding resources, with their total resources
+        self.experiments = []
+
+    @classmethod
+    def load(cls):
+        """Loads the current capacity of the cluster.
+
+        Returns `None` if no schedulable node is known, e.g. before the nodes were synced.
+        """
+        nodes = ClusterNode.objects.filter(is_current=True,
+                                           status=NodeLifeCycle.READY,
+                                           schedulable_taints=True,
+                                           schedulable_state=True)
+        nodes = [NodeCapacity(name=node.name,
+                              capacity=Resources(cpu=node.cpu,
+                                                 memory=node.memory,
+                                                 gpu=node.n_gpus))
+                 for node in nodes]
+        if not nodes:
+            return None
+
+        capacity = cls(nodes=nodes)
+        capacity.add_experiments_usage()
+        capacity.add_jobs_usage()
+        return capacity
+
+    def get_placement(self, demands):
+        """Bin-packs the demands onto the nodes, using the best fit for the largest demands first.
+
+        Returns:
+            list: the node name of every demand, or `None` if all the demands cannot be placed.
+        """
+        free = {name: node.free for name, node in self.nodes.items()}
+        placement = [None] * len(demands)
+        for i in sorted(range(len(demands)), key=lambda i: demands[i].key, reverse=True):
+            candidates = [name for name in free if demands[i] <= free[name]]
+            if not candidates:
+                return None
+            # Best fit: the node with the least resources left once the demand is placed
+            name = min(candidates, key=lambda name: (free[name] - demands[i]).key)
+            free[name] -= demands[i]
+            placement[i] = name
+        return placement
+
+    def reserve(self, demands, placement):
+        for resources, name in zip(demands, placement):
+            self.nodes[name].used += resources
+
+    def place(self, demands):
+        """Reserves all the demands if they can be placed, returns whether they were."""
+        placement = self.get_placement(demands)
+        if placement is None:
+            return False
+        self.reserve(demands, placement)
+        return True
+
+    def can_ever_place(self, demands):
+        """Whether the demands fit in the cluster when nothing else is running."""
+        empty = ClusterCapacity(nodes=[NodeCapacity(name=node.name, capacity=node.capacity)
+                                       for node in self.nodes.values()])
+        return empty.get_placement(demands) is not None
+
+    def use(self, resources, node_name=None):
+        """Marks resources used on the node they run on, or on the best fitting node."""
+        if node_name in self.nodes:
+            self.nodes[node_name].used += resources
+            return
+        if not self.place([resources]):
+            _logger.debug('Used resources %s do not fit in the known capacity.', resources)
+
+    def add_experiments_usage(self):
+        experiments = Experiment.objects.filter(
+            status__status__in=ACTIVE_EXPERIMENT_STATUSES).prefetch_related('jobs')
+        for experiment in experiments:
+            nodes = {}
+            for job in sorted(experiment.jobs.all(), key=lambda job: job.id):
+                nodes.setdefault(job.role, []).append(job.node_scheduled)
+            total = Resources()
+            for task_type, task_idx, resources in get_experiment_replicas(
+                    experiment.specification):
+                task_nodes = nodes.get(task_type, [])
+                self.use(resources=resources,
+                         node_name=task_nodes[task_idx] if task_idx < len(task_nodes) else None)
+                total += resources
+            self.experiments.append((experiment, total))
+
+    def add_jobs_usage(self):
+        for job_model in (Job, NotebookJob, TensorboardJob):
+            jobs = job_model.objects.filter(status__status__in=JobLifeCycle.RUNNING_STATUS)
+            for job in jobs:
+                self.use(resources=Resources.from_config(job.resources),
+                         node_name=job.node_scheduled)
@@ -1,3 +1,4 @@
+import json
 import logging
 
 from kubernetes.client.rest import ApiException
@@ -8,21 +9,38 @@ from django.utils.timezone import now
 import auditor
 
 from constants.jobs import JobLifeCycle
+from db.locks import advisory_xact_lock
 from db.models.build_jobs import BuildJob
-from docker_images.image_info import get_tagged_image
+from docker_images import registry
+from docker_images.image_info import get_image_info
 from event_manager.events.build_job import BUILD_JOB_STARTED, BUILD_JOB_STARTED_TRIGGERED
 from libs.paths.exceptions import VolumeNotFoundError
 from scheduler.spawners.dockerizer_spawner import DockerizerSpawner
 from scheduler.spawners.utils import get_job_definition
+from schemas.specifications import BuildSpecification
 
 _logger = logging.getLogger('polyaxon.scheduler.dockerizer')
 
 
 def check_image(build_job):
+    image_name, image_tag = get_image_info(build_job)
+    # The registry is the source of truth, the local daemon is only used as a fallback
+    image_exists = registry.image_exists(image_name=image_name, image_tag=image_tag)
+    if image_exists is not None:
+        return image_exists
+
     from docker import APIClient
 
     docker = APIClient(version='auto')
-    return docker.images(get_tagged_image(build_job))
+    return docker.images('{}:{}'.format(image_name, image_tag))
+
+
+def get_build_lock_key(project, config, code_reference):
+    build_config = BuildSpecification.create_specification(config, to_dict=False)
+    return 'build_job:{}:{}:{}'.format(
+        project.id,
+        code_reference.id if code_reference else None,
+        json.dumps(build_config.parsed_data, sort_keys=True))
 
 
 def create_build_job(user, project, config, code_reference):
@@ -31,41 +49,51 @@ def create_build_job(user, project, config, code_reference):
     If a build job already exists, then we check if the build has already an image created.
     If the image does not exists, and the job is already done we force create a new job.
 
+    Concurrent requests for the same build are serialized with an advisory lock,
+    only the first one starts the dockerizer, the others get the scheduled build job
+    and are started by `build_jobs_notify_done` once the build is done.
+
     Returns:
         tuple: (build_job, image_exists[bool], build_status[bool])
     """
-    build_job = BuildJob.create(
-        user=user,
-        project=project,
-        config=config,
-        code_reference=code_reference)
-
-    if check_image(build_job=build_job):
-        # Check if image exists already
-        return build_job, True, False
-
-    if build_job.succeeded and (now() - build_job.finished_at).seconds < 3600 * 6:
-        # Check if image was built in less than an 6 hours
-        return build_job, True, False
-
-    if build_job.is_done:
+    with advisory_xact_lock(get_build_lock_key(project=project,
+                                               config=config,
+                                               code_reference=code_reference)):
         build_job = BuildJob.create(
             user=user,
             project=project,
             config=config,
-            code_reference=code_reference,
-            nocache=True)
-
-    if not build_job.is_running:
-        # We need to build the image first
-        auditor.record(event_type=BUILD_JOB_STARTED_TRIGGERED,
-                       instance=build_job,
-                       actor_id=user.id,
-                       actor_name=user.username)
-        build_status = start_dockerizer(build_job=build_job)
-    else:
-        build_status = True
-
+            code_reference=code_reference)
+
+        if check_image(build_job=build_job):
+            # Check if image exists already
+            return build_job, True, False
+
+        if build_job.succeeded and (now() - build_job.finished_at).seconds < 3600 * 6:
+            # Check if image was built in less than an 6 hours
+            return build_job, True, False
+
+        if build_job.is_done:
+            build_job = BuildJob.create(
+                user=user,
+                project=project,
+                config=config,
+                code_reference=code_reference,
+                nocache=True)
+
+        if build_job.is_running:
+            # Another request already started the build
+            return build_job, False, True
+
+        # Mark the build as scheduled before releasing the lock
+        build_job.set_status(JobLifeCycle.SCHEDULED)
+
+    # We need to build the image first
+    auditor.record(event_type=BUILD_JOB_STARTED_TRIGGERED,
+                   instance=build_job,
+                   actor_id=user.id,
+                   actor_name=user.username)
+    build_status = start_dockerizer(build_job=build_job)
     return build_job, False, build_status
 
 
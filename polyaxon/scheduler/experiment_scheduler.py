@@ -4,6 +4,9 @@ import uuid
 from kubernetes.client.rest import ApiException
 
 from django.conf import settings
+from django.utils import timezone
+
+import stats
 
 from constants.experiments import ExperimentLifeCycle
 from db.models.experiment_jobs import ExperimentJob
@@ -383,9 +386,31 @@ def handle_experiment(experiment, spawner, response):
     handle_base_experiment(experiment=experiment, spawner=spawner, response=response)
 
 
+def start_spawner(spawner):
+    """Starts the experiment's resources, the created ones are deleted if any creation fails.
+
+    A failure to delete the resources is logged, the creation error is the one raised.
+    """
+    try:
+        with stats.timer('scheduler.experiments.spawn'):
+            return spawner.start_experiment()
+    except Exception:
+        try:
+            spawner.stop_experiment()
+        except Exception:  # pylint:disable=broad-except
+            _logger.warning('Could not delete the resources of the experiment `%s`.',
+                            spawner.experiment_name, exc_info=True)
+        raise
+
+
 def start_experiment(experiment):
-    # Update experiment status to show that its started
-    experiment.set_status(ExperimentLifeCycle.SCHEDULED)
+    # The time the experiment waited to be started, e.g. in the admission queue
+    stats.timing('scheduler.experiments.start_latency',
+                 (timezone.now() - experiment.created_at).total_seconds())
+
+    # Update experiment status to show that its started, unless the admission already did
+    if experiment.last_status != ExperimentLifeCycle.SCHEDULED:
+        experiment.set_status(ExperimentLifeCycle.SCHEDULED)
 
     project = experiment.project
     group = experiment.experiment_group
@@ -424,9 +449,10 @@ def start_experiment(experiment):
                             in_cluster=True,
                             job_docker_image=job_docker_image,
                             use_sidecar=True,
-                            sidecar_config=config.get_requested_params(to_str=True))
+                            sidecar_config=config.get_requested_params(to_str=True),
+                            spawn_workers=settings.K8S_SPAWN_WORKERS)
     try:
-        response = spawner.start_experiment()
+        response = start_spawner(spawner)
     except ApiException as e:
         _logger.error('Could not start the experiment, please check your polyaxon spec.',
                       exc_info=True)
@@ -475,5 +501,6 @@ def stop_experiment(project_name,
                             namespace=settings.K8S_NAMESPACE,
                             in_cluster=True,
                             use_sidecar=True,
-                            sidecar_config=config.get_requested_params(to_str=True))
+                            sidecar_config=config.get_requested_params(to_str=True),
+                            spawn_workers=settings.K8S_SPAWN_WORKERS)
     spawner.stop_experiment()
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from polyaxon_k8s.manager import K8SManager
 from scheduler.spawners.templates import constants, services
 from scheduler.spawners.templates.base_pods import get_pod_command_args
@@ -8,6 +10,7 @@ from scheduler.spawners.templates.volumes import (
     get_pod_volumes,
     get_shm_volumes
 )
+from scheduler.spawners.timers import time_api_calls
 from schemas.tasks import TaskType
 
 
@@ -39,7 +42,8 @@ class ExperimentSpawner(K8SManager):
                  ports=None,
                  use_sidecar=False,
                  sidecar_config=None,
-                 persist=False):
+                 persist=False,
+                 spawn_workers=1):
         self.spec = spec
         self.project_name = project_name
         self.experiment_group_name = experiment_group_name
@@ -73,10 +77,13 @@ class ExperimentSpawner(K8SManager):
                                            cloning_strategy=self.cloning_strategy,
                                            declarations=self.spec.declarations)
         self.persist = persist
+        self.spawn_workers = spawn_workers or 1
+        self._volumes = None
 
         super().__init__(k8s_config=k8s_config,
                          namespace=namespace,
                          in_cluster=in_cluster)
+        time_api_calls(self)
 
         # Set the cluster_def
         cluster_def = self.get_cluster()
@@ -100,6 +107,32 @@ class ExperimentSpawner(K8SManager):
     def get_n_pods(self, task_type):
         return 0
 
+    def get_volumes(self):
+        """Returns the volumes and volume mounts shared by all the replicas.
+
+        They are computed once per spawner, every call returns new lists.
+        """
+        if self._volumes is None:
+            volumes, volume_mounts = get_pod_volumes(
+                persistence_outputs=self.persistence_config.outputs,
+                persistence_data=self.persistence_config.data)
+            refs_volumes, refs_volume_mounts = get_pod_refs_outputs_volumes(
+                outputs_refs=self.outputs_refs_jobs,
+                persistence_outputs=self.persistence_config.outputs)
+            volumes += refs_volumes
+            volume_mounts += refs_volume_mounts
+            refs_volumes, refs_volume_mounts = get_pod_refs_outputs_volumes(
+                outputs_refs=self.outputs_refs_experiments,
+                persistence_outputs=self.persistence_config.outputs)
+            volumes += refs_volumes
+            volume_mounts += refs_volume_mounts
+            shm_volumes, shm_volume_mounts = get_shm_volumes()
+            volumes += shm_volumes
+            volume_mounts += shm_volume_mounts
+            self._volumes = volumes, volume_mounts
+        volumes, volume_mounts = self._volumes
+        return list(volumes), list(volume_mounts)
+
     def _create_job(self,
                     task_type,
                     task_idx,
@@ -115,23 +148,7 @@ class ExperimentSpawner(K8SManager):
         job_name = self.pod_manager.get_job_name(task_type=task_type, task_idx=task_idx)
         sidecar_args = get_sidecar_args(pod_id=job_name)
         labels = self.pod_manager.get_labels(task_type=task_type, task_idx=task_idx)
-
-        volumes, volume_mounts = get_pod_volumes(
-            persistence_outputs=self.persistence_config.outputs,
-            persistence_data=self.persistence_config.data)
-        refs_volumes, refs_volume_mounts = get_pod_refs_outputs_volumes(
-            outputs_refs=self.outputs_refs_jobs,
-            persistence_outputs=self.persistence_config.outputs)
-        volumes += refs_volumes
-        volume_mounts += refs_volume_mounts
-        refs_volumes, refs_volume_mounts = get_pod_refs_outputs_volumes(
-            outputs_refs=self.outputs_refs_experiments,
-            persistence_outputs=self.persistence_config.outputs)
-        volumes += refs_volumes
-        volume_mounts += refs_volume_mounts
-        shm_volumes, shm_volume_mounts = get_shm_volumes()
-        volumes += shm_volumes
-        volume_mounts += shm_volume_mounts
+        volumes, volume_mounts = self.get_volumes()
         pod = self.pod_manager.get_pod(
             task_type=task_type,
             task_idx=task_idx,
@@ -163,27 +180,42 @@ class ExperimentSpawner(K8SManager):
             results['service'] = service_resp.to_dict()
         return results
 
+    def _map(self, func, kwargs_list):
+        """Calls `func` with every kwargs of the list using up to `spawn_workers` threads.
+
+        All calls are waited for, the first exception raised, if any, is reraised.
+
+        Returns:
+            list: the results in the order of `kwargs_list`.
+        """
+        if self.spawn_workers <= 1 or len(kwargs_list) <= 1:
+            return [func(**kwargs) for kwargs in kwargs_list]
+
+        with ThreadPoolExecutor(max_workers=min(self.spawn_workers, len(kwargs_list))) as pool:
+            futures = [pool.submit(func, **kwargs) for kwargs in kwargs_list]
+            wait(futures)
+        return [future.result() for future in futures]
+
     def create_multi_jobs(self, task_type, add_service):
-        resp = []
+        jobs_kwargs = []
         n_pods = self.get_n_pods(task_type=task_type)
         for i in range(n_pods):
             command, args = self.get_pod_command_args(task_type=task_type, task_idx=i)
-            env_vars = self.get_env_vars(task_type=task_type, task_idx=i)
-            resources = self.get_resources(task_type=task_type, task_idx=i)
-            node_selector = self.get_node_selector(task_type=task_type, task_idx=i)
-            affinity = self.get_affinity(task_type=task_type, task_idx=i)
-            tolerations = self.get_tolerations(task_type=task_type, task_idx=i)
-            resp.append(self._create_job(task_type=task_type,
-                                         task_idx=i,
-                                         command=command,
-                                         args=args,
-                                         env_vars=env_vars,
-                                         resources=resources,
-                                         node_selector=node_selector,
-                                         affinity=affinity,
-                                         tolerations=tolerations,
-                                         add_service=add_service))
-        return resp
+            jobs_kwargs.append({
+                'task_type': task_type,
+                'task_idx': i,
+                'command': command,
+                'args': args,
+                'env_vars': self.get_env_vars(task_type=task_type, task_idx=i),
+                'resources': self.get_resources(task_type=task_type, task_idx=i),
+                'node_selector': self.get_node_selector(task_type=task_type, task_idx=i),
+                'affinity': self.get_affinity(task_type=task_type, task_idx=i),
+                'tolerations': self.get_tolerations(task_type=task_type, task_idx=i),
+                'add_service': add_service,
+            })
+
+        # The replicas already created are deleted by the caller, see `start_spawner`
+        return self._map(self._create_job, jobs_kwargs)
 
     def _delete_job(self, task_type, task_idx, has_service):
         job_name = self.pod_manager.get_job_name(task_type=task_type, task_idx=task_idx)
@@ -193,8 +225,10 @@ class ExperimentSpawner(K8SManager):
 
     def delete_multi_jobs(self, task_type, has_service):
         n_pods = self.get_n_pods(task_type=task_type)
-        for i in range(n_pods):
-            self._delete_job(task_type=task_type, task_idx=i, has_service=has_service)
+        self._map(self._delete_job, [
+            {'task_type': task_type, 'task_idx': i, 'has_service': has_service}
+            for i in range(n_pods)
+        ])
 
     def get_pod_command_args(self, task_type, task_idx):
         return get_pod_command_args(run_config=self.spec.run)
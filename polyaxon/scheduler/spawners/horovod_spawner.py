@@ -1,3 +1,5 @@
+from django.utils.functional import cached_property
+
 from scheduler.spawners.experiment_spawner import ExperimentSpawner
 from schemas.environments import HorovodClusterConfig
 from schemas.specifications import HorovodSpecification
@@ -8,7 +10,7 @@ class HorovodSpawner(ExperimentSpawner):
     MASTER_SERVICE = True
     WORKER_SERVICE = True
 
-    @property
+    @cached_property
     def resources(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_resources = HorovodSpecification.get_worker_resources(
@@ -21,7 +23,7 @@ class HorovodSpawner(ExperimentSpawner):
             TaskType.WORKER: worker_resources,
         }
 
-    @property
+    @cached_property
     def node_selectors(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_node_selectors = HorovodSpecification.get_worker_node_selectors(
@@ -34,7 +36,7 @@ class HorovodSpawner(ExperimentSpawner):
             TaskType.WORKER: worker_node_selectors,
         }
 
-    @property
+    @cached_property
     def affinities(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_affinities = HorovodSpecification.get_worker_affinities(
@@ -47,7 +49,7 @@ class HorovodSpawner(ExperimentSpawner):
             TaskType.WORKER: worker_affinities,
         }
 
-    @property
+    @cached_property
     def tolerations(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_tolerations = HorovodSpecification.get_worker_tolerations(
@@ -4,6 +4,7 @@ from scheduler.spawners.templates.base_pods import get_pod_command_args
 from scheduler.spawners.templates.env_vars import get_env_var, get_service_env_vars
 from scheduler.spawners.templates.jobs import pods
 from scheduler.spawners.templates.volumes import get_pod_refs_outputs_volumes, get_pod_volumes
+from scheduler.spawners.timers import time_api_calls
 
 
 class JobSpawner(K8SManager):
@@ -54,6 +55,7 @@ class JobSpawner(K8SManager):
         super().__init__(k8s_config=k8s_config,
                          namespace=namespace,
                          in_cluster=in_cluster)
+        time_api_calls(self)
 
     def get_env_vars(self):
         env_vars = get_service_env_vars(namespace=self.namespace)
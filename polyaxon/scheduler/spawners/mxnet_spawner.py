@@ -1,3 +1,5 @@
+from django.utils.functional import cached_property
+
 from scheduler.spawners.experiment_spawner import ExperimentSpawner
 from scheduler.spawners.templates.env_vars import get_env_var
 from schemas.environments import MXNetClusterConfig
@@ -28,7 +30,7 @@ class MXNetSpawner(ExperimentSpawner):
 
         return env_vars
 
-    @property
+    @cached_property
     def resources(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_resources = MXNetSpecification.get_worker_resources(
@@ -47,7 +49,7 @@ class MXNetSpawner(ExperimentSpawner):
             TaskType.SERVER: ps_resources,
         }
 
-    @property
+    @cached_property
     def node_selectors(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_node_selectors = MXNetSpecification.get_worker_node_selectors(
@@ -66,7 +68,7 @@ class MXNetSpawner(ExperimentSpawner):
             TaskType.SERVER: ps_node_selectors,
         }
 
-    @property
+    @cached_property
     def affinities(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_affinities = MXNetSpecification.get_worker_affinities(
@@ -85,7 +87,7 @@ class MXNetSpawner(ExperimentSpawner):
             TaskType.SERVER: ps_affinities,
         }
 
-    @property
+    @cached_property
     def tolerations(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_tolerations = MXNetSpecification.get_worker_tolerations(
@@ -2,6 +2,7 @@ from django.conf import settings
 
 from polyaxon_k8s.manager import K8SManager
 from scheduler.spawners.templates import constants
+from scheduler.spawners.timers import time_api_calls
 
 
 class ProjectJobSpawner(K8SManager):
@@ -22,6 +23,7 @@ class ProjectJobSpawner(K8SManager):
         super().__init__(k8s_config=k8s_config,
                          namespace=namespace,
                          in_cluster=in_cluster)
+        time_api_calls(self)
 
     @staticmethod
     def _get_proxy_url(namespace, job_name, deployment_name, port):
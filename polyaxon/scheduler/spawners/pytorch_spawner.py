@@ -1,3 +1,5 @@
+from django.utils.functional import cached_property
+
 from scheduler.spawners.experiment_spawner import ExperimentSpawner
 from scheduler.spawners.templates.env_vars import get_env_var
 from schemas.environments import PytorchClusterConfig
@@ -24,7 +26,7 @@ class PytorchSpawner(ExperimentSpawner):
         ]
         return env_vars
 
-    @property
+    @cached_property
     def resources(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_resources = PytorchSpecification.get_worker_resources(
@@ -37,7 +39,7 @@ class PytorchSpawner(ExperimentSpawner):
             TaskType.WORKER: worker_resources,
         }
 
-    @property
+    @cached_property
     def node_selectors(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_node_selectors = PytorchSpecification.get_worker_node_selectors(
@@ -50,7 +52,7 @@ class PytorchSpawner(ExperimentSpawner):
             TaskType.WORKER: worker_node_selectors,
         }
 
-    @property
+    @cached_property
     def affinities(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_affinities = PytorchSpecification.get_worker_affinities(
@@ -63,7 +65,7 @@ class PytorchSpawner(ExperimentSpawner):
             TaskType.WORKER: worker_affinities,
         }
 
-    @property
+    @cached_property
     def tolerations(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_tolerations = PytorchSpecification.get_worker_tolerations(
@@ -1,3 +1,5 @@
+from django.utils.functional import cached_property
+
 from libs.paths.experiments import get_experiment_outputs_path
 from scheduler.spawners.experiment_spawner import ExperimentSpawner
 from scheduler.spawners.templates.env_vars import get_env_var
@@ -23,7 +25,7 @@ class TensorflowSpawner(ExperimentSpawner):
         }
         return get_env_var(name='TF_CONFIG', value=tf_config)
 
-    @property
+    @cached_property
     def resources(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_resources = TensorflowSpecification.get_worker_resources(
@@ -42,7 +44,7 @@ class TensorflowSpawner(ExperimentSpawner):
             TaskType.PS: ps_resources,
         }
 
-    @property
+    @cached_property
     def node_selectors(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_node_selectors = TensorflowSpecification.get_worker_node_selectors(
@@ -61,7 +63,7 @@ class TensorflowSpawner(ExperimentSpawner):
             TaskType.PS: ps_node_selectors,
         }
 
-    @property
+    @cached_property
     def affinities(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_affinities = TensorflowSpecification.get_worker_affinities(
@@ -80,7 +82,7 @@ class TensorflowSpawner(ExperimentSpawner):
             TaskType.PS: ps_affinities,
         }
 
-    @property
+    @cached_property
     def tolerations(self):
         cluster, is_distributed, = self.spec.cluster_def
         worker_tolerations = TensorflowSpecification.get_worker_tolerations(
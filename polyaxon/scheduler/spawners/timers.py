@@ -0,0 +1,19 @@
+from functools import wraps
+
+import stats
+
+
+def time_api_calls(k8s_manager):
+    """Sends the latency of the Kubernetes API calls of a spawner, by http method."""
+    for api in (k8s_manager.k8s_api, k8s_manager.k8s_beta_api):
+        api_client = getattr(api, 'api_client', None)
+        if api_client is None or getattr(api_client, 'is_timed', False):
+            # The apis can share the same client
+            continue
+
+        def timed_call_api(resource_path, method, *args, _call_api=api_client.call_api, **kwargs):
+            with stats.timer('scheduler.spawners.k8s.{}'.format(method.lower())):
+                return _call_api(resource_path, method, *args, **kwargs)
+
+        api_client.call_api = wraps(api_client.call_api)(timed_call_api)
+        api_client.is_timed = True
@@ -8,7 +8,7 @@ from db.models.experiments import ExperimentMetric
 from libs.paths.experiments import copy_experiment_outputs
 from polyaxon.celery_api import app as celery_app
 from polyaxon.settings import SchedulerCeleryTasks
-from scheduler import dockerizer_scheduler, experiment_scheduler
+from scheduler import admission, dockerizer_scheduler, experiment_scheduler
 from schemas.specifications import ExperimentSpecification
 
 _logger = logging.getLogger('polyaxon.scheduler.experiments')
@@ -26,11 +26,14 @@ def copy_experiment(experiment):
             experiment_name=experiment.unique_name,
             job_uuid='all',
         )
-        copy_experiment_outputs(
+        stats = copy_experiment_outputs(
             persistence_outputs_from=experiment.original_experiment.persistence_outputs,
             persistence_outputs_to=experiment.persistence_outputs,
             experiment_name_from=experiment.original_experiment.unique_name,
-            experiment_name_to=experiment.unique_name)
+            experiment_name_to=experiment.unique_name,
+            is_done=experiment.original_experiment.is_done)
+        _logger.info('Copied the outputs of experiment `%s` into experiment `%s`: %s',
+                     experiment.original_experiment.unique_name, experiment.unique_name, stats)
 
     except OSError:
         publisher.publish_experiment_job_log(
@@ -94,6 +97,9 @@ def experiments_check_status(experiment_uuid=None, experiment_id=None):
     experiment = get_valid_experiment(experiment_id=experiment_id, experiment_uuid=experiment_uuid)
     if not experiment:
         return
+    if experiment.last_status == ExperimentLifeCycle.QUEUED:
+        # The jobs of a queued experiment were deleted when its reservation was released
+        return
     experiment.update_status()
 
 
@@ -110,22 +116,41 @@ def experiments_set_metrics(experiment_uuid, metrics, created_at=None):
 
 
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_START, ignore_result=True)
-def experiments_start(experiment_id):
+def experiments_start(experiment_id, admitted=False):
     experiment = get_valid_experiment(experiment_id=experiment_id)
     if not experiment:
         _logger.info('Something went wrong, '
                      'the Experiment `%s` does not exist anymore.', experiment_id)
         return
 
-    if not ExperimentLifeCycle.can_transition(status_from=experiment.last_status,
-                                              status_to=ExperimentLifeCycle.SCHEDULED):
-        _logger.info('Experiment `%s` cannot transition from `%s` to `%s`.',
-                     experiment.unique_name, experiment.last_status, ExperimentLifeCycle.SCHEDULED)
-        return None
+    if admitted:
+        # The experiment was scheduled by the admission, unless it was stopped in the meantime
+        if experiment.last_status != ExperimentLifeCycle.SCHEDULED:
+            _logger.info('Admitted experiment `%s` has status `%s`, it will not be started.',
+                         experiment.unique_name, experiment.last_status)
+            return None
+    else:
+        if not ExperimentLifeCycle.can_transition(status_from=experiment.last_status,
+                                                  status_to=ExperimentLifeCycle.SCHEDULED):
+            _logger.info('Experiment `%s` cannot transition from `%s` to `%s`.',
+                         experiment.unique_name,
+                         experiment.last_status,
+                         ExperimentLifeCycle.SCHEDULED)
+            return None
+
+        if not admission.admit_experiment(experiment):
+            _logger.info('Experiment `%s` was not admitted.', experiment.unique_name)
+            return None
 
     experiment_scheduler.start_experiment(experiment)
 
 
+@celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_ADMIT, ignore_result=True)
+def experiments_admit():
+    admission.release_reservations()
+    admission.admit_experiments()
+
+
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_STOP, ignore_result=True)
 def experiments_stop(project_name,
                      project_uuid,
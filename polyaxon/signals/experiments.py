@@ -61,7 +61,7 @@ def experiment_pre_save(sender, **kwargs):
         not instance.specification or
         not instance.specification.build or
         instance.specification.build.git or
-        instance.code_reference or
+        instance.code_reference_id or
         not instance.project.has_code)
     if condition:
         return
@@ -272,3 +272,8 @@ def handle_new_experiment_status(sender, **kwargs):
                 'specification': experiment.config,
                 'update_status': False
             })
+
+    if (ExperimentLifeCycle.is_done(instance.status) and
+            Experiment.objects.filter(status__status=ExperimentLifeCycle.QUEUED).exists()):
+        # Resources were released, the queued experiments might fit now
+        celery_app.send_task(SchedulerCeleryTasks.EXPERIMENTS_ADMIT)
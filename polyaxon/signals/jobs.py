@@ -45,7 +45,7 @@ def job_pre_save(sender, **kwargs):
     # if the instance has a primary key then is getting updated
     condition = (
         instance.specification.build.git or
-        instance.code_reference or
+        instance.code_reference_id or
         not instance.project.has_code)
     if condition:
         return
@@ -7,6 +7,7 @@ from db.models.projects import Project
 from event_manager.events.project import PROJECT_DELETED
 from libs.decorators import ignore_raw, ignore_updates
 from libs.paths.projects import delete_project_logs, delete_project_outputs, delete_project_repos
+from notifier.recipients import invalidate_project_recipients
 from signals.utils import remove_bookmarks
 
 
@@ -21,6 +22,12 @@ def project_post_save(sender, **kwargs):
     delete_project_repos(instance.unique_name)
 
 
+@receiver(post_save, sender=Project, dispatch_uid="project_post_save_recipients")
+@ignore_raw
+def project_post_save_recipients(sender, **kwargs):
+    invalidate_project_recipients(kwargs['instance'].id)
+
+
 @receiver(pre_delete, sender=Project, dispatch_uid="project_pre_delete")
 @ignore_raw
 def project_pre_delete(sender, **kwargs):
@@ -36,4 +43,5 @@ def project_pre_delete(sender, **kwargs):
 def project_post_deleted(sender, **kwargs):
     instance = kwargs['instance']
     auditor.record(event_type=PROJECT_DELETED, instance=instance)
+    invalidate_project_recipients(instance.id)
     remove_bookmarks(object_id=instance.id, content_type='project')
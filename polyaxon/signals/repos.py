@@ -15,12 +15,12 @@ from libs.repos import git
 def new_repo(sender, **kwargs):
     instance = kwargs['instance']
     git.set_git_repo(instance)
-    last_commit = instance.last_commit
-    if not last_commit:
+    commit_hash = instance.last_commit_hash
+    if not commit_hash:
         return None
 
     # Set code reference
-    CodeReference.objects.get_or_create(repo=instance, commit=last_commit[0])
+    CodeReference.objects.get_or_create(repo=instance, commit=commit_hash)
 
 
 @receiver(post_delete, sender=ExternalRepo, dispatch_uid="repo_deleted")
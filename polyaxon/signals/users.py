@@ -8,6 +8,7 @@ import auditor
 
 from event_manager.events.user import USER_REGISTERED, USER_UPDATED
 from libs.decorators import ignore_raw
+from notifier.recipients import invalidate_user_recipients
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -18,6 +19,7 @@ def create_auth_token(sender, instance=None, created=False, **kwargs):
         auditor.record(event_type=USER_REGISTERED, instance=instance)
     else:
         auditor.record(event_type=USER_UPDATED, instance=instance)
+        invalidate_user_recipients(instance.id)
 
 
 # A new user has registered.
@@ -1,10 +1,61 @@
+import time
+
+from functools import wraps
 from random import random
 from threading import local
 
 from django.conf import settings
 
+from libs.services import Service
+
+
+class Timer(object):
+    """Sends the duration of a block of code, or of a function, to the stats backend.
+
+    >>> with stats.timer('scheduler.experiments.start'):
+    ...     pass
+
+    >>> @stats.timer('scheduler.experiments.start')
+    ... def start_experiment():
+    ...     pass
+    """
+
+    def __init__(self, backend, key, sample_rate=None, **kwargs):
+        self.backend = backend
+        self.key = key
+        self.sample_rate = sample_rate
+        self.kwargs = kwargs
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.backend.timing(self.key,
+                            time.time() - self.start,
+                            sample_rate=self.sample_rate,
+                            **self.kwargs)
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with Timer(self.backend, self.key, sample_rate=self.sample_rate, **self.kwargs):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+class BaseStatsBackend(Service, local):
+    """The stats backends send counters, timings, gauges and histograms.
+
+    The timings are in seconds, every backend converts them to its own unit,
+    the histograms are sent as is, or as gauges by the backends without histograms.
+    A `sample_rate` of `None` uses the `STATS_SAMPLE_RATE` setting,
+    the values are sampled by the clients of the backends.
+    """
+    __all__ = ('incr', 'timing', 'gauge', 'histogram', 'timer')
 
-class BaseStatsBackend(local):
     def __init__(self, prefix=None):  # pylint:disable=super-init-not-called
         if prefix is None:
             prefix = settings.DEFAULT_STATS_PREFIX
@@ -15,11 +66,45 @@ class BaseStatsBackend(local):
             return '{}.{}'.format(self.prefix, key)
         return key
 
+    @staticmethod
+    def _get_sample_rate(sample_rate):
+        return settings.STATS_SAMPLE_RATE if sample_rate is None else sample_rate
+
     def _should_sample(self, sample_rate):
         return sample_rate >= 1 or random() >= 1 - sample_rate
 
     def _incr(self, key, amount=1, sample_rate=1, **kwargs):
         raise NotImplementedError
 
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        raise NotImplementedError
+
+    def _gauge(self, key, value, sample_rate=1, **kwargs):
+        raise NotImplementedError
+
+    def _histogram(self, key, value, sample_rate=1, **kwargs):
+        raise NotImplementedError
+
     def incr(self, key, amount=1, sample_rate=1, **kwargs):
         self._incr(key=self._get_key(key), amount=amount, sample_rate=sample_rate, **kwargs)
+
+    def timing(self, key, value, sample_rate=None, **kwargs):
+        self._timing(key=self._get_key(key),
+                     value=value,
+                     sample_rate=self._get_sample_rate(sample_rate),
+                     **kwargs)
+
+    def gauge(self, key, value, sample_rate=None, **kwargs):
+        self._gauge(key=self._get_key(key),
+                    value=value,
+                    sample_rate=self._get_sample_rate(sample_rate),
+                    **kwargs)
+
+    def histogram(self, key, value, sample_rate=None, **kwargs):
+        self._histogram(key=self._get_key(key),
+                        value=value,
+                        sample_rate=self._get_sample_rate(sample_rate),
+                        **kwargs)
+
+    def timer(self, key, sample_rate=None, **kwargs):
+        return Timer(self, key, sample_rate=sample_rate, **kwargs)
@@ -28,8 +28,37 @@ class DatadogStatsBackend(BaseStatsBackend):
         instance.start()
         return instance
 
-    def _incr(self, key, amount=1, sample_rate=1, **kwargs):
-        tags = kwargs.get('tags', [])
+    def _get_tags(self, tags):
+        tags = tags or []
         if self.tags:
-            tags += self.tags
-        self.stats.increment(key, amount, sample_rate=sample_rate, tags=tags, host=self.host)
+            tags = tags + self.tags
+        return tags
+
+    def _incr(self, key, amount=1, sample_rate=1, **kwargs):
+        self.stats.increment(key,
+                             amount,
+                             sample_rate=sample_rate,
+                             tags=self._get_tags(kwargs.get('tags')),
+                             host=self.host)
+
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        # Datadog timings are in milliseconds
+        self.stats.timing(key,
+                          value * 1000,
+                          sample_rate=sample_rate,
+                          tags=self._get_tags(kwargs.get('tags')),
+                          host=self.host)
+
+    def _gauge(self, key, value, sample_rate=1, **kwargs):
+        self.stats.gauge(key,
+                         value,
+                         sample_rate=sample_rate,
+                         tags=self._get_tags(kwargs.get('tags')),
+                         host=self.host)
+
+    def _histogram(self, key, value, sample_rate=1, **kwargs):
+        self.stats.histogram(key,
+                             value,
+                             sample_rate=sample_rate,
+                             tags=self._get_tags(kwargs.get('tags')),
+                             host=self.host)
@@ -1,6 +1,15 @@
 from stats.base import BaseStatsBackend
 
 
-class NoOpStatasBackend(BaseStatsBackend):
+class NoOpStatsBackend(BaseStatsBackend):
     def _incr(self, key, amount=1, sample_rate=1, **kwargs):
         pass
+
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        pass
+
+    def _gauge(self, key, value, sample_rate=1, **kwargs):
+        pass
+
+    def _histogram(self, key, value, sample_rate=1, **kwargs):
+        pass
@@ -0,0 +1,32 @@
+import time
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+
+import stats
+
+SENT_AT_HEADER = 'polyaxon_sent_at'
+
+_started_at = {}
+
+
+@before_task_publish.connect(weak=False)
+def task_before_publish(headers=None, **kwargs):
+    # The lag of a task is the time it waited in its queue
+    if headers is not None:
+        headers[SENT_AT_HEADER] = time.time()
+
+
+@task_prerun.connect(weak=False)
+def task_before_run(task_id=None, task=None, **kwargs):
+    now = time.time()
+    _started_at[task_id] = now
+    sent_at = getattr(task.request, SENT_AT_HEADER, None)
+    if sent_at:
+        stats.timing('celery.tasks.{}.lag'.format(task.name), now - sent_at)
+
+
+@task_postrun.connect(weak=False)
+def task_after_run(task_id=None, task=None, **kwargs):
+    started_at = _started_at.pop(task_id, None)
+    if started_at:
+        stats.timing('celery.tasks.{}.duration'.format(task.name), time.time() - started_at)
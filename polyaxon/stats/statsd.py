@@ -1,13 +1,27 @@
 # pylint:disable=import-error
 import statsd
 
+from django.conf import settings
+
 from stats.base import BaseStatsBackend
 
 
 class StatsdStatsBackend(BaseStatsBackend):
-    def __init__(self, prefix=None, host='localhost', port=8125):
-        self.client = statsd.StatsClient(host=host, port=port)
+    def __init__(self, prefix=None, host=None, port=None):
+        self.client = statsd.StatsClient(host=host or settings.STATS_STATSD_HOST,
+                                         port=port or settings.STATS_STATSD_PORT)
         super().__init__(prefix=prefix)
 
     def _incr(self, key, amount=1, sample_rate=1, **kwargs):
         self.client.incr(key, amount, sample_rate)
+
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        # Statsd timings are in milliseconds
+        self.client.timing(key, value * 1000, sample_rate)
+
+    def _gauge(self, key, value, sample_rate=1, **kwargs):
+        self.client.gauge(key, value, sample_rate)
+
+    def _histogram(self, key, value, sample_rate=1, **kwargs):
+        # Statsd has no histograms, and its timers are in milliseconds
+        self.client.gauge(key, value, sample_rate)
@@ -2,12 +2,16 @@ import asyncio
 import json
 import logging
 
+from collections import Counter
+from functools import wraps
+
 from sanic import Sanic
 from websockets import ConnectionClosed
 
 from django.core.exceptions import ValidationError
 
 import auditor
+import stats
 
 from db.models.build_jobs import BuildJob
 from db.models.experiment_jobs import ExperimentJob
@@ -565,8 +569,28 @@ EXPERIMENT_URL = '/v1/<username>/<project_name>/experiments/<experiment_id>'
 BUILD_URL = '/v1/<username>/<project_name>/builds/<build_id>'
 JOB_URL = '/v1/<username>/<project_name>/jobs/<job_id>'
 
+SOCKETS_COUNTER = Counter()
+
+
+def count_sockets(endpoint):
+    """Sends the number of open sockets of an endpoint, i.e. of a stream type."""
+    key = 'streams.sockets.{}'.format(endpoint.__name__)
+
+    @wraps(endpoint)
+    async def wrapper(request, ws, *args, **kwargs):
+        SOCKETS_COUNTER[key] += 1
+        stats.gauge(key, SOCKETS_COUNTER[key], sample_rate=1)
+        try:
+            return await endpoint(request, ws, *args, **kwargs)
+        finally:
+            SOCKETS_COUNTER[key] -= 1
+            stats.gauge(key, SOCKETS_COUNTER[key], sample_rate=1)
+
+    return wrapper
+
 
 def add_url(endpoint, base_url, url):
+    endpoint = count_sockets(endpoint)
     app.add_websocket_route(endpoint, '{}/{}'.format(base_url, url))
     app.add_websocket_route(endpoint, '/ws{}/{}'.format(base_url, url))
 
@@ -0,0 +1,401 @@
+"""An in-process fake of the Kubernetes API used by `polyaxon_k8s.K8SManager`.
+
+The fake replaces the api clients of the manager, so the manager and the spawners
+run unchanged against an in-memory cluster:
+
+    cluster = FakeCluster(latency=0.01)
+    with patch_k8s(cluster):
+        start_experiment(experiment)
+        cluster.set_phase(PodLifeCycle.RUNNING)
+        monitor.run(K8SManager(namespace=settings.K8S_NAMESPACE))
+"""
+import copy
+import re
+import threading
+import time
+import uuid
+
+from collections import deque
+from contextlib import ExitStack, contextmanager
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from mock import patch
+
+from constants.pods import PodConditions, PodLifeCycle
+
+ADDED = 'ADDED'
+MODIFIED = 'MODIFIED'
+DELETED = 'DELETED'
+
+PODS = 'pods'
+SERVICES = 'services'
+CONFIG_MAPS = 'config_maps'
+SECRETS = 'secrets'
+DEPLOYMENTS = 'deployments'
+INGRESSES = 'ingresses'
+
+_SET_BASED_REQUIREMENT = re.compile(r'^\s*([\w./-]+)\s+(in|notin)\s+\(([^)]*)\)\s*$')
+
+
+def parse_label_selector(label_selector):
+    """Returns a list of (key, operator, values) from a k8s label selector string."""
+    requirements = []
+    if not label_selector:
+        return requirements
+
+    # Commas separate requirements, except inside the values of set based requirements
+    for requirement in re.split(r',(?![^(]*\))', label_selector):
+        match = _SET_BASED_REQUIREMENT.match(requirement)
+        if match:
+            key, operator, values = match.groups()
+            requirements.append((key, operator, {v.strip() for v in values.split(',')}))
+        elif '!=' in requirement:
+            key, value = requirement.split('!=', 1)
+            requirements.append((key.strip(), 'notin', {value.strip()}))
+        elif '=' in requirement:
+            key, value = requirement.replace('==', '=').split('=', 1)
+            requirements.append((key.strip(), 'in', {value.strip()}))
+        else:
+            requirements.append((requirement.strip(), 'exists', None))
+    return requirements
+
+
+def match_labels(labels, label_selector):
+    labels = labels or {}
+    for key, operator, values in parse_label_selector(label_selector):
+        if operator == 'exists' and key not in labels:
+            return False
+        if operator == 'in' and labels.get(key) not in values:
+            return False
+        if operator == 'notin' and labels.get(key) in values:
+            return False
+    return True
+
+
+def get_container_state(phase):
+    if phase == PodLifeCycle.PENDING:
+        return client.V1ContainerState(
+            waiting=client.V1ContainerStateWaiting(reason='ContainerCreating'))
+    if phase == PodLifeCycle.RUNNING:
+        return client.V1ContainerState(
+            running=client.V1ContainerStateRunning(started_at=None))
+    if phase == PodLifeCycle.SUCCEEDED:
+        return client.V1ContainerState(
+            terminated=client.V1ContainerStateTerminated(exit_code=0, reason='Completed'))
+    return client.V1ContainerState(
+        terminated=client.V1ContainerStateTerminated(exit_code=1, reason='Error'))
+
+
+def get_pod_status(pod, phase, node_name):
+    """Returns a synthetic status for the pod's containers in the given phase."""
+    ready = phase == PodLifeCycle.RUNNING
+    conditions = [
+        client.V1PodCondition(type=PodConditions.SCHEDULED, status='True'),
+        client.V1PodCondition(type=PodConditions.READY,
+                              status='True' if ready else 'False',
+                              reason=None if ready else 'ContainersNotReady'),
+    ]
+    container_statuses = [
+        client.V1ContainerStatus(
+            name=container.name,
+            image=container.image,
+            image_id='docker://sha256:{}'.format(uuid.uuid4().hex),
+            container_id='docker://{}'.format(uuid.uuid4().hex),
+            ready=ready,
+            restart_count=0,
+            state=get_container_state(phase))
+        for container in (pod.spec.containers or [])
+    ]
+    pod.spec.node_name = node_name
+    return client.V1PodStatus(phase=phase,
+                              conditions=conditions,
+                              container_statuses=container_statuses)
+
+
+class FakeCluster(object):
+    """In-memory store of the namespaced resources and of the pod events.
+
+    Args:
+        latency: seconds to wait on every api call.
+        node_name: the node on which all pods are scheduled.
+        phases: phases every new pod goes through right after its creation.
+    """
+
+    def __init__(self, latency=0, node_name='node-1', phases=None):
+        self.latency = latency
+        self.node_name = node_name
+        self.phases = phases or []
+        self.resources = {kind: {} for kind in (PODS, SERVICES, CONFIG_MAPS,
+                                                SECRETS, DEPLOYMENTS, INGRESSES)}
+        self.events = deque()
+        self.calls = 0
+        # The maximum number of api calls running at the same time
+        self.max_concurrent_calls = 0
+        self.consumed_events = 0
+        self._concurrent_calls = 0
+        self._failures = {}
+        self._resource_version = 0
+        self._compacted_version = 0
+        self._lock = threading.RLock()
+
+    def inject_failure(self, method, times=1, status=500):
+        """The next `times` calls to the api `method` raise an `ApiException`."""
+        with self._lock:
+            self._failures[method] = [times, status]
+
+    def call(self, method):
+        with self._lock:
+            self.calls += 1
+            self._concurrent_calls += 1
+            self.max_concurrent_calls = max(self.max_concurrent_calls, self._concurrent_calls)
+            failure = self._failures.get(method)
+            if failure:
+                failure[0] -= 1
+                if failure[0] <= 0:
+                    del self._failures[method]
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self._concurrent_calls -= 1
+        if failure:
+            raise ApiException(status=failure[1], reason='Injected failure')
+
+    @property
+    def resource_version(self):
+        return str(self._resource_version)
+
+    def compact(self):
+        """Watches from the current resource version, or older, receive a `410 Gone` error."""
+        with self._lock:
+            self._compacted_version = self._resource_version
+            self.events.clear()
+
+    def is_compacted(self, resource_version):
+        return resource_version is not None and int(resource_version) <= self._compacted_version
+
+    def _next_resource_version(self):
+        self._resource_version += 1
+        return str(self._resource_version)
+
+    def _record(self, event_type, kind, obj):
+        obj.metadata.resource_version = self._next_resource_version()
+        if kind == PODS:
+            self.events.append({'type': event_type, 'object': copy.deepcopy(obj)})
+
+    def read(self, kind, namespace, name):
+        with self._lock:
+            obj = self.resources[kind].get((namespace, name))
+            if obj is None:
+                raise ApiException(status=404, reason='Not Found')
+            return copy.deepcopy(obj)
+
+    def create(self, kind, namespace, body):
+        with self._lock:
+            key = (namespace, body.metadata.name)
+            if key in self.resources[kind]:
+                raise ApiException(status=409, reason='AlreadyExists')
+            obj = copy.deepcopy(body)
+            obj.metadata.namespace = namespace
+            obj.metadata.uid = uuid.uuid4().hex
+            if kind == PODS:
+                obj.status = client.V1PodStatus(phase=PodLifeCycle.PENDING)
+            self.resources[kind][key] = obj
+            self._record(ADDED, kind, obj)
+            for phase in self.phases:
+                self._set_pod_phase(kind, obj, phase)
+            return copy.deepcopy(obj)
+
+    def patch(self, kind, namespace, name, body):
+        with self._lock:
+            key = (namespace, name)
+            if key not in self.resources[kind]:
+                raise ApiException(status=404, reason='Not Found')
+            obj = copy.deepcopy(body)
+            obj.metadata.namespace = namespace
+            if kind == PODS:
+                obj.status = self.resources[kind][key].status
+            self.resources[kind][key] = obj
+            self._record(MODIFIED, kind, obj)
+            return copy.deepcopy(obj)
+
+    def delete(self, kind, namespace, name):
+        with self._lock:
+            obj = self.resources[kind].pop((namespace, name), None)
+            if obj is None:
+                raise ApiException(status=404, reason='Not Found')
+            self._record(DELETED, kind, obj)
+            return client.V1Status(status='Success')
+
+    def list(self, kind, namespace, label_selector=None):
+        with self._lock:
+            return [copy.deepcopy(obj) for (obj_namespace, _), obj in self.resources[kind].items()
+                    if obj_namespace == namespace and
+                    match_labels(obj.metadata.labels, label_selector)]
+
+    def _set_pod_phase(self, kind, pod, phase):
+        if kind != PODS:
+            return
+        pod.status = get_pod_status(pod, phase, self.node_name)
+        self._record(MODIFIED, kind, pod)
+
+    def set_phase(self, phase, label_selector=None, names=None):
+        """Moves the matching pods to `phase` and emits the corresponding events.
+
+        Returns:
+            int: the number of pods transitioned.
+        """
+        with self._lock:
+            pods = [pod for (_, name), pod in self.resources[PODS].items()
+                    if (names is None or name in names) and
+                    match_labels(pod.metadata.labels, label_selector)]
+            for pod in pods:
+                self._set_pod_phase(PODS, pod, phase)
+            return len(pods)
+
+    def pop_events(self, namespace=None, label_selector=None):
+        """Consumes the queued pod events matching the namespace and the label selector."""
+        with self._lock:
+            events = []
+            remaining = deque()
+            while self.events:
+                event = self.events.popleft()
+                metadata = event['object'].metadata
+                if ((namespace is None or metadata.namespace == namespace) and
+                        match_labels(metadata.labels, label_selector)):
+                    events.append(event)
+                else:
+                    remaining.append(event)
+            self.events = remaining
+            self.consumed_events += len(events)
+            return events
+
+    def count(self, kind):
+        with self._lock:
+            return len(self.resources[kind])
+
+
+class FakeApi(object):
+    """Maps the kubernetes client api methods to the cluster's resources."""
+    KINDS = {}
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+
+    def __getattr__(self, method):
+        for kind, suffix in self.KINDS.items():
+            if not method.endswith(suffix):
+                continue
+            action = method[:-len(suffix)]
+            if action in ('read', 'create', 'patch', 'delete', 'list'):
+                return self._get_handler(method, action, kind)
+        raise AttributeError(method)
+
+    def _get_handler(self, method, action, kind):
+        cluster = self.cluster
+
+        def handler(*args, **kwargs):
+            cluster.call(method)
+            if action == 'read':
+                name, namespace = args[:2]
+                return cluster.read(kind, namespace, name)
+            if action == 'create':
+                namespace, body = args[:2]
+                return cluster.create(kind, namespace, body)
+            if action == 'patch':
+                name, namespace, body = args[:3]
+                return cluster.patch(kind, namespace, name, body)
+            if action == 'delete':
+                name, namespace = args[:2]
+                return cluster.delete(kind, namespace, name)
+            namespace = args[0] if args else kwargs['namespace']
+            # Only the `items` and the `resource_version` of the list responses are used
+            with cluster._lock:
+                return client.V1PodList(
+                    items=cluster.list(kind, namespace, label_selector=kwargs.get('label_selector')),
+                    metadata=client.V1ListMeta(resource_version=cluster.resource_version))
+
+        handler.__self__ = self
+        return handler
+
+
+class FakeCoreV1Api(FakeApi):
+    KINDS = {
+        PODS: '_namespaced_pod',
+        SERVICES: '_namespaced_service',
+        CONFIG_MAPS: '_namespaced_config_map',
+        SECRETS: '_namespaced_secret',
+    }
+
+    def list_node(self, **kwargs):
+        self.cluster.call('list_node')
+        return client.V1NodeList(items=[
+            client.V1Node(metadata=client.V1ObjectMeta(name=self.cluster.node_name))])
+
+
+class FakeExtensionsV1beta1Api(FakeApi):
+    KINDS = {
+        DEPLOYMENTS: '_namespaced_deployment',
+        INGRESSES: '_namespaced_ingress',
+    }
+
+
+class FakeVersionApi(object):
+    def __init__(self, cluster):
+        self.cluster = cluster
+
+    def get_code(self):
+        self.cluster.call('get_code')
+        return client.VersionInfo(build_date='', compiler='', git_commit='', git_tree_state='',
+                                  git_version='v1.10.0', go_version='', major='1', minor='10',
+                                  platform='linux/amd64')
+
+
+class FakeWatch(object):
+    """Streams the queued pod events of the cluster, and stops once they are consumed.
+
+    Events emitted while the stream is consumed, e.g. by the status handlers, are streamed too.
+    Like Kubernetes, only the events after the `resource_version` argument are streamed,
+    and a `410 Gone` error is streamed if that version was compacted.
+    """
+
+    def stream(self, func, *args, **kwargs):
+        cluster = func.__self__.cluster
+        resource_version = kwargs.get('resource_version')
+        if cluster.is_compacted(resource_version):
+            status = {'kind': 'Status', 'status': 'Failure', 'reason': 'Gone', 'code': 410}
+            yield {'type': 'ERROR', 'object': status, 'raw_object': status}
+            return
+
+        while True:
+            events = cluster.pop_events(namespace=kwargs.get('namespace'),
+                                        label_selector=kwargs.get('label_selector'))
+            if not events:
+                return
+            for event in events:
+                if (resource_version is None or
+                        int(event['object'].metadata.resource_version) > int(resource_version)):
+                    yield event
+
+    def stop(self):
+        pass
+
+
+def get_manager_init(cluster):
+    def __init__(self, k8s_config=None, namespace='default', in_cluster=False):
+        self.k8s_api = FakeCoreV1Api(cluster)
+        self.k8s_beta_api = FakeExtensionsV1beta1Api(cluster)
+        self.k8s_version_api = FakeVersionApi(cluster)
+        self._namespace = namespace
+
+    return __init__
+
+
+@contextmanager
+def patch_k8s(cluster):
+    """Binds every `K8SManager`, and the pod watches, to the fake cluster."""
+    with ExitStack() as stack:
+        stack.enter_context(patch('polyaxon_k8s.manager.K8SManager.__init__',
+                                  get_manager_init(cluster)))
+        stack.enter_context(patch('kubernetes.watch.Watch', FakeWatch))
+        yield cluster
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest.mock import patch
+
+import pytest
+
+from django.test import override_settings
+
+import notifier
+
+from action_manager import delivery
+from action_manager.actions.email import EmailAction
+from action_manager.actions.webhooks.slack_webhook import SlackWebHookAction
+from action_manager.actions.webhooks.webhook import WebHookAction
+from event_manager.events.experiment import EXPERIMENT_SUCCEEDED
+from factories.factory_experiments import ExperimentFactory
+from libs.redis_db import RedisWebHookEndpoints
+from tests.utils import BaseTest
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class WebHookServer(object):
+    """A local webhook endpoint, answering after a delay with the given statuses.
+
+    The received payloads are kept in `requests`.
+    """
+
+    def __init__(self, delay=0, statuses=None):
+        self.delay = delay
+        self.statuses = list(statuses or [])
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa
+                length = int(self.headers.get('Content-Length', 0))
+                server.requests.append(json.loads(self.rfile.read(length).decode('utf-8')))
+                time.sleep(server.delay)
+                self.send_response(server.statuses.pop(0) if server.statuses else 200)
+                self.end_headers()
+
+            def log_message(self, *args):  # pylint:disable=arguments-differ
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}/webhook'.format(self.httpd.server_port)
+        self.web_hook = {'url': self.url, 'method': 'POST'}
+
+    def __enter__(self):
+        thread = threading.Thread(target=self.httpd.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.mark.actions_mark
+@override_settings(INTEGRATIONS_WEBHOOKS_MAX_RETRIES=2,
+                   INTEGRATIONS_WEBHOOKS_RATE_LIMIT=100,
+                   INTEGRATIONS_WEBHOOKS_CIRCUIT_FAILURES=100)
+class TestWebHookDelivery(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        notifier.validate()
+        notifier.setup()
+        # Force tasks autodiscover
+        from action_manager import tasks  # noqa
+
+    def deliver(self, server, data=None):
+        delivery.deliver(action_key=WebHookAction.action_key,
+                         web_hook=server.web_hook,
+                         data=data or {'foo': 'bar'})
+
+    def test_failed_deliveries_are_retried(self):
+        with WebHookServer(statuses=[500, 503]) as server:
+            self.deliver(server)
+        assert server.requests == [{'foo': 'bar'}] * 3
+
+        with WebHookServer(statuses=[500] * 5) as server:
+            self.deliver(server)
+        assert len(server.requests) == 3
+
+    def test_client_errors_are_not_retried(self):
+        with WebHookServer(statuses=[404]) as server:
+            self.deliver(server)
+        assert len(server.requests) == 1
+
+    @override_settings(INTEGRATIONS_WEBHOOKS_TIMEOUT=0.2, INTEGRATIONS_WEBHOOKS_MAX_RETRIES=0)
+    def test_slow_endpoints_time_out(self):
+        with WebHookServer(delay=2) as server:
+            start = time.time()
+            self.deliver(server)
+            assert time.time() - start < 1
+        assert len(server.requests) == 1
+
+    @override_settings(INTEGRATIONS_WEBHOOKS_CIRCUIT_FAILURES=2,
+                       INTEGRATIONS_WEBHOOKS_MAX_RETRIES=0)
+    def test_circuit_is_opened_after_consecutive_failures(self):
+        with WebHookServer(statuses=[500, 500]) as server:
+            for _ in range(3):
+                self.deliver(server)
+        assert len(server.requests) == 2
+
+    @override_settings(INTEGRATIONS_WEBHOOKS_RATE_LIMIT=1, INTEGRATIONS_WEBHOOKS_MAX_RETRIES=0)
+    def test_deliveries_are_rate_limited(self):
+        with WebHookServer() as server:
+            for _ in range(2):
+                self.deliver(server)
+        assert len(server.requests) == 1
+
+    def test_leaked_requests_in_flight_expire(self):
+        endpoint = RedisWebHookEndpoints('http://127.0.0.1/leaked')
+        # A worker dies while sending a request, without releasing it
+        assert endpoint.acquire(rate_limit=100, concurrency=1, timeout=0.2) == 0
+        assert endpoint.acquire(rate_limit=100, concurrency=1, timeout=0.2) == 1
+        time.sleep(0.5)
+        assert endpoint.acquire(rate_limit=100, concurrency=1, timeout=0.2) == 0
+        endpoint.release()
+
+    def test_payloads_are_sent_in_a_digest(self):
+        from action_manager.tasks import actions_send_webhook_digest
+
+        with WebHookServer() as server:
+            with patch('action_manager.delivery.celery_app.send_task') as mock_send_task:
+                for i in range(3):
+                    delivery.deliver(action_key=SlackWebHookAction.action_key,
+                                     web_hook=server.web_hook,
+                                     data={'attachments': [{'text': str(i)}]},
+                                     coalesce=True)
+            # The digest is sent once, at the end of the window
+            assert mock_send_task.call_count == 1
+            actions_send_webhook_digest(**mock_send_task.call_args[1]['kwargs'])
+
+        assert server.requests == [
+            {'attachments': [{'text': '0'}, {'text': '1'}, {'text': '2'}]}]
+
+    @patch.object(EmailAction, 'execute')
+    def test_notifier_webhooks_are_delivered(self, _):
+        experiment = ExperimentFactory()
+        with WebHookServer() as server:
+            with override_settings(INTEGRATIONS_WEBHOOKS=[server.web_hook]):
+                notifier.record(event_type=EXPERIMENT_SUCCEEDED, instance=experiment)
+        assert len(server.requests) == 1
+        assert server.requests[0]['subject']
@@ -0,0 +1,123 @@
+# pylint:disable=ungrouped-imports
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from datetime import timedelta
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+from django.utils import timezone
+
+from db.models.activitylogs import ActivityLog
+from db.models.notification import Notification, NotificationEvent
+from event_manager.events.experiment import (
+    EXPERIMENT_DELETED_TRIGGERED,
+    EXPERIMENT_SUCCEEDED,
+    EXPERIMENT_VIEWED
+)
+from factories.factory_experiments import ExperimentFactory
+from libs.retention import clean_all_expired_events, clean_expired_events, get_event_ttl
+from tests.utils import BaseTest
+
+
+@pytest.mark.activitylogs_mark
+@override_settings(EVENTS_RETENTION_TTL=365,
+                   EVENTS_RETENTION_VIEWS_TTL=30,
+                   EVENTS_RETENTION_ACTIONS_TTL={},
+                   EVENTS_RETENTION_CHUNK_SIZE=2,
+                   EVENTS_RETENTION_MAX_CHUNKS=10)
+class EventsRetentionTest(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.content_type = ContentType.objects.get_for_model(self.experiment)
+        self.archive_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_root)
+        settings_override = override_settings(EVENTS_ARCHIVE_ROOT=self.archive_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_activity(self, event_type, days):
+        return ActivityLog.objects.create(event_type=event_type,
+                                          context={},
+                                          created_at=timezone.now() - timedelta(days=days),
+                                          content_type=self.content_type,
+                                          object_id=self.experiment.id)
+
+    def read_archives(self, model_name):
+        values = []
+        for root, _, files in os.walk(os.path.join(self.archive_root, model_name)):
+            for file_name in sorted(files):
+                with gzip.open(os.path.join(root, file_name), 'rt') as archive:
+                    values += [json.loads(line) for line in archive]
+        return values
+
+    def test_event_ttl_depends_on_the_action(self):
+        assert get_event_ttl(EXPERIMENT_VIEWED) == 30
+        assert get_event_ttl(EXPERIMENT_DELETED_TRIGGERED) == 365
+        with override_settings(EVENTS_RETENTION_ACTIONS_TTL={'viewed': 7}):
+            assert get_event_ttl(EXPERIMENT_VIEWED) == 7
+
+    def test_expired_activities_are_archived_and_deleted(self):
+        expired = [self.create_activity(EXPERIMENT_VIEWED, days=40),
+                   self.create_activity(EXPERIMENT_DELETED_TRIGGERED, days=400),
+                   self.create_activity('unknown.action', days=400)]
+        kept = [self.create_activity(EXPERIMENT_VIEWED, days=10),
+                self.create_activity(EXPERIMENT_DELETED_TRIGGERED, days=40),
+                self.create_activity('unknown.action', days=40)]
+
+        assert clean_expired_events(ActivityLog) == 3
+        assert set(ActivityLog.objects.values_list('id', flat=True)) == {a.id for a in kept}
+        archived = self.read_archives('activitylog')
+        assert [value['id'] for value in archived] == [a.id for a in expired]
+        assert archived[0]['event_type'] == EXPERIMENT_VIEWED
+
+        assert clean_expired_events(ActivityLog) == 0
+
+    @override_settings(EVENTS_RETENTION_MAX_CHUNKS=1)
+    def test_cleanup_is_bounded(self):
+        for _ in range(3):
+            self.create_activity(EXPERIMENT_VIEWED, days=40)
+
+        assert clean_expired_events(ActivityLog) == 2
+        assert clean_expired_events(ActivityLog) == 1
+        assert ActivityLog.objects.count() == 0
+
+    @override_settings(EVENTS_RETENTION_TTL=0)
+    def test_events_are_kept_forever_with_no_ttl(self):
+        self.create_activity(EXPERIMENT_VIEWED, days=40)
+        activity = self.create_activity(EXPERIMENT_DELETED_TRIGGERED, days=4000)
+
+        assert clean_expired_events(ActivityLog) == 1
+        assert list(ActivityLog.objects.values_list('id', flat=True)) == [activity.id]
+
+    def test_expired_notifications_are_archived_and_deleted(self):
+        notification_event = NotificationEvent.objects.create(
+            event_type=EXPERIMENT_SUCCEEDED,
+            context={},
+            created_at=timezone.now() - timedelta(days=400),
+            content_type=self.content_type,
+            object_id=self.experiment.id)
+        Notification.objects.create(event=notification_event, user=self.experiment.user)
+
+        assert clean_all_expired_events() == {ActivityLog: 0, NotificationEvent: 1}
+        assert NotificationEvent.objects.count() == 0
+        assert Notification.objects.count() == 0
+        archived = self.read_archives('notificationevent')
+        assert len(archived) == 1
+        assert archived[0]['notifications'] == [
+            {'user_id': self.experiment.user.id, 'is_active': True}]
+
+    @override_settings(EVENTS_ARCHIVE_ROOT='')
+    def test_expired_events_are_not_archived_with_no_archive_root(self):
+        self.create_activity(EXPERIMENT_VIEWED, days=40)
+
+        assert clean_expired_events(ActivityLog) == 1
+        assert os.listdir(self.archive_root) == []
@@ -5,6 +5,7 @@ import activitylogs
 
 from db.models.activitylogs import ActivityLog
 from event_manager.events.experiment import EXPERIMENT_DELETED_TRIGGERED
+from event_manager.events.project import PROJECT_DELETED_TRIGGERED
 from event_manager.events.user import USER_ACTIVATED
 from factories.factory_experiments import ExperimentFactory
 from factories.factory_users import UserFactory
@@ -46,3 +47,28 @@ class ActivityLogsTest(BaseTest):
         assert activity.event_type == EXPERIMENT_DELETED_TRIGGERED
         assert activity.content_object == self.experiment
         assert activity.actor == self.admin
+
+    def test_record_sets_the_project_and_experiment(self):
+        activitylogs.record(event_type=USER_ACTIVATED,
+                            instance=self.user,
+                            actor_id=self.admin.id,
+                            actor_name=self.admin.username)
+        activity = ActivityLog.objects.last()
+        assert activity.project_id is None
+        assert activity.experiment_id is None
+
+        activitylogs.record(event_type=PROJECT_DELETED_TRIGGERED,
+                            instance=self.experiment.project,
+                            actor_id=self.admin.id,
+                            actor_name=self.admin.username)
+        activity = ActivityLog.objects.last()
+        assert activity.project_id == self.experiment.project.id
+        assert activity.experiment_id is None
+
+        activitylogs.record(event_type=EXPERIMENT_DELETED_TRIGGERED,
+                            instance=self.experiment,
+                            actor_id=self.admin.id,
+                            actor_name=self.admin.username)
+        activity = ActivityLog.objects.last()
+        assert activity.project_id == self.experiment.project.id
+        assert activity.experiment_id == self.experiment.id
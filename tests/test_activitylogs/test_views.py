@@ -2,6 +2,9 @@ import pytest
 
 from rest_framework import status
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 import activitylogs
 
 from api.activitylogs.serializers import ActivityLogsSerializer
@@ -168,3 +171,37 @@ class TestProjectActivityLogsListViewV1(TestActivityLogsListViewV1):
     def test_get_non_existing_project(self):
         resp = self.auth_client.get('/{}/activitylogs/foo/bar/')
         assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_pages_do_not_shift_when_activities_are_recorded(self):
+        limit = self.num_objects - 1
+        resp = self.auth_client.get("{}?limit={}".format(self.url, limit))
+        next_page = resp.data['next']
+        activitylogs.record(event_type=EXPERIMENT_DELETED_TRIGGERED,
+                            instance=self.experiment,
+                            actor_id=self.user.id,
+                            actor_name=self.user.username)
+
+        resp = self.auth_client.get(next_page)
+        assert resp.status_code == status.HTTP_200_OK
+        data = resp.data['results']
+        assert data == self.serializer_class(
+            self.filtered_queryset[limit + 1:], many=True).data
+
+    def test_pagination_with_offset(self):
+        limit = self.num_objects - 1
+        with CaptureQueriesContext(connection) as queries:
+            self.auth_client.get("{}?limit={}".format(self.url, limit))
+        # The items are not counted
+        assert not [query for query in queries.captured_queries if 'COUNT(' in query['sql']]
+
+        resp = self.auth_client.get("{}?limit={}&offset={}".format(self.url, limit, limit))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is None
+        assert resp.data['previous'] is not None
+        assert resp.data['count'] == self.filtered_queryset.count()
+        data = resp.data['results']
+        assert data == self.serializer_class(self.filtered_queryset[limit:], many=True).data
+
+    def test_get_invalid_cursor(self):
+        resp = self.auth_client.get("{}?before=foo".format(self.url))
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,149 @@
+# pylint:disable=ungrouped-imports
+
+from unittest.mock import patch
+
+import pytest
+
+import activitylogs
+import auditor
+import notifier
+import tracker
+
+from action_manager.actions.email import EmailAction
+from auditor.transports import get_transport
+from db.models.activitylogs import ActivityLog
+from db.models.notification import Notification, NotificationEvent
+from event_manager.events import experiment as experiment_events
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_users import UserFactory
+from libs.redis_db import RedisAuditorEvents
+from tests.utils import BaseTest
+
+
+@pytest.mark.auditor_mark
+class AuditorTransportsTest(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.user = UserFactory()
+        auditor.validate()
+        auditor.setup()
+        tracker.validate()
+        tracker.setup()
+        activitylogs.validate()
+        activitylogs.setup()
+        notifier.validate()
+        notifier.setup()
+
+        # Force tasks autodiscover
+        from auditor import tasks  # noqa
+
+        # The test transactions are never committed, the events are queued right away
+        patcher = patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+        self.on_commit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def set_transport(self, transport):
+        self.addCleanup(setattr, auditor.backend, 'transport', auditor.backend.transport)
+        auditor.backend.transport = get_transport(auditor.backend, transport=transport)
+
+    def record_events(self):
+        auditor.record(event_type=experiment_events.EXPERIMENT_VIEWED,
+                       instance=self.experiment,
+                       actor_id=self.user.id,
+                       actor_name=self.user.username)
+        auditor.record(event_type=experiment_events.EXPERIMENT_DELETED_TRIGGERED,
+                       instance=self.experiment,
+                       actor_id=self.user.id,
+                       actor_name=self.user.username)
+        auditor.record(event_type=experiment_events.EXPERIMENT_SUCCEEDED,
+                       instance=self.experiment)
+
+    def assert_recorded(self):
+        assert ActivityLog.objects.count() == 2
+        assert set(ActivityLog.objects.values_list('event_type', flat=True)) == {
+            experiment_events.EXPERIMENT_VIEWED, experiment_events.EXPERIMENT_DELETED_TRIGGERED}
+        for activity in ActivityLog.objects.all():
+            assert activity.content_object == self.experiment
+            assert activity.actor == self.user
+
+        assert NotificationEvent.objects.count() == 1
+        notification_event = NotificationEvent.objects.last()
+        assert notification_event.event_type == experiment_events.EXPERIMENT_SUCCEEDED
+        assert notification_event.content_object == self.experiment
+        assert set(Notification.objects.values_list('user__id', flat=True)) == {
+            self.experiment.user.id, self.experiment.project.user.id}
+
+    @patch.object(EmailAction, 'execute')
+    def test_memory_transport(self, email_execute):
+        self.set_transport('memory')
+        with patch.object(auditor.backend.transport, 'start'):
+            self.record_events()
+        assert ActivityLog.objects.count() == 0
+
+        with patch('activitylogs.service.ActivityLogService.record_event') as record_event:
+            assert auditor.flush() == 3
+        # The activity logs are created at once
+        assert record_event.call_count == 0
+        self.assert_recorded()
+        assert email_execute.call_count == 1
+        assert auditor.flush() == 0
+
+    @patch.object(EmailAction, 'execute')
+    def test_redis_transport(self, email_execute):
+        self.set_transport('redis')
+        self.record_events()
+        assert RedisAuditorEvents.count() == 3
+        assert ActivityLog.objects.count() == 0
+
+        assert auditor.flush() == 3
+        assert RedisAuditorEvents.count() == 0
+        self.assert_recorded()
+        assert email_execute.call_count == 1
+
+    def test_redis_transport_failed_flush_keeps_the_events(self):
+        self.set_transport('redis')
+        self.record_events()
+
+        with patch('activitylogs.service.ActivityLogService.record_events',
+                   side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                auditor.flush()
+        assert RedisAuditorEvents.count() == 3
+        assert ActivityLog.objects.count() == 0
+
+        assert auditor.flush() == 3
+        assert RedisAuditorEvents.count() == 0
+        assert ActivityLog.objects.count() == 2
+
+    def test_events_are_queued_once_committed(self):
+        self.set_transport('redis')
+        callbacks = []
+        self.on_commit.side_effect = callbacks.append
+        self.record_events()
+        assert RedisAuditorEvents.count() == 0
+
+        for callback in callbacks:
+            callback()
+        assert RedisAuditorEvents.count() == 3
+
+    @patch.object(EmailAction, 'execute')
+    def test_celery_transport(self, email_execute):
+        self.set_transport('celery')
+        self.record_events()
+        self.assert_recorded()
+        assert email_execute.call_count == 1
+
+    @patch.object(EmailAction, 'execute')
+    def test_events_of_deleted_instances_are_logged_but_not_notified(self, email_execute):
+        self.set_transport('redis')
+        self.record_events()
+        experiment_id = self.experiment.id
+        self.experiment.delete()
+
+        auditor.flush()
+        assert ActivityLog.objects.filter(object_id=experiment_id).count() == 2
+        assert NotificationEvent.objects.filter(
+            event_type=experiment_events.EXPERIMENT_SUCCEEDED).count() == 0
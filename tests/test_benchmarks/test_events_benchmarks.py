@@ -0,0 +1,88 @@
+import os
+import time
+import uuid
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import auditor
+
+from auditor.manager import default_manager
+from db.models.experiments import Experiment
+from event_manager.events import experiment as experiment_events
+from factories.factory_experiments import ExperimentFactory
+from tests.test_benchmarks.test_scheduler_benchmarks import report
+from tests.utils import BaseTest
+
+# e.g. `POLYAXON_BENCHMARK_EVENTS=10000 pytest -m benchmarks_mark --log-cli-level=INFO`
+BENCHMARK_EVENTS = int(os.environ.get('POLYAXON_BENCHMARK_EVENTS', 100))
+
+ATTRIBUTE_VALUES = {
+    str: 'value',
+    int: 1,
+    float: 1.,
+    bool: True,
+    dict: {},
+}
+
+
+def get_attribute_value(attr):
+    if attr.is_datetime:
+        return timezone.now()
+    if attr.is_uuid:
+        return uuid.uuid4()
+    return ATTRIBUTE_VALUES[attr.attr_type]
+
+
+@pytest.mark.benchmarks_mark
+class TestEventsBenchmarks(BaseTest):
+    """Creates the events of all the registered event types."""
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        auditor.validate()
+        auditor.setup()
+        self.event_classes = list(default_manager.values)
+
+    def test_create_events_from_values(self):
+        values = {event_class: {attr.name: get_attribute_value(attr)
+                                for attr, _ in event_class.get_extractor().attributes}
+                  for event_class in self.event_classes}
+
+        n_events = BENCHMARK_EVENTS * len(self.event_classes)
+        start = time.time()
+        for _ in range(BENCHMARK_EVENTS):
+            for event_class in self.event_classes:
+                event_class.from_values(values[event_class])
+        duration = time.time() - start
+
+        report('events from values', n_events, 'events', duration, 0)
+
+    def test_create_events_from_instances(self):
+        experiment_id = ExperimentFactory().id
+        event_classes = [experiment_events.ExperimentCreatedEvent,
+                         experiment_events.ExperimentUpdatedEvent,
+                         experiment_events.ExperimentViewedEvent,
+                         experiment_events.ExperimentBookmarkedEvent,
+                         experiment_events.ExperimentDeletedTriggeredEvent]
+        queryset = Experiment.objects.filter(id=experiment_id)
+
+        n_events = BENCHMARK_EVENTS * len(event_classes)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            for _ in range(BENCHMARK_EVENTS):
+                instance = event_classes[0].select_related(queryset).get()
+                for event_class in event_classes:
+                    event_class.from_instance(instance,
+                                              actor_id=instance.user.id,
+                                              actor_name=instance.user.username)
+            duration = time.time() - start
+
+        report('events from instances', n_events, 'events', duration, len(queries))
+        # The related objects are selected with the instance,
+        # only the status of `last_status` is loaded, once per instance
+        assert len(queries) <= 2 * BENCHMARK_EVENTS
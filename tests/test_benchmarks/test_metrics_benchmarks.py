@@ -0,0 +1,79 @@
+import json
+import os
+import time
+
+import pytest
+
+from rest_framework import status
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from constants.urls import API_V1
+from db.models.experiments import ExperimentMetric
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_projects import ProjectFactory
+from tests.test_benchmarks.test_scheduler_benchmarks import report
+from tests.utils import BaseViewTest
+
+# e.g. `POLYAXON_BENCHMARK_METRICS=10000 POLYAXON_BENCHMARK_METRICS_BATCH=500 \
+#       pytest -m benchmarks_mark --log-cli-level=INFO`
+BENCHMARK_METRICS = int(os.environ.get('POLYAXON_BENCHMARK_METRICS', 100))
+BENCHMARK_METRICS_BATCH = int(os.environ.get('POLYAXON_BENCHMARK_METRICS_BATCH', 50))
+
+
+def get_metrics(count):
+    return [{'values': {'loss': 1. / (i + 1), 'accuracy': i / count}} for i in range(count)]
+
+
+def get_batches(metrics):
+    return [metrics[i:i + BENCHMARK_METRICS_BATCH]
+            for i in range(0, len(metrics), BENCHMARK_METRICS_BATCH)]
+
+
+@pytest.mark.benchmarks_mark
+class TestMetricsBenchmarks(BaseViewTest):
+    """Compares the ingestion throughput of the experiment metrics endpoint,
+    posting the metrics one by one and in batches.
+    """
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        self.experiment = ExperimentFactory(project=project)
+        self.url = '/{}/{}/{}/experiments/{}/metrics/'.format(API_V1,
+                                                              project.user.username,
+                                                              project.name,
+                                                              self.experiment.id)
+        self.metrics = get_metrics(BENCHMARK_METRICS)
+
+    def ingest(self, name, requests):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            for data, content_type in requests:
+                if content_type:
+                    resp = self.internal_client.post(self.url, data, content_type=content_type)
+                else:
+                    resp = self.internal_client.post(self.url, data)
+                assert resp.status_code == status.HTTP_201_CREATED
+            duration = time.time() - start
+
+        report(name, BENCHMARK_METRICS, 'metrics', duration, len(queries))
+        assert ExperimentMetric.objects.filter(
+            experiment=self.experiment).count() == BENCHMARK_METRICS
+        ExperimentMetric.objects.filter(experiment=self.experiment).delete()
+        return len(queries)
+
+    def test_ingest_metrics(self):
+        single_queries = self.ingest('metrics single', [
+            (metric, None) for metric in self.metrics])
+        batch_queries = self.ingest('metrics batch', [
+            (batch, None) for batch in get_batches(self.metrics)])
+        ndjson_queries = self.ingest('metrics ndjson', [
+            ('\n'.join(json.dumps(metric) for metric in batch), 'application/x-ndjson')
+            for batch in get_batches(self.metrics)])
+
+        if BENCHMARK_METRICS > BENCHMARK_METRICS_BATCH:
+            assert batch_queries < single_queries
+            assert ndjson_queries < single_queries
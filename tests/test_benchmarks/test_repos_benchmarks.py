@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_projects import ProjectFactory
+from factories.factory_repos import RepoFactory
+from libs.repos import git
+from tests.test_benchmarks.test_scheduler_benchmarks import (
+    get_group_spec_content,
+    logger,
+    report
+)
+from tests.utils import BaseTest
+
+# e.g. `POLYAXON_BENCHMARK_CODE_GROUPS=1000 pytest -m benchmarks_mark --log-cli-level=INFO`
+BENCHMARK_CODE_GROUPS = int(os.environ.get('POLYAXON_BENCHMARK_CODE_GROUPS', 20))
+
+
+def get_head_commit_hash_from_git_log(repo_path):
+    """Resolves the last commit with a git process, as it was before the refs were read."""
+    commit_hash = git.run_command(cmd='git --no-pager log --pretty=oneline -1', data=None,
+                                  location=repo_path, chw=True).split(' ')[0]
+    return commit_hash or None
+
+
+@pytest.mark.benchmarks_mark
+class TestReposBenchmarks(BaseTest):
+    """Compares the creation of groups, which reference the last commit of the project's code,
+    resolving the commit from the git refs and with a git process.
+    """
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+        self.repo = RepoFactory(project=self.project)
+        open(os.path.join(self.repo.path, 'file.dat'), 'w+')
+        git.commit(self.repo.path, 'user@domain.com', 'username')
+        self.content = get_group_spec_content(n_experiments=2)
+
+    def create_groups(self, name):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            groups = [ExperimentGroupFactory(project=self.project, content=self.content)
+                      for _ in range(BENCHMARK_CODE_GROUPS)]
+            duration = time.time() - start
+
+        report(name, BENCHMARK_CODE_GROUPS, 'groups', duration, len(queries))
+        assert all(group.code_reference.commit == self.repo.last_commit_hash
+                   for group in groups)
+        return duration
+
+    def test_create_groups(self):
+        with patch('libs.repos.git.get_head_commit_hash',
+                   side_effect=get_head_commit_hash_from_git_log):
+            git_log_duration = self.create_groups('groups with git log')
+        refs_duration = self.create_groups('groups with refs')
+        logger.info('refs speedup: %.2fx',
+                    git_log_duration / refs_duration if refs_duration else float('inf'))
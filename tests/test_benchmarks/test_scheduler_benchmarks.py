@@ -0,0 +1,124 @@
+import logging
+import os
+import time
+
+import pytest
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from constants.experiments import ExperimentLifeCycle
+from constants.pods import PodLifeCycle
+from db.models.experiments import Experiment
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_projects import ProjectFactory
+from monitor_statuses import monitor
+from polyaxon_k8s.manager import K8SManager
+from tests.fake_k8s import PODS, FakeCluster, patch_k8s
+from tests.utils import BaseTest
+
+# The benchmarks are not run by default, they are run and their results logged with e.g.
+# `POLYAXON_BENCHMARK_GROUPS=20 POLYAXON_BENCHMARK_EXPERIMENTS=50 \
+#  pytest -m benchmarks_mark --log-cli-level=INFO`
+BENCHMARK_GROUPS = int(os.environ.get('POLYAXON_BENCHMARK_GROUPS', 2))
+BENCHMARK_EXPERIMENTS = int(os.environ.get('POLYAXON_BENCHMARK_EXPERIMENTS', 3))
+BENCHMARK_K8S_LATENCY = float(os.environ.get('POLYAXON_BENCHMARK_K8S_LATENCY', 0))
+
+logger = logging.getLogger('polyaxon.benchmarks')
+
+group_spec_content = """---
+    version: 1
+
+    kind: group
+
+    hptuning:
+      concurrency: {n_experiments}
+      matrix:
+        lr:
+          values: {values}
+
+    build:
+      image: my_image
+
+    run:
+      cmd: video_prediction_train --model=DNA --num_masks=1
+"""
+
+
+def get_group_spec_content(n_experiments):
+    return group_spec_content.format(n_experiments=n_experiments,
+                                     values=[0.01 * (i + 1) for i in range(n_experiments)])
+
+
+def report(name, count, unit, duration, queries):
+    logger.info('%s: %s %s in %.3fs, %.2f %s/s, %s queries (%.2f per %s)',
+                name,
+                count,
+                unit,
+                duration,
+                count / duration if duration else float('inf'),
+                unit,
+                queries,
+                queries / count if count else 0,
+                unit.rstrip('s'))
+
+
+@pytest.mark.benchmarks_mark
+# The coalesced statuses are flushed at the end of the watch, in the test's db connection
+@override_settings(K8S_STATUSES_COALESCE_WINDOW=3600)
+class TestSchedulerBenchmarks(BaseTest):
+    """Drives groups of experiments end to end through the scheduler and the statuses monitor.
+
+    Celery runs in eager mode and the cluster is faked in-process,
+    so the numbers measure the time and the queries spent in polyaxon itself.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cluster = FakeCluster(latency=BENCHMARK_K8S_LATENCY)
+        patcher = patch_k8s(self.cluster)
+        patcher.__enter__()
+        self.addCleanup(patcher.__exit__, None, None, None)
+        self.project = ProjectFactory()
+        self.n_experiments = BENCHMARK_GROUPS * BENCHMARK_EXPERIMENTS
+
+    def create_groups(self):
+        content = get_group_spec_content(BENCHMARK_EXPERIMENTS)
+        return [ExperimentGroupFactory(project=self.project, content=content)
+                for _ in range(BENCHMARK_GROUPS)]
+
+    def run_monitor(self, phase):
+        self.cluster.set_phase(phase)
+        consumed_events = self.cluster.consumed_events
+        monitor.run(K8SManager(namespace=settings.K8S_NAMESPACE, in_cluster=True))
+        return self.cluster.consumed_events - consumed_events
+
+    def test_schedule_experiments(self):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            self.create_groups()
+            duration = time.time() - start
+
+        report('schedule', self.n_experiments, 'experiments', duration, len(queries))
+        assert self.cluster.count(PODS) == self.n_experiments
+        assert Experiment.objects.filter(
+            status__status=ExperimentLifeCycle.SCHEDULED).count() == self.n_experiments
+
+    def test_process_status_events(self):
+        self.create_groups()
+
+        n_events = 0
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            for phase in (PodLifeCycle.PENDING, PodLifeCycle.RUNNING, PodLifeCycle.SUCCEEDED):
+                n_events += self.run_monitor(phase)
+            duration = time.time() - start
+
+        report('statuses', n_events, 'events', duration, len(queries))
+        assert n_events >= 3 * self.n_experiments
+        assert Experiment.objects.filter(
+            status__status=ExperimentLifeCycle.SUCCEEDED).count() == self.n_experiments
+        # Done experiments are stopped, which deletes their pods
+        assert self.cluster.count(PODS) == 0
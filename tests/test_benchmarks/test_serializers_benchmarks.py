@@ -0,0 +1,68 @@
+import os
+import time
+
+import pytest
+
+from kombu.utils.json import dumps as json_dumps
+from kombu.utils.json import loads as json_loads
+
+from libs import events_serializer
+from tests.test_benchmarks.test_scheduler_benchmarks import logger, report
+from tests.test_events_monitors.test_events_serializer import (
+    get_job_state_payload,
+    get_resources_payload,
+    get_task_body
+)
+from tests.utils import BaseTest
+
+msgpack = pytest.importorskip('msgpack')  # pylint:disable=invalid-name
+
+# e.g. `POLYAXON_BENCHMARK_SERIALIZED_EVENTS=10000 pytest -m benchmarks_mark --log-cli-level=INFO`
+BENCHMARK_SERIALIZED_EVENTS = int(os.environ.get('POLYAXON_BENCHMARK_SERIALIZED_EVENTS', 100))
+
+
+def benchmark(name, body, dumps, loads):
+    start = time.time()
+    for _ in range(BENCHMARK_SERIALIZED_EVENTS):
+        data = dumps(body)
+    dumps_duration = time.time() - start
+
+    start = time.time()
+    for _ in range(BENCHMARK_SERIALIZED_EVENTS):
+        loads(data)
+    loads_duration = time.time() - start
+
+    report('{} dumps'.format(name), BENCHMARK_SERIALIZED_EVENTS, 'messages', dumps_duration, 0)
+    report('{} loads'.format(name), BENCHMARK_SERIALIZED_EVENTS, 'messages', loads_duration, 0)
+    logger.info('%s: %s bytes per message', name, len(data))
+    return len(data)
+
+
+@pytest.mark.benchmarks_mark
+class TestSerializersBenchmarks(BaseTest):
+    """Compares the json and the events serializers on the high volume event tasks."""
+    DISABLE_RUNNER = True
+
+    def compare(self, name, body):
+        json_size = benchmark('{} json'.format(name), body, json_dumps, json_loads)
+        events_size = benchmark('{} {}'.format(name, events_serializer.NAME),
+                                body,
+                                events_serializer.dumps,
+                                events_serializer.loads)
+        assert events_size < json_size
+
+    def test_resources(self):
+        self.compare('resources', get_task_body(payload=get_resources_payload(), persist=True))
+
+    def test_job_statuses(self):
+        self.compare('job statuses',
+                     get_task_body(payloads=[get_job_state_payload() for _ in range(10)]))
+
+    def test_logs(self):
+        log_lines = ['Step {}: loss 0.{}, accuracy 0.9{}'.format(i, i, i) for i in range(1000)]
+        self.compare('logs', get_task_body(experiment_name='user.project.1',
+                                           experiment_uuid='uuid',
+                                           job_uuid='uuid',
+                                           log_lines=log_lines,
+                                           task_type='master',
+                                           task_idx=0))
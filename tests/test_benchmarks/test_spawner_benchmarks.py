@@ -0,0 +1,62 @@
+import os
+import time
+
+import pytest
+
+from django.conf import settings
+
+from tests.fake_k8s import PODS, FakeCluster, patch_k8s
+from tests.test_benchmarks.test_scheduler_benchmarks import logger, report
+from tests.test_spawner.test_experiment_spawner import get_tensorflow_spawner
+from tests.utils import BaseTest
+
+# e.g. `POLYAXON_BENCHMARK_REPLICAS=64 POLYAXON_BENCHMARK_SPAWN_K8S_LATENCY=0.05 \
+#       pytest -m benchmarks_mark --log-cli-level=INFO`
+BENCHMARK_REPLICAS = int(os.environ.get('POLYAXON_BENCHMARK_REPLICAS', 8))
+BENCHMARK_SPAWN_K8S_LATENCY = float(os.environ.get('POLYAXON_BENCHMARK_SPAWN_K8S_LATENCY', 0.01))
+
+
+@pytest.mark.benchmarks_mark
+class TestSpawnerBenchmarks(BaseTest):
+    """Compares the creation of the replicas of a distributed experiment one at a time
+    and with `K8S_SPAWN_WORKERS` threads, against a fake cluster with a latency per api call.
+    """
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.cluster = FakeCluster(latency=BENCHMARK_SPAWN_K8S_LATENCY)
+        patcher = patch_k8s(self.cluster)
+        patcher.__enter__()
+        self.addCleanup(patcher.__exit__, None, None, None)
+
+    def spawn(self, spawn_workers):
+        spawner = get_tensorflow_spawner(n_workers=BENCHMARK_REPLICAS,
+                                         spawn_workers=spawn_workers)
+        calls = self.cluster.calls
+        self.cluster.max_concurrent_calls = 0
+        start = time.time()
+        spawner.start_experiment()
+        duration = time.time() - start
+
+        # Master, workers and ps
+        n_pods = BENCHMARK_REPLICAS + 2
+        assert self.cluster.count(PODS) == n_pods
+        name = 'spawn with {} workers'.format(spawn_workers)
+        report(name, n_pods, 'pods', duration, 0)
+        logger.info('%s: %s api calls, at most %s concurrent',
+                    name,
+                    self.cluster.calls - calls,
+                    self.cluster.max_concurrent_calls)
+        # The creation's concurrency is asserted rather than its duration,
+        # which depends on the load of the machine running the benchmark
+        max_concurrent_calls = self.cluster.max_concurrent_calls
+        spawner.stop_experiment()
+        assert self.cluster.count(PODS) == 0
+        return max_concurrent_calls
+
+    def test_spawn_replicas(self):
+        assert self.spawn(spawn_workers=1) == 1
+        concurrent_calls = self.spawn(spawn_workers=settings.K8S_SPAWN_WORKERS)
+        if BENCHMARK_SPAWN_K8S_LATENCY and settings.K8S_SPAWN_WORKERS > 1:
+            assert concurrent_calls > 1
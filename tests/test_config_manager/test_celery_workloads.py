@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+import pytest
+
+from django.conf import settings
+from django.test import override_settings
+
+from polyaxon.celery_api import app as celery_app
+from polyaxon.celery_api import select_workload_queues
+from polyaxon.settings import CeleryQueues, CeleryWorkloads
+from tests.utils import BaseTest
+
+
+@pytest.mark.config_manager_mark
+class TestCeleryWorkloads(BaseTest):
+    def test_every_routed_queue_has_a_workload(self):
+        workloads_queues = {queue for queues in settings.CELERY_WORKLOADS_QUEUES.values()
+                            for queue in queues}
+        routed_queues = {route['queue'] for route in settings.CELERY_TASK_ROUTES.values()
+                         if 'queue' in route}
+        assert routed_queues <= workloads_queues
+
+    def test_workloads_do_not_share_queues(self):
+        queues = [queue for queues in settings.CELERY_WORKLOADS_QUEUES.values()
+                  for queue in queues]
+        assert len(queues) == len(set(queues))
+
+    def test_every_workload_has_a_profile(self):
+        assert set(settings.CELERY_WORKLOADS_PROFILES) == set(CeleryWorkloads.VALUES)
+        scheduler_profile = settings.CELERY_WORKLOADS_PROFILES[CeleryWorkloads.SCHEDULER]
+        assert scheduler_profile['prefetch_multiplier'] == 1
+        assert scheduler_profile['acks_late'] is True
+
+    @override_settings(CELERY_WORKLOAD_QUEUES=(CeleryQueues.HP,))
+    def test_workers_consume_the_queues_of_their_workload(self):
+        with patch.object(celery_app.amqp.queues, 'select') as select:
+            select_workload_queues(options={'queues': None})
+            select_workload_queues(options={'queues': 'queues.repos'})
+        select.assert_called_once_with((CeleryQueues.HP,))
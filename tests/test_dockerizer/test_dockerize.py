@@ -5,6 +5,8 @@ from unittest.mock import patch
 
 import pytest
 
+from docker.errors import DockerException
+
 from django.conf import settings
 
 from dockerizer.builder import DockerBuilder
@@ -107,3 +109,72 @@ class TestDockerize(BaseTest):
         assert 'RUN {}'.format(build_steps[0]) in dockerfile
         assert 'RUN {}'.format(build_steps[1]) in dockerfile
         builder.clean()
+
+    @patch('dockerizer.builder.APIClient')
+    def test_dependencies_hash_only_depends_on_dependencies(self, api_client):
+        inspect_distribution = api_client.return_value.inspect_distribution
+        inspect_distribution.return_value = {'Descriptor': {'digest': 'sha256:1'}}
+        build_job = BuildJobFactory()
+
+        # Create a repo folder
+        repo_path = os.path.join(settings.REPOS_MOUNT_PATH, 'repo')
+        os.mkdir(repo_path)
+        with open(os.path.join(repo_path, 'requirements.txt'), 'w') as f:
+            f.write('numpy')
+
+        builder = DockerBuilder(build_job=build_job,
+                                repo_path=repo_path,
+                                from_image='busybox')
+        dependencies_hash = builder.get_dependencies_hash(from_image_digest='sha256:1')
+        image_name, image_tag = builder.get_dependencies_image()
+        assert inspect_distribution.call_args[0] == ('busybox',)
+        assert image_name == builder.image_name
+        assert image_tag == 'deps-{}'.format(dependencies_hash)
+
+        # Code changes do not change the hash
+        Path(os.path.join(repo_path, 'main.py')).touch()
+        assert builder.get_dependencies_image() == (image_name, image_tag)
+
+        # Requirements changes do
+        with open(os.path.join(repo_path, 'requirements.txt'), 'w') as f:
+            f.write('numpy\nscipy')
+        assert builder.get_dependencies_image() != (image_name, image_tag)
+        with open(os.path.join(repo_path, 'requirements.txt'), 'w') as f:
+            f.write('numpy')
+
+        # As well as a new image pushed under the same base image name
+        inspect_distribution.return_value = {'Descriptor': {'digest': 'sha256:2'}}
+        assert builder.get_dependencies_image() != (image_name, image_tag)
+        inspect_distribution.return_value = {'Descriptor': {'digest': 'sha256:1'}}
+        assert builder.get_dependencies_image() == (image_name, image_tag)
+
+        # And the build steps
+        builder = DockerBuilder(build_job=build_job,
+                                repo_path=repo_path,
+                                from_image='busybox',
+                                build_steps=['pip install -r requirements.txt'])
+        assert builder.get_dependencies_image() != (image_name, image_tag)
+
+        # Images pinned by digest are not resolved
+        inspect_distribution.reset_mock()
+        builder = DockerBuilder(build_job=build_job,
+                                repo_path=repo_path,
+                                from_image='busybox@sha256:1')
+        assert builder.get_dependencies_image() == (image_name, image_tag)
+        assert inspect_distribution.call_count == 0
+
+        # Without the digest of the base image, the dependencies image is not cached
+        inspect_distribution.side_effect = DockerException
+        builder = DockerBuilder(build_job=build_job,
+                                repo_path=repo_path,
+                                from_image='busybox')
+        assert builder.get_dependencies_image() is None
+
+        # The code image only adds the code on top of the dependencies image
+        dockerfile = builder.render_code(from_image='{}:{}'.format(image_name, image_tag))
+        assert 'FROM {}:{}'.format(image_name, image_tag) in dockerfile
+        assert 'COPY {} {}'.format(builder.folder_name, builder.WORKDIR) in dockerfile
+        assert 'RUN' not in dockerfile
+        assert 'COPY {} {}'.format(
+            builder.folder_name, builder.WORKDIR) not in builder.render(copy_code=False)
+        builder.clean()
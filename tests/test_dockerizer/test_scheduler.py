@@ -1,7 +1,9 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from django.test import override_settings
+
 from constants.jobs import JobLifeCycle
 from db.models.build_jobs import BuildJob
 from factories.factory_build_jobs import BuildJobFactory
@@ -114,3 +116,46 @@ class TestDockerizerScheduler(BaseTest):
         assert image_exists is True
         assert build_status is False
         assert BuildJob.objects.count() == 1
+
+    def test_scheduler_create_build_job_concurrent_requests_start_one_build(self):
+        """Check that requests for the same build attach to the first scheduled build job."""
+        config = {'image': 'busybox:tag'}
+        with patch('scheduler.dockerizer_scheduler.start_dockerizer') as mock_start:
+            with patch('scheduler.dockerizer_scheduler.check_image') as mock_check:
+                mock_start.return_value = True
+                mock_check.return_value = False
+                build_job1, _, build_status1 = dockerizer_scheduler.create_build_job(
+                    user=self.project.user,
+                    project=self.project,
+                    config=config,
+                    code_reference=self.code_reference
+                )
+                build_job2, image_exists, build_status2 = dockerizer_scheduler.create_build_job(
+                    user=self.project.user,
+                    project=self.project,
+                    config=config,
+                    code_reference=self.code_reference
+                )
+        assert mock_start.call_count == 1
+        assert build_job1.id == build_job2.id
+        assert build_job2.last_status == JobLifeCycle.SCHEDULED
+        assert image_exists is False
+        assert build_status1 is True
+        assert build_status2 is True
+        assert BuildJob.objects.count() == 1
+
+    @override_settings(REGISTRY_HOST_NAME='registry', REGISTRY_PORT='5000')
+    def test_check_image_queries_the_registry(self):
+        build_job = BuildJobFactory(project=self.project,
+                                    user=self.project.user,
+                                    code_reference=self.code_reference)
+        with patch('docker_images.registry.requests.head') as mock_head:
+            mock_head.return_value = MagicMock(status_code=200)
+            assert dockerizer_scheduler.check_image(build_job) is True
+            mock_head.return_value = MagicMock(status_code=404)
+            assert dockerizer_scheduler.check_image(build_job) is False
+
+        assert mock_head.call_count == 2
+        url = mock_head.call_args[0][0]
+        assert url.startswith('http://registry:5000/v2/')
+        assert url.endswith('/manifests/{}'.format(build_job.uuid.hex))
@@ -1,7 +1,11 @@
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from constants import user_system
-from event_manager.event import Attribute, Event
+from db.models.experiments import Experiment
+from event_manager.event import Attribute, Event, resolve_path
 from event_manager.events import (
     bookmark,
     build_job,
@@ -18,6 +22,7 @@ from event_manager.events import (
     tensorboard,
     user
 )
+from factories.factory_experiments import ExperimentFactory
 from libs.json_utils import loads
 from tests.utils import BaseTest
 
@@ -570,3 +575,44 @@ class TestEvents(BaseTest):
                                           some_actor_name=user_system.USER_SYSTEM_NAME)
         assert event.data['some_actor_id'] == user_system.USER_SYSTEM_ID
         assert event.data['some_actor_name'] == user_system.USER_SYSTEM_NAME
+
+    def test_from_values(self):
+        class DummyEvent(Event):
+            event_type = 'dummy.event'
+            attributes = (
+                Attribute('attr1'),
+                Attribute('attr2.attr3', attr_type=int),
+                Attribute('attr2.attr4', is_required=False),
+            )
+
+        event = DummyEvent.from_values({'attr1': 'test', 'attr2_attr3': '1', 'other': 'foo'})
+        assert event.data == {'attr1': 'test', 'attr2.attr3': 1, 'attr2.attr4': None}
+        assert event.instance is None
+
+        event = DummyEvent.from_values({'attr1': 'test', 'attr2.attr3': 2})
+        assert event.data['attr2.attr3'] == 2
+
+        with self.assertRaises(ValueError):
+            DummyEvent.from_values({'attr1': 'test'})
+
+    def test_resolve_path(self):
+        assert resolve_path(Experiment, ['id']) == (['id'], '')
+        assert resolve_path(Experiment, ['project', 'id']) == (['project_id'], '')
+        assert resolve_path(Experiment, ['project', 'user', 'id']) == (
+            ['project', 'user_id'], 'project')
+        assert resolve_path(Experiment, ['user', 'username']) == (['user', 'username'], 'user')
+        assert resolve_path(Experiment, ['last_status']) == (['last_status'], '')
+        assert resolve_path(object, ['attr1', 'id']) == (['attr1', 'id'], '')
+
+    def test_from_instance_with_selected_related_objects(self):
+        instance = ExperimentFactory()
+        event_class = experiment.ExperimentCreatedEvent
+        assert event_class.get_extractor().get_select_related(Experiment) == [
+            'experiment_group', 'project', 'user']
+
+        instance = event_class.select_related(Experiment.objects.filter(id=instance.id)).get()
+        with CaptureQueriesContext(connection) as queries:
+            event = event_class.from_instance(instance)
+        assert len(queries) == 0
+        assert event.data['project.user.id'] == instance.project.user.id
+        assert event.data['user.username'] == instance.user.username
@@ -1,6 +1,9 @@
+import copy
+import uuid
+
 import pytest
 
-from mock import patch
+from mock import MagicMock, patch
 
 from django.conf import settings
 
@@ -13,6 +16,7 @@ from db.models.tensorboards import TensorboardJobStatus
 from events_handlers.tasks import (
     events_handle_build_job_statuses,
     events_handle_experiment_job_statuses,
+    events_handle_experiment_job_statuses_batch,
     events_handle_job_statuses,
     events_handle_plugin_job_statuses
 )
@@ -22,6 +26,8 @@ from factories.factory_jobs import JobFactory
 from factories.factory_plugins import NotebookJobFactory, TensorboardJobFactory
 from factories.factory_projects import ProjectFactory
 from monitor_statuses.jobs import get_job_state
+from monitor_statuses.monitor import JobStatusesBuffer
+from polyaxon.settings import EventsCeleryTasks
 from tests.fixtures import (
     status_build_job_event,
     status_build_job_event_with_conditions,
@@ -102,6 +108,103 @@ class TestEventsExperimentJobsStatusesHandling(TestEventsBaseJobsStatusesHandlin
         return ExperimentJobFactory(uuid=job_uuid)
 
 
+@pytest.mark.monitors_mark
+class TestEventsExperimentJobsStatusesBatchHandling(BaseTest):
+    def get_payload(self, event, job_uuid):
+        payload = get_job_state(
+            event_type=event['type'],
+            event=event['object'],
+            job_container_names=(settings.CONTAINER_NAME_EXPERIMENT_JOB,),
+            experiment_type_label=settings.TYPE_LABELS_EXPERIMENT).to_dict()
+        payload = copy.deepcopy(payload)
+        payload['details']['labels']['job_uuid'] = job_uuid.hex
+        return payload
+
+    def test_handle_batch(self):
+        job1 = ExperimentJobFactory()
+        job2 = ExperimentJobFactory(experiment=job1.experiment)
+        payloads = [
+            self.get_payload(status_experiment_job_event_with_conditions, job1.uuid),
+            self.get_payload(status_experiment_job_event, job2.uuid),
+            self.get_payload(status_experiment_job_event, uuid.uuid4()),
+        ]
+
+        with patch('events_handlers.tasks.celery_app.send_task') as mock_send_task:
+            events_handle_experiment_job_statuses_batch(payloads)
+
+        assert ExperimentJobStatus.objects.count() == 4
+        job1.refresh_from_db()
+        job2.refresh_from_db()
+        assert job1.last_status == JobLifeCycle.FAILED
+        assert job1.finished_at is not None
+        assert job2.last_status == JobLifeCycle.UNKNOWN
+        # The experiment is checked once for both jobs
+        assert mock_send_task.call_count == 1
+
+        # Done jobs are not updated anymore
+        events_handle_experiment_job_statuses_batch(payloads[:1])
+        assert ExperimentJobStatus.objects.count() == 4
+
+    def test_handle_batch_sets_the_node_of_building_jobs(self):
+        job = ExperimentJobFactory()
+        job.set_status(JobLifeCycle.BUILDING)
+        payload = self.get_payload(status_experiment_job_event, job.uuid)
+        payload['status'] = JobLifeCycle.BUILDING
+        payload['details']['node_name'] = 'node-1'
+
+        with patch('events_handlers.tasks.celery_app.send_task'):
+            events_handle_experiment_job_statuses_batch([payload])
+
+        job.refresh_from_db()
+        assert job.last_status == JobLifeCycle.BUILDING
+        assert job.node_scheduled == 'node-1'
+
+    @patch('monitor_statuses.monitor.celery_app.send_task')
+    def test_buffer_coalesces_job_statuses(self, mock_send_task):
+        statuses_buffer = JobStatusesBuffer(window=60, batch_size=2)
+        job_uuid1, job_uuid2 = uuid.uuid4().hex, uuid.uuid4().hex
+
+        def get_state(status, node_name=None):
+            return {'status': status, 'details': {'node_name': node_name}}
+
+        statuses_buffer.add(job_uuid1, get_state(JobLifeCycle.BUILDING))
+        statuses_buffer.add(job_uuid1, get_state(JobLifeCycle.RUNNING, 'node-1'))
+        assert mock_send_task.call_count == 0
+        assert statuses_buffer.flush() == 1
+        assert mock_send_task.call_args[0][0] == (
+            EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES_BATCH)
+        assert mock_send_task.call_args[1]['kwargs']['payloads'] == [
+            get_state(JobLifeCycle.RUNNING, 'node-1')]
+
+        # The same status is dropped
+        statuses_buffer.add(job_uuid1, get_state(JobLifeCycle.RUNNING, 'node-1'))
+        assert statuses_buffer.flush() == 0
+
+        # The buffer is flushed once the batch size is reached
+        statuses_buffer.add(job_uuid1, get_state(JobLifeCycle.SUCCEEDED, 'node-1'))
+        statuses_buffer.add(job_uuid2, get_state(JobLifeCycle.BUILDING))
+        assert mock_send_task.call_count == 2
+        assert len(mock_send_task.call_args[1]['kwargs']['payloads']) == 2
+
+    @patch('monitor_statuses.monitor.celery_app.send_task')
+    def test_buffer_acknowledges_the_events_once_sent(self, mock_send_task):
+        acks = MagicMock()
+        acks.count.return_value = 2
+        statuses_buffer = JobStatusesBuffer(window=60, batch_size=10, acks=acks)
+        statuses_buffer.add(uuid.uuid4().hex, {'status': JobLifeCycle.BUILDING, 'details': {}})
+
+        # The events are not acknowledged if their statuses could not be sent
+        mock_send_task.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            statuses_buffer.flush()
+        assert acks.acknowledge.call_count == 0
+
+        mock_send_task.side_effect = None
+        statuses_buffer.add(uuid.uuid4().hex, {'status': JobLifeCycle.BUILDING, 'details': {}})
+        statuses_buffer.flush()
+        acks.acknowledge.assert_called_once_with(2)
+
+
 @pytest.mark.monitors_mark
 class TestEventsJobsStatusesHandling(TestEventsBaseJobsStatusesHandling):
     EVENT = status_job_event
@@ -0,0 +1,113 @@
+import uuid
+
+import pytest
+
+from libs import events_serializer
+from tests.utils import BaseTest
+
+msgpack = pytest.importorskip('msgpack')  # pylint:disable=invalid-name
+
+
+def get_resources_payload():
+    return {
+        'job_uuid': uuid.uuid4().hex,
+        'experiment_uuid': uuid.uuid4().hex,
+        'job_name': 'user.project.1.master.0',
+        'container_id': uuid.uuid4().hex,
+        'n_cpus': 8,
+        'cpu_percentage': 12.5,
+        'percpu_percentage': [10.1, 14.9, 12.5, 12.5, 10.1, 14.9, 12.5, 12.5],
+        'memory_used': 1024 * 1024 * 1024,
+        'memory_limit': 4 * 1024 * 1024 * 1024,
+        'gpu_resources': [{
+            'index': 0,
+            'uuid': uuid.uuid4().hex,
+            'name': 'Tesla K80',
+            'minor': 0,
+            'bus_id': '0000:00:1E.0',
+            'serial': '0321017011452',
+            'temperature_gpu': 80,
+            'utilization_gpu': 76,
+            'power_draw': 149,
+            'power_limit': 149,
+            'memory_free': 1024,
+            'memory_used': 10417,
+            'memory_total': 11441,
+            'memory_utilization': 91,
+        }],
+    }
+
+
+def get_job_state_payload():
+    return {
+        'status': 'running',
+        'message': None,
+        'details': {
+            'event_type': 'MODIFIED',
+            'phase': 'Running',
+            'labels': {
+                'app': 'polyaxon',
+                'project_name': 'user.project',
+                'project_uuid': uuid.uuid4().hex,
+                'experiment_group_name': None,
+                'experiment_group_uuid': None,
+                'experiment_name': 'user.project.1',
+                'experiment_uuid': uuid.uuid4().hex,
+                'job_uuid': uuid.uuid4().hex,
+                'task_type': 'master',
+                'task_idx': '0',
+                'role': 'polyaxon-workers',
+                'type': 'polyaxon-experiment',
+            },
+            'node_name': 'node-1',
+            'deletion_timestamp': None,
+            'pod_conditions': {'Ready': {'status': True, 'reason': None}},
+            'container_statuses': {'polyaxon-experiment-job': {'ready': True}},
+        },
+    }
+
+
+def get_task_body(**kwargs):
+    # The body of the messages of the celery protocol 2: args, kwargs and embed
+    return [[], kwargs, {'callbacks': None, 'errbacks': None, 'chain': None, 'chord': None}]
+
+
+@pytest.mark.monitors_mark
+class TestEventsSerializer(BaseTest):
+    def test_resources_and_statuses_are_encoded_with_their_schema_keys(self):
+        body = get_task_body(payload=get_resources_payload(), persist=True)
+        data = events_serializer.dumps(body, compress_threshold=0)
+        assert data[0] == events_serializer.FLAG_KEYS
+        assert b'cpu_percentage' not in data
+        assert events_serializer.loads(data) == body
+
+        body = get_task_body(payloads=[get_job_state_payload() for _ in range(3)])
+        data = events_serializer.dumps(body, compress_threshold=0)
+        assert b'container_statuses' not in data
+        assert events_serializer.loads(data) == body
+
+    def test_large_messages_are_compressed(self):
+        body = get_task_body(job_uuid=uuid.uuid4().hex,
+                             job_name='user.project.jobs.1',
+                             log_lines=['Step {}: loss 0.123'.format(i) for i in range(1000)])
+        data = events_serializer.dumps(body, compress_threshold=1024)
+        assert data[0] & events_serializer.FLAG_COMPRESSED
+        assert events_serializer.loads(data) == body
+
+        data = events_serializer.dumps(body, compress_threshold=0)
+        assert not data[0] & events_serializer.FLAG_COMPRESSED
+
+    def test_payloads_with_other_keys_than_strings_are_not_encoded(self):
+        body = get_task_body(payload={0: 'gpu', 'status': 'running'})
+        data = events_serializer.dumps(body, compress_threshold=0)
+        assert data[0] == 0
+        assert events_serializer.loads(data) == body
+
+    def test_keys_cover_the_schemas(self):
+        from monitor_statuses.schemas import JobStateSchema, PodStateSchema
+        from schemas.job_labels import JobLabelSchema
+
+        for schema in (JobStateSchema, PodStateSchema, JobLabelSchema):
+            assert set(schema._declared_fields) <= set(events_serializer.KEYS)  # noqa
+        assert set(get_resources_payload()) <= set(events_serializer.KEYS)
+        assert len(events_serializer.KEYS) == len(set(events_serializer.KEYS))
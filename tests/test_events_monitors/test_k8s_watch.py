@@ -0,0 +1,91 @@
+import pytest
+
+from kubernetes import client
+
+from constants.pods import PodLifeCycle
+from libs import k8s_watch
+from libs.redis_db import RedisWatchStates
+from tests.fake_k8s import PODS, FakeCluster, FakeCoreV1Api, patch_k8s
+from tests.utils import BaseTest
+
+
+@pytest.mark.monitors_mark
+class TestK8SWatch(BaseTest):
+    NAMESPACE = 'polyaxon'
+
+    def setUp(self):
+        super().setUp()
+        self.cluster = FakeCluster()
+        patcher = patch_k8s(self.cluster)
+        patcher.__enter__()
+        self.addCleanup(patcher.__exit__, None, None, None)
+        self.api = FakeCoreV1Api(self.cluster)
+        for i in range(3):
+            self.create_pod('pod-{}'.format(i))
+
+    def create_pod(self, name):
+        pod = client.V1Pod(
+            metadata=client.V1ObjectMeta(name=name),
+            spec=client.V1PodSpec(containers=[client.V1Container(name='job', image='image')]))
+        self.cluster.create(PODS, self.NAMESPACE, pod)
+
+    def stream(self):
+        return [(event['type'], event['object'].metadata.name) for event in k8s_watch.stream(
+            'pods', self.api.list_namespaced_pod, namespace=self.NAMESPACE)]
+
+    def test_stream_lists_then_resumes(self):
+        # The pods are listed, the events before the list are not replayed
+        assert sorted(self.stream()) == [
+            (k8s_watch.ADDED, 'pod-0'), (k8s_watch.ADDED, 'pod-1'), (k8s_watch.ADDED, 'pod-2')]
+        assert RedisWatchStates('pods').get_resource_version() == self.cluster.resource_version
+
+        # Only the new events are streamed after a restart
+        self.cluster.set_phase(PodLifeCycle.RUNNING, names=['pod-1'])
+        self.create_pod('pod-3')
+        self.cluster.delete(PODS, self.NAMESPACE, 'pod-0')
+        assert self.stream() == [(k8s_watch.MODIFIED, 'pod-1'),
+                                 (k8s_watch.ADDED, 'pod-3'),
+                                 (k8s_watch.DELETED, 'pod-0')]
+        assert self.stream() == []
+
+    def test_stream_only_yields_changes_when_the_version_is_gone(self):
+        self.stream()
+        self.cluster.set_phase(PodLifeCycle.RUNNING, names=['pod-2'])
+        self.cluster.delete(PODS, self.NAMESPACE, 'pod-0')
+        self.cluster.compact()
+
+        # The watch expired
+        assert self.stream() == []
+        assert RedisWatchStates('pods').get_resource_version() is None
+
+        # The pods are listed again, and only the changed ones are yielded
+        assert self.stream() == [(k8s_watch.MODIFIED, 'pod-2')]
+        assert set(RedisWatchStates('pods').get_objects_versions()) == {
+            pod.metadata.uid for pod in self.cluster.list(PODS, self.NAMESPACE)}
+
+    def test_stream_marks_the_events_processed_once_acknowledged(self):
+        def stream_with_acks():
+            acks = k8s_watch.WatchAcks('pods')
+            events = [(event['type'], event['object'].metadata.name)
+                      for event in k8s_watch.stream('pods',
+                                                    self.api.list_namespaced_pod,
+                                                    acks=acks,
+                                                    namespace=self.NAMESPACE)]
+            return events, acks
+
+        # The listed pods are not acknowledged, e.g. the consumer was killed before its flush
+        events, _ = stream_with_acks()
+        assert len(events) == 3
+        assert RedisWatchStates('pods').get_resource_version() is None
+        events, acks = stream_with_acks()
+        assert len(events) == 3
+        acks.acknowledge(acks.count())
+        assert RedisWatchStates('pods').get_resource_version() == self.cluster.resource_version
+
+        self.cluster.set_phase(PodLifeCycle.RUNNING, names=['pod-1'])
+        events, _ = stream_with_acks()
+        assert events == [(k8s_watch.MODIFIED, 'pod-1')]
+        events, acks = stream_with_acks()
+        assert events == [(k8s_watch.MODIFIED, 'pod-1')]
+        acks.acknowledge(acks.count())
+        assert self.stream() == []
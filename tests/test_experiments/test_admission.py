@@ -0,0 +1,218 @@
+from datetime import timedelta
+
+import pytest
+
+from mock import patch
+
+from django.conf import settings
+from django.utils import timezone
+
+from constants.experiments import ExperimentLifeCycle
+from constants.nodes import NodeLifeCycle
+from db.models.experiment_jobs import ExperimentJobStatus
+from db.models.experiments import ExperimentStatus
+from factories.factory_clusters import get_cluster_node
+from factories.factory_experiments import ExperimentFactory, ExperimentJobFactory
+from factories.factory_projects import ProjectFactory
+from factories.fixtures import exec_experiment_resources_parsed_content
+from scheduler.admission import admit_experiments, release_reservations
+from scheduler.capacity import (
+    MB,
+    ClusterCapacity,
+    NodeCapacity,
+    Resources,
+    get_experiment_replicas
+)
+from scheduler.tasks.experiments import experiments_start
+from schemas.tasks import TaskType
+from tests.utils import BaseTest
+
+
+@pytest.mark.experiments_mark
+class TestClusterCapacity(BaseTest):
+    def test_get_experiment_replicas(self):
+        replicas = get_experiment_replicas(exec_experiment_resources_parsed_content)
+        assert [(task_type, task_idx) for task_type, task_idx, _ in replicas] == [
+            (TaskType.MASTER, 0), (TaskType.WORKER, 0), (TaskType.PS, 0)]
+        for _, _, resources in replicas:
+            assert (resources.cpu, resources.memory, resources.gpu) == (1, 100 * MB, 0)
+
+    def test_placement_is_all_or_nothing_with_best_fit(self):
+        capacity = ClusterCapacity(nodes=[
+            NodeCapacity(name='small', capacity=Resources(cpu=2, memory=4 * MB, gpu=1)),
+            NodeCapacity(name='large', capacity=Resources(cpu=8, memory=16 * MB, gpu=4)),
+        ])
+
+        # The gpu replica goes to the node it fits best
+        assert capacity.get_placement([Resources(cpu=1, gpu=1)]) == ['small']
+        assert capacity.get_placement([Resources(cpu=4, gpu=2), Resources(cpu=2)]) == [
+            'large', 'small']
+
+        # Nothing is reserved if one of the replicas does not fit
+        assert capacity.place([Resources(cpu=1, gpu=1), Resources(cpu=1, gpu=8)]) is False
+        assert capacity.nodes['small'].used.key == (0, 0, 0)
+        assert capacity.nodes['large'].used.key == (0, 0, 0)
+
+        assert capacity.place([Resources(cpu=1, gpu=1), Resources(cpu=8, gpu=4)]) is True
+        assert capacity.get_placement([Resources(gpu=1)]) is None
+        assert capacity.can_ever_place([Resources(gpu=1)]) is True
+
+
+@pytest.mark.experiments_mark
+class TestExperimentsAdmission(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+
+    def create_node(self, cpu):
+        return get_cluster_node(status=NodeLifeCycle.READY,
+                                schedulable_taints=True,
+                                schedulable_state=True,
+                                cpu=cpu,
+                                memory=1024 * MB,
+                                n_gpus=0)
+
+    def create_experiment(self, **kwargs):
+        return ExperimentFactory(project=self.project,
+                                 config=exec_experiment_resources_parsed_content.parsed_data,
+                                 **kwargs)
+
+    @patch('scheduler.experiment_scheduler.start_experiment')
+    def test_experiments_are_started_without_known_nodes(self, mock_start):
+        experiment = self.create_experiment()
+        experiments_start(experiment_id=experiment.id)
+
+        assert mock_start.call_count == 1
+        experiment.refresh_from_db()
+        assert experiment.last_status == ExperimentLifeCycle.CREATED
+
+    @patch('scheduler.experiment_scheduler.start_experiment')
+    def test_experiments_are_queued_until_resources_are_released(self, mock_start):
+        self.create_node(cpu=4)
+        # Each experiment requests 3 cpus
+        experiment1 = self.create_experiment()
+        experiment2 = self.create_experiment()
+
+        experiments_start(experiment_id=experiment1.id)
+        assert mock_start.call_count == 1
+        experiment1.refresh_from_db()
+        assert experiment1.last_status == ExperimentLifeCycle.SCHEDULED
+
+        experiments_start(experiment_id=experiment2.id)
+        assert mock_start.call_count == 1
+        experiment2.refresh_from_db()
+        assert experiment2.last_status == ExperimentLifeCycle.QUEUED
+
+        # Nothing was released
+        assert admit_experiments() == []
+
+        experiment1.set_status(ExperimentLifeCycle.STOPPED)
+        assert mock_start.call_count == 2
+        experiment2.refresh_from_db()
+        assert experiment2.last_status == ExperimentLifeCycle.SCHEDULED
+
+    @patch('scheduler.experiment_scheduler.start_experiment')
+    def test_distributed_experiments_too_large_for_the_cluster_fail(self, mock_start):
+        self.create_node(cpu=2)
+        experiment = self.create_experiment()
+        experiments_start(experiment_id=experiment.id)
+
+        assert mock_start.call_count == 0
+        experiment.refresh_from_db()
+        assert experiment.last_status == ExperimentLifeCycle.FAILED
+
+    @patch('scheduler.experiment_scheduler.stop_experiment')
+    @patch('scheduler.experiment_scheduler.start_experiment')
+    def test_expired_reservations_are_released(self, mock_start, mock_stop):
+        self.create_node(cpu=4)
+        experiment = self.create_experiment()
+        experiments_start(experiment_id=experiment.id)
+        ExperimentJobFactory(experiment=experiment, role=TaskType.MASTER)
+        ExperimentJobFactory(experiment=experiment, role=TaskType.WORKER)
+        experiment.set_status(ExperimentLifeCycle.STARTING)
+
+        # Still within the timeout
+        assert release_reservations() == []
+
+        expired_at = timezone.now() - timedelta(seconds=settings.GANG_SCHEDULING_TIMEOUT)
+        ExperimentStatus.objects.filter(
+            experiment=experiment,
+            status=ExperimentLifeCycle.SCHEDULED
+        ).update(created_at=expired_at)
+        # The pods made progress within the timeout
+        assert release_reservations() == []
+
+        ExperimentJobStatus.objects.filter(job__experiment=experiment).update(created_at=expired_at)
+        assert release_reservations() == [experiment.id]
+        # The pods are stopped before the resources are released
+        assert mock_stop.call_count == 1
+        experiment.refresh_from_db()
+        assert experiment.last_status == ExperimentLifeCycle.QUEUED
+        assert experiment.jobs.count() == 0
+
+        # The released experiment is not admitted before its pods are terminated
+        assert admit_experiments() == []
+        ExperimentStatus.objects.filter(
+            experiment=experiment,
+            status=ExperimentLifeCycle.QUEUED
+        ).update(created_at=timezone.now() - timedelta(
+            seconds=settings.GANG_SCHEDULING_RELEASE_COOLDOWN))
+        # The released resources are reserved again by the next admission
+        assert admit_experiments() == [experiment.id]
+        assert mock_start.call_count == 2
+
+    @patch('scheduler.experiment_scheduler.stop_experiment')
+    @patch('scheduler.experiment_scheduler.start_experiment')
+    def test_reservations_of_bound_replicas_are_kept(self, mock_start, mock_stop):
+        self.create_node(cpu=4)
+        experiment = self.create_experiment()
+        experiments_start(experiment_id=experiment.id)
+        ExperimentJobFactory(experiment=experiment, role=TaskType.MASTER, node_scheduled='node')
+        ExperimentJobFactory(experiment=experiment, role=TaskType.WORKER, node_scheduled='node')
+        experiment.set_status(ExperimentLifeCycle.STARTING)
+
+        expired_at = timezone.now() - timedelta(seconds=settings.GANG_SCHEDULING_TIMEOUT)
+        ExperimentStatus.objects.filter(experiment=experiment).update(created_at=expired_at)
+        ExperimentJobStatus.objects.filter(job__experiment=experiment).update(created_at=expired_at)
+        # The replicas are pulling their images
+        assert release_reservations() == []
+        assert mock_stop.call_count == 0
+
+    @patch('scheduler.experiment_scheduler.stop_experiment', side_effect=Exception)
+    @patch('scheduler.experiment_scheduler.start_experiment')
+    def test_reservations_are_released_when_the_pods_cannot_be_stopped(self,
+                                                                        mock_start,
+                                                                        mock_stop):
+        self.create_node(cpu=4)
+        experiment = self.create_experiment()
+        experiments_start(experiment_id=experiment.id)
+        experiment.set_status(ExperimentLifeCycle.STARTING)
+        ExperimentStatus.objects.filter(experiment=experiment).update(
+            created_at=timezone.now() - timedelta(seconds=settings.GANG_SCHEDULING_TIMEOUT))
+
+        assert release_reservations() == [experiment.id]
+        assert mock_stop.call_count == 1
+        experiment.refresh_from_db()
+        assert experiment.last_status == ExperimentLifeCycle.QUEUED
+
+    @patch('scheduler.experiment_scheduler.start_experiment')
+    def test_fair_share_admits_the_least_served_owner_first(self, mock_start):
+        self.create_node(cpu=6)
+        running = self.create_experiment()
+        running.set_status(ExperimentLifeCycle.SCHEDULED)
+        running.set_status(ExperimentLifeCycle.RUNNING)
+        # Queued first, by the owner of the running experiment
+        queued1 = self.create_experiment(user=running.user)
+        queued1.set_status(ExperimentLifeCycle.QUEUED)
+        queued2 = self.create_experiment()
+        queued2.set_status(ExperimentLifeCycle.QUEUED)
+
+        assert admit_experiments() == [queued2.id]
+        assert mock_start.call_count == 1
+
+        running.set_status(ExperimentLifeCycle.STOPPED)
+        assert mock_start.call_count == 2
+        queued1.refresh_from_db()
+        assert queued1.last_status == ExperimentLifeCycle.SCHEDULED
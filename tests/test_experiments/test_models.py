@@ -7,13 +7,17 @@ import pytest
 
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.test.client import MULTIPART_CONTENT
 from django.utils import timezone
 
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
 from constants.urls import API_V1
-from crons.tasks.experiments import sync_experiments_and_jobs_statuses
+from crons.tasks.experiments import (
+    compact_experiments_metrics,
+    sync_experiments_and_jobs_statuses
+)
 from db.models.cloning_strategies import CloningStrategy
 from db.models.experiment_jobs import ExperimentJob
 from db.models.experiments import Experiment, ExperimentStatus
@@ -24,6 +28,7 @@ from factories.factory_experiments import (
     ExperimentFactory,
     ExperimentJobFactory,
     ExperimentJobStatusFactory,
+    ExperimentMetricFactory,
     ExperimentStatusFactory
 )
 from factories.factory_projects import ProjectFactory
@@ -34,6 +39,7 @@ from factories.fixtures import (
     exec_experiment_spec_content,
     experiment_spec_content
 )
+from libs.metrics import compact_experiment_metrics
 from libs.paths.experiments import create_experiment_outputs_path, get_experiment_outputs_path
 from scheduler.tasks.experiments import copy_experiment, experiments_set_metrics
 from schemas.specifications import ExperimentSpecification
@@ -406,6 +412,28 @@ class TestExperimentModel(BaseTest):
         assert no_jobs_xp.last_status is None
         assert xp_with_jobs.last_status == ExperimentLifeCycle.RUNNING
 
+    @override_settings(METRICS_COMPACTION_DELAY=0, METRICS_COMPACTION_MIN_COUNT=1)
+    def test_compact_experiments_metrics(self):
+        with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
+            experiment = ExperimentFactory()
+        for _ in range(3):
+            ExperimentMetricFactory(experiment=experiment, values={'tag': 'foo'})
+        with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+            ExperimentStatusFactory(experiment=experiment, status=ExperimentLifeCycle.SUCCEEDED)
+
+        with patch('crons.tasks.experiments.compact_experiment_metrics',
+                   wraps=compact_experiment_metrics) as compact_mock:
+            compact_experiments_metrics()
+        assert compact_mock.call_count == 1
+        experiment.refresh_from_db()
+        assert experiment.metrics_compacted_at is not None
+        assert experiment.metrics.count() == 3
+
+        # The metrics left are not compactable, the experiment is not scanned again
+        with patch('crons.tasks.experiments.compact_experiment_metrics') as compact_mock:
+            compact_experiments_metrics()
+        assert compact_mock.call_count == 0
+
     def test_copying_an_experiment(self):
         with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
             experiment1 = ExperimentFactory()
@@ -1,5 +1,11 @@
 # pylint:disable=too-many-lines
+import io
 import os
+import tarfile
+import threading
+import time
+
+from datetime import timedelta
 
 from faker import Faker
 from unittest.mock import patch
@@ -8,7 +14,7 @@ import pytest
 
 from rest_framework import status
 
-from django.conf import settings
+from django.utils import timezone
 
 from api.experiments.serializers import (
     ExperimentDeclarationsSerializer,
@@ -26,7 +32,14 @@ from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
 from constants.urls import API_V1
 from db.models.experiment_jobs import ExperimentJob, ExperimentJobStatus
-from db.models.experiments import Experiment, ExperimentMetric, ExperimentStatus
+from db.models.experiments import (
+    Experiment,
+    ExperimentMetric,
+    ExperimentMetricChunk,
+    ExperimentStatus
+)
+from event_manager.event_manager import EventManager
+from event_manager.events.experiment import ExperimentViewedEvent
 from factories.factory_experiment_groups import ExperimentGroupFactory
 from factories.factory_experiments import (
     ExperimentFactory,
@@ -41,6 +54,10 @@ from factories.fixtures import (
     exec_experiment_outputs_refs_parsed_content,
     exec_experiment_spec_parsed_content
 )
+from libs import archive
+from libs.archive import get_files_in_path, get_outputs_archive_path, stream_outputs_archive
+from libs.date_utils import to_timestamp
+from libs.metrics import compact_experiment_metrics
 from libs.paths.experiments import (
     create_experiment_logs_path,
     create_experiment_outputs_path,
@@ -691,6 +708,18 @@ class TestExperimentDetailViewV1(BaseViewTest):
         assert resp.data == self.serializer_class(self.object).data
         assert resp.data['num_jobs'] == 2
 
+    def test_get_selects_the_related_objects_of_the_recorded_event(self):
+        manager = EventManager()
+        manager.subscribe(ExperimentViewedEvent)
+        with patch('api.utils.views.auditor_manager', manager):
+            with patch('auditor.record') as auditor_record:
+                resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+
+        instance = auditor_record.call_args[1]['instance']
+        assert Experiment._meta.get_field('project').is_cached(instance)
+        assert Experiment._meta.get_field('experiment_group').is_cached(instance)
+
     def test_get_with_resource_reg_90(self):
         # Fix issue#90:
         # Failed to getting experiment when specify resources without framework in environment
@@ -902,6 +931,16 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert len(data) == 1
         assert data == self.serializer_class(self.queryset[limit:], many=True).data
 
+    def test_get_compacted(self):
+        compact_experiment_metrics(self.experiment)
+        assert ExperimentMetricChunk.objects.filter(experiment=self.experiment).exists()
+
+        # Only the raw metrics are listed
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 1
+        assert resp.data['results'] == self.serializer_class(self.queryset, many=True).data
+
     def test_create(self):
         data = {}
         resp = self.auth_client.post(self.url, data)
@@ -928,6 +967,181 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert last_object.experiment == self.experiment
         assert last_object.values == data['values']
 
+    @patch('auditor.record')
+    def test_create_bulk(self, auditor_record):
+        data = [{'values': {'precision': 0.9}}, {}]
+        resp = self.internal_client.post(self.url, data)
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert self.model_class.objects.count() == self.num_objects
+
+        data = [{'values': {'precision': i / 10}} for i in range(5)]
+        resp = self.internal_client.post(self.url, data)
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert len(resp.data) == 5
+        assert self.model_class.objects.count() == self.num_objects + 5
+        self.experiment.refresh_from_db()
+        assert self.experiment.last_metric == {'precision': 0.4}
+        assert auditor_record.call_count == 1
+
+        # Each metric of the batch keeps a distinct timestamp, in the order sent
+        metrics = self.model_class.objects.filter(experiment=self.experiment).order_by('-id')[:5]
+        metrics = sorted(metrics, key=lambda metric: metric.created_at)
+        assert [metric.values for metric in metrics] == [item['values'] for item in data]
+        assert len({metric.created_at for metric in metrics}) == 5
+
+    def test_create_ndjson(self):
+        data = '{"values": {"loss": 0.3}}\n\n{"values": {"loss": 0.2}}\n'
+        resp = self.internal_client.post(self.url, data, content_type='application/x-ndjson')
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert self.model_class.objects.count() == self.num_objects + 2
+        self.experiment.refresh_from_db()
+        assert self.experiment.last_metric == {'loss': 0.2}
+
+        data = '{"values": {"loss": 0.3}}\n{"values": '
+        resp = self.internal_client.post(self.url, data, content_type='application/x-ndjson')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.experiments_mark
+class TestProjectExperimentComparisonViewV1(BaseViewTest):
+    HAS_AUTH = True
+    DISABLE_RUNNER = True
+    num_objects = 3
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory(user=self.auth_client.user)
+        self.url = '/{}/{}/{}/experiments/compare/'.format(API_V1,
+                                                           self.project.user.username,
+                                                           self.project.name)
+        self.experiments = []
+        for i in range(self.num_objects):
+            experiment = ExperimentFactory(project=self.project,
+                                           declarations={'lr': i / 10, 'optimizer': 'sgd'})
+            ExperimentMetricFactory(experiment=experiment, values={'loss': 1 - i / 10})
+            self.experiments.append(experiment)
+        # One experiment without metrics
+        self.experiments.append(ExperimentFactory(project=self.project,
+                                                  declarations={'lr': 0.5}))
+
+    def test_get(self):
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        ids = resp.data['ids']
+        assert sorted(ids) == sorted(e.id for e in self.experiments)
+        lrs = dict(zip(ids, resp.data['declarations']['lr']))
+        losses = dict(zip(ids, resp.data['metrics']['loss']))
+        optimizers = dict(zip(ids, resp.data['declarations']['optimizer']))
+        assert lrs[self.experiments[-1].id] == 0.5
+        assert losses[self.experiments[-1].id] is None
+        assert optimizers[self.experiments[-1].id] is None
+        assert losses[self.experiments[1].id] == 0.9
+        assert 'summary' not in resp.data
+        assert 'correlations' not in resp.data
+
+    def test_get_summary_and_correlations(self):
+        resp = self.auth_client.get(self.url + '?summary=true&target=loss')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['summary']['declarations']['lr']['count'] == 4
+        assert resp.data['summary']['declarations']['lr']['max'] == 0.5
+        assert resp.data['summary']['declarations']['optimizer'] is None
+        assert resp.data['summary']['metrics']['loss']['min'] == 0.8
+        assert round(resp.data['correlations']['lr'], 5) == -1
+        assert resp.data['correlations']['optimizer'] is None
+
+    def test_get_group(self):
+        with patch('scheduler.tasks.experiment_groups.'
+                   'experiments_group_create.apply_async') as _:  # noqa
+            group = ExperimentGroupFactory(project=self.project)
+        experiment = ExperimentFactory(project=self.project,
+                                       experiment_group=group,
+                                       declarations={'lr': 0.1})
+        url = '/{}/{}/{}/groups/{}/compare/'.format(API_V1,
+                                                    self.project.user.username,
+                                                    self.project.name,
+                                                    group.id)
+        resp = self.auth_client.get(url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['ids'] == [experiment.id]
+
+
+@pytest.mark.experiments_mark
+class TestExperimentMetricSeriesViewV1(BaseViewTest):
+    HAS_AUTH = True
+    DISABLE_RUNNER = True
+    num_objects = 100
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        self.experiment = ExperimentFactory(project=project)
+        self.url = '/{}/{}/{}/experiments/{}/metrics/series/'.format(API_V1,
+                                                                     project.user.username,
+                                                                     project.name,
+                                                                     self.experiment.id)
+        now = timezone.now()
+        self.experiment.add_metrics([
+            {'values': {'loss': 1 / (i + 1), 'accuracy': i / self.num_objects},
+             'created_at': now + timedelta(seconds=i)}
+            for i in range(self.num_objects)])
+
+    def test_get(self):
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert set(resp.data.keys()) == {'loss', 'accuracy'}
+        assert len(resp.data['loss']) == self.num_objects
+
+        resp = self.auth_client.get(self.url + '?keys=loss')
+        assert resp.status_code == status.HTTP_200_OK
+        assert set(resp.data.keys()) == {'loss'}
+
+    def test_downsampling(self):
+        resp = self.auth_client.get(self.url + '?points=10')
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(resp.data['loss']) == 10
+        assert resp.data['loss'][0][1] == 1
+
+        resp = self.auth_client.get(self.url + '?points=10&method=minmax')
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(resp.data['loss']) <= 10
+
+        resp = self.auth_client.get(self.url + '?points=10&method=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_compacted(self):
+        resp = self.auth_client.get(self.url)
+        assert compact_experiment_metrics(self.experiment) == self.num_objects - 1
+        assert ExperimentMetric.objects.filter(experiment=self.experiment).count() == 1
+        self.experiment.refresh_from_db()
+        assert self.experiment.last_metric['accuracy'] == 0.99
+
+        # Rows with non numeric values are kept
+        ExperimentMetricFactory(experiment=self.experiment, values={'tag': 'foo'})
+        assert compact_experiment_metrics(self.experiment) == 0
+
+        compacted_resp = self.auth_client.get(self.url)
+        assert compacted_resp.status_code == status.HTTP_200_OK
+        assert compacted_resp.data == resp.data
+
+    def test_get_compacted_metrics_with_the_same_timestamp(self):
+        now = timezone.now() + timedelta(days=1)
+        self.experiment.add_metrics([
+            {'values': {'loss': 0.5}, 'created_at': now},
+            {'values': {'accuracy': 0.8}, 'created_at': now},
+            {'values': {'loss': 0.4, 'accuracy': 0.9}, 'created_at': now},
+            {'values': {'loss': 0.3}, 'created_at': now + timedelta(seconds=1)},
+        ])
+
+        resp = self.auth_client.get(self.url)
+        assert compact_experiment_metrics(self.experiment) == self.num_objects + 3
+        compacted_resp = self.auth_client.get(self.url)
+        assert compacted_resp.status_code == status.HTTP_200_OK
+        assert compacted_resp.data == resp.data
+        assert compacted_resp.data['loss'][-3:] == [
+            (to_timestamp(now), 0.5),
+            (to_timestamp(now), 0.4),
+            (to_timestamp(now + timedelta(seconds=1)), 0.3)]
+
 
 @pytest.mark.experiments_mark
 class TestExperimentStatusDetailViewV1(BaseViewTest):
@@ -1498,13 +1712,114 @@ class DownloadExperimentOutputsViewTest(BaseViewTest):
         for i in range(4):
             open('{}/{}'.format(self.experiment_outputs_path, i), '+w')
 
-    def test_redirects_nginx_to_file(self):
+    def test_streams_then_redirects_nginx_to_cached_file(self):
         self.create_tmp_outputs()
         # Assert that the experiment outputs
         self.assertTrue(os.path.exists(self.experiment_outputs_path))
+        # The first download streams the archive while building it
+        response = self.auth_client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ProtectedView.NGINX_REDIRECT_HEADER in response)
+        archive_file = tarfile.open(fileobj=io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(len(archive_file.getmembers()), 4)
+
+        # Next downloads are redirected to the cached archive
+        archive_path = get_outputs_archive_path(
+            name=self.experiment.unique_name,
+            files=get_files_in_path(self.experiment_outputs_path))
+        self.assertTrue(os.path.exists(archive_path))
         response = self.auth_client.get(self.download_url)
         self.assertEqual(response.status_code, 200)
         self.assertTrue(ProtectedView.NGINX_REDIRECT_HEADER in response)
-        self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER],
-                         '{}/{}.tar.gz'.format(settings.OUTPUTS_ARCHIVE_ROOT,
-                                               self.experiment.unique_name.replace('.', '_')))
+        self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER], archive_path)
+
+        # Updating the outputs builds a new archive, the previous one is kept for a while
+        open('{}/{}'.format(self.experiment_outputs_path, 'new'), '+w')
+        response = self.auth_client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ProtectedView.NGINX_REDIRECT_HEADER in response)
+        b''.join(response.streaming_content)
+        self.assertTrue(os.path.exists(get_outputs_archive_path(
+            name=self.experiment.unique_name,
+            files=get_files_in_path(self.experiment_outputs_path))))
+        self.assertTrue(os.path.exists(archive_path))
+
+        # The replaced archives are removed when a new archive is built
+        expired_at = time.time() - archive.ARCHIVE_EVICTION_DELAY - 1
+        os.utime(archive_path, (expired_at, expired_at))
+        open('{}/{}'.format(self.experiment_outputs_path, 'other'), '+w')
+        response = self.auth_client.get(self.download_url)
+        b''.join(response.streaming_content)
+        self.assertFalse(os.path.exists(archive_path))
+
+    def test_concurrent_downloads_stream_the_archive_being_built(self):
+        self.create_tmp_outputs()
+        files = get_files_in_path(self.experiment_outputs_path)
+        archive_path = get_outputs_archive_path(name=self.experiment.unique_name, files=files)
+        downloads = []
+
+        def download():
+            downloads.append(b''.join(stream_outputs_archive(files=files,
+                                                             archive_path=archive_path)))
+
+        with patch('libs.archive.stream_tarfile', wraps=archive.stream_tarfile) as mock_stream:
+            builder = stream_outputs_archive(files=files, archive_path=archive_path)
+            content = next(builder)
+            # The concurrent download waits for the archive being built, and streams it
+            follower = threading.Thread(target=download)
+            follower.start()
+            content += b''.join(builder)
+            follower.join(timeout=10)
+
+        assert mock_stream.call_count == 1
+        assert downloads == [content]
+        with open(archive_path, 'rb') as archive_file:
+            assert archive_file.read() == content
+
+    def create_tmp_outputs_with_content(self):
+        create_experiment_outputs_path(persistence_outputs=self.experiment.persistence_outputs,
+                                       experiment_name=self.experiment.unique_name)
+        for i in range(4):
+            with open('{}/{}'.format(self.experiment_outputs_path, i), 'wb') as f:
+                f.write(os.urandom(1024))
+
+    def test_interrupted_download_aborts_the_archive(self):
+        self.create_tmp_outputs_with_content()
+        files = get_files_in_path(self.experiment_outputs_path)
+        archive_path = get_outputs_archive_path(name=self.experiment.unique_name,
+                                                files=files,
+                                                compress=False)
+
+        builder = stream_outputs_archive(files=files, archive_path=archive_path, compress=False)
+        next(builder)
+        builder.close()
+        assert not os.path.exists(archive_path)
+        assert not os.path.exists(archive.get_archive_tmp_path(archive_path))
+        assert not archive.ArchiveLock(archive_path).is_locked()
+
+    def test_interrupted_download_completes_the_archive_for_concurrent_downloads(self):
+        self.create_tmp_outputs_with_content()
+        files = get_files_in_path(self.experiment_outputs_path)
+        archive_path = get_outputs_archive_path(name=self.experiment.unique_name,
+                                                files=files,
+                                                compress=False)
+        is_following = threading.Event()
+        downloads = []
+
+        def download():
+            chunks = stream_outputs_archive(files=files, archive_path=archive_path, compress=False)
+            content = next(chunks)
+            is_following.set()
+            downloads.append(content + b''.join(chunks))
+
+        builder = stream_outputs_archive(files=files, archive_path=archive_path, compress=False)
+        next(builder)
+        follower = threading.Thread(target=download)
+        follower.start()
+        assert is_following.wait(timeout=10)
+        builder.close()
+        follower.join(timeout=10)
+
+        with open(archive_path, 'rb') as archive_file:
+            assert downloads == [archive_file.read()]
+        assert len(tarfile.open(fileobj=io.BytesIO(downloads[0])).getmembers()) == 4
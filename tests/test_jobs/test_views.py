@@ -1,5 +1,7 @@
 # pylint:disable=too-many-lines
+import io
 import os
+import tarfile
 
 from faker import Faker
 from unittest.mock import patch
@@ -8,8 +10,6 @@ import pytest
 
 from rest_framework import status
 
-from django.conf import settings
-
 from api.jobs.serializers import JobDetailSerializer, JobSerializer, JobStatusSerializer
 from api.utils.views import ProtectedView
 from constants.jobs import JobLifeCycle
@@ -18,6 +18,7 @@ from db.models.jobs import Job, JobStatus
 from factories.factory_jobs import JobFactory, JobStatusFactory
 from factories.factory_projects import ProjectFactory
 from factories.fixtures import job_spec_parsed_content
+from libs.archive import get_files_in_path, get_outputs_archive_path
 from libs.paths.jobs import (
     create_job_logs_path,
     create_job_outputs_path,
@@ -653,13 +654,34 @@ class DownloadJobOutputsViewTest(BaseViewTest):
         for i in range(4):
             open('{}/{}'.format(self.job_outputs_path, i), '+w')
 
-    def test_redirects_nginx_to_file(self):
+    def test_streams_then_redirects_nginx_to_cached_file(self):
         self.create_tmp_outputs()
         # Assert that the job outputs
         self.assertTrue(os.path.exists(self.job_outputs_path))
+        # The first download streams the archive while building it
+        response = self.auth_client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ProtectedView.NGINX_REDIRECT_HEADER in response)
+        archive = tarfile.open(fileobj=io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(len(archive.getmembers()), 4)
+
+        # Next downloads are redirected to the cached archive
+        archive_path = get_outputs_archive_path(
+            name=self.job.unique_name,
+            files=get_files_in_path(self.job_outputs_path))
+        self.assertTrue(os.path.exists(archive_path))
         response = self.auth_client.get(self.download_url)
         self.assertEqual(response.status_code, 200)
         self.assertTrue(ProtectedView.NGINX_REDIRECT_HEADER in response)
-        self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER],
-                         '{}/{}.tar.gz'.format(settings.OUTPUTS_ARCHIVE_ROOT,
-                                               self.job.unique_name.replace('.', '_')))
+        self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER], archive_path)
+
+        # Updating the outputs builds a new archive, the previous one is removed by the crons
+        open('{}/{}'.format(self.job_outputs_path, 'new'), '+w')
+        response = self.auth_client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ProtectedView.NGINX_REDIRECT_HEADER in response)
+        b''.join(response.streaming_content)
+        self.assertTrue(os.path.exists(get_outputs_archive_path(
+            name=self.job.unique_name,
+            files=get_files_in_path(self.job_outputs_path))))
+        self.assertTrue(os.path.exists(archive_path))
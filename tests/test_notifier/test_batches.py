@@ -0,0 +1,128 @@
+# pylint:disable=ungrouped-imports
+from unittest.mock import patch
+
+import pytest
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+import notifier
+
+from action_manager.actions.email import EmailAction
+from db.models.notification import Notification, NotificationEvent
+from event_manager.events.experiment import EXPERIMENT_FAILED, EXPERIMENT_SUCCEEDED
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_projects import ProjectFactory
+from libs.redis_db import RedisNotifierEvents, RedisNotifierRecipients
+from notifier.recipients import RecipientSpec, get_instance_and_project_recipients
+from tests.utils import BaseTest
+
+
+@pytest.mark.notifier_mark
+class NotifierRecipientsTest(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+
+    def test_recipients_are_cached(self):
+        recipients = {RecipientSpec(self.experiment.user.id, self.experiment.user.email),
+                      RecipientSpec(self.experiment.project.user.id,
+                                    self.experiment.project.user.email)}
+        assert get_instance_and_project_recipients(self.experiment) == recipients
+
+        with CaptureQueriesContext(connection) as queries:
+            assert get_instance_and_project_recipients(self.experiment) == recipients
+        assert len(queries) == 0
+        # The recipients are shared with the other processes
+        assert RedisNotifierRecipients.get_project_users(self.experiment.project_id) == {
+            self.experiment.project.user.id}
+
+    def test_recipients_are_invalidated(self):
+        get_instance_and_project_recipients(self.experiment)
+
+        user = self.experiment.user
+        user.email = 'new@polyaxon.com'
+        user.save()
+        assert RecipientSpec(user.id, 'new@polyaxon.com') in get_instance_and_project_recipients(
+            self.experiment)
+
+        project = self.experiment.project
+        project.user = self.experiment.user
+        project.save()
+        assert get_instance_and_project_recipients(self.experiment) == {
+            RecipientSpec(user.id, 'new@polyaxon.com')}
+
+
+@pytest.mark.notifier_mark
+@override_settings(NOTIFIER_BATCH_WINDOW=10)
+class NotifierBatchesTest(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+        self.experiments = [ExperimentFactory(project=self.project) for _ in range(3)]
+        notifier.validate()
+        notifier.setup()
+
+        # Force tasks autodiscover
+        from notifier import tasks  # noqa
+
+    def record_events(self, event_types):
+        with patch('notifier.service.celery_app.send_task') as mock_send_task:
+            for event_type in event_types:
+                for experiment in self.experiments:
+                    notifier.record(event_type=event_type, instance=experiment)
+        return mock_send_task
+
+    @patch.object(EmailAction, 'execute')
+    def test_events_of_a_project_are_notified_together(self, email_execute):
+        from notifier.tasks import notifier_record_events
+
+        mock_send_task = self.record_events([EXPERIMENT_SUCCEEDED, EXPERIMENT_FAILED])
+        # The events are notified once, at the end of the window
+        assert mock_send_task.call_count == 1
+        assert mock_send_task.call_args[1]['kwargs'] == {'project_id': self.project.id}
+        assert NotificationEvent.objects.count() == 0
+
+        with CaptureQueriesContext(connection) as queries:
+            notifier_record_events(**mock_send_task.call_args[1]['kwargs'])
+        # The instances, the recipients and the notifications are loaded or created at once
+        assert len(queries) <= 8
+        assert NotificationEvent.objects.count() == 6
+        assert Notification.objects.count() == 12
+        assert email_execute.call_count == 6
+
+        assert notifier.record_queued_events(self.project.id) == 0
+
+    @patch.object(EmailAction, 'execute')
+    def test_events_of_a_lost_batch_are_notified_with_the_next_batch(self, email_execute):
+        mock_send_task = self.record_events([EXPERIMENT_SUCCEEDED])
+        assert mock_send_task.call_count == 1
+
+        # The task of the batch is lost, the batch is closed once its ttl expires
+        events = RedisNotifierEvents(self.project.id)
+        red = events._red  # pylint:disable=protected-access
+        ttl = settings.NOTIFIER_BATCH_WINDOW + settings.NOTIFIER_BATCH_TIMEOUT
+        assert 0 < red.ttl(events.key_batch) <= ttl
+        red.delete(events.key_batch)
+
+        mock_send_task = self.record_events([EXPERIMENT_FAILED])
+        assert mock_send_task.call_count == 1
+        assert notifier.record_queued_events(self.project.id) == 6
+        assert NotificationEvent.objects.count() == 6
+
+    @override_settings(NOTIFIER_DIGEST=True)
+    @patch.object(EmailAction, 'execute')
+    def test_digest_notifies_the_last_event_of_every_instance(self, email_execute):
+        mock_send_task = self.record_events([EXPERIMENT_SUCCEEDED, EXPERIMENT_SUCCEEDED])
+        notifier.record_queued_events(**mock_send_task.call_args[1]['kwargs'])
+
+        assert NotificationEvent.objects.count() == 3
+        assert set(NotificationEvent.objects.values_list('object_id', flat=True)) == {
+            experiment.id for experiment in self.experiments}
+        assert email_execute.call_count == 3
@@ -1,4 +1,7 @@
 import os
+import shutil
+import stat
+import tempfile
 
 import pytest
 
@@ -6,7 +9,7 @@ from django.conf import settings
 
 from factories.factory_projects import ProjectFactory
 from factories.factory_repos import RepoFactory
-from libs.paths.utils import copy_to_tmp_dir, get_tmp_path
+from libs.paths.utils import CopyMethods, copy_to_tmp_dir, copy_tree, get_tmp_path
 from tests.utils import BaseTest
 
 
@@ -29,3 +32,55 @@ class TestCopyPaths(BaseTest):
         copy_to_tmp_dir(repo_path, 'new')
         git_file_path = '{}/.git'.format(get_tmp_path('new'))
         self.assertTrue(os.path.exists(git_file_path))
+
+    def get_tmp_dir(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        return path
+
+    def test_copy_tree_is_incremental(self):
+        path_from = self.get_tmp_dir()
+        path_to = os.path.join(self.get_tmp_dir(), 'outputs')
+        os.makedirs(os.path.join(path_from, 'checkpoints'))
+        with open(os.path.join(path_from, 'file'), 'w') as f:
+            f.write('foo')
+        with open(os.path.join(path_from, 'checkpoints', 'ckpt'), 'w') as f:
+            f.write('bar')
+
+        stats = copy_tree(path_from, path_to)
+        assert stats[CopyMethods.SKIP] == 0
+        assert stats[CopyMethods.COPY] + stats[CopyMethods.REFLINK] == 2
+        with open(os.path.join(path_to, 'checkpoints', 'ckpt')) as f:
+            assert f.read() == 'bar'
+
+        # Only the changed files are copied again
+        with open(os.path.join(path_from, 'checkpoints', 'ckpt'), 'w') as f:
+            f.write('new bar')
+        stats = copy_tree(path_from, path_to, use_hardlinks=True)
+        assert stats[CopyMethods.SKIP] == 1
+        with open(os.path.join(path_to, 'checkpoints', 'ckpt')) as f:
+            assert f.read() == 'new bar'
+
+        with self.assertRaises(OSError):
+            copy_tree(os.path.join(path_from, 'foo'), path_to)
+
+    def test_copy_does_not_change_the_source_files(self):
+        path_from = self.get_tmp_dir()
+        path_to = os.path.join(self.get_tmp_dir(), 'outputs')
+        file_from = os.path.join(path_from, 'ckpt')
+        with open(file_from, 'w') as f:
+            f.write('foo')
+        os.chmod(file_from, 0o644)
+
+        stats = copy_tree(path_from, path_to, use_hardlinks=True)
+        assert stats[CopyMethods.SKIP] == 0
+        assert stat.S_IMODE(os.stat(file_from).st_mode) == 0o644
+        with open(file_from) as f:
+            assert f.read() == 'foo'
+        with open(os.path.join(path_to, 'ckpt')) as f:
+            assert f.read() == 'foo'
+
+        # Linked files are unchanged
+        stats = copy_tree(path_from, path_to, use_hardlinks=True)
+        assert stats[CopyMethods.SKIP] == 1
+        assert stat.S_IMODE(os.stat(file_from).st_mode) == 0o644
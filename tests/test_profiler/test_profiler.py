@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+import redis
+
+from rest_framework import status
+
+from constants.urls import API_V1
+from libs.redis_db import RedisProfiles
+from profiler.middleware import PROFILE_ID_HEADER
+from profiler.profiler import Profiler
+from tests.utils import BaseViewTest
+
+
+@pytest.mark.profiler_mark
+class TestProfilerViewsV1(BaseViewTest):
+    HAS_AUTH = True
+    ADMIN_USER = True
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.url = '/{}/profiles/'.format(API_V1)
+        self.versions_url = '/{}/versions/cli/'.format(API_V1)
+
+    def test_requested_profiles_are_saved(self):
+        resp = self.auth_client.get(self.versions_url, HTTP_X_POLYAXON_PROFILE='1')
+        assert resp.status_code == status.HTTP_200_OK
+        profile_id = resp[PROFILE_ID_HEADER]
+
+        resp = self.auth_client.get('{}{}/'.format(self.url, profile_id))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['name'] == 'GET {}'.format(self.versions_url)
+        assert resp.data['sql']['queries'] > 0
+        assert resp.data['functions']
+
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data[0]['id'] == profile_id
+        assert 'functions' not in resp.data[0]
+
+    def test_requests_are_not_profiled_by_default(self):
+        resp = self.auth_client.get(self.versions_url)
+        assert PROFILE_ID_HEADER not in resp
+
+    def test_profiles_of_non_staff_users_are_not_saved(self):
+        self.auth_client.user.is_staff = False
+        self.auth_client.user.save()
+        with patch.object(Profiler, 'start') as mock_start:
+            resp = self.auth_client.get(self.versions_url, {'profile': 1})
+        assert PROFILE_ID_HEADER not in resp
+        # The requests of the non staff users are not profiled
+        assert mock_start.call_count == 0
+
+        with patch.object(Profiler, 'start') as mock_start:
+            resp = self.client.get(self.versions_url, {'profile': 1})
+        assert mock_start.call_count == 0
+
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_nested_profilers_are_included_in_the_active_one(self):
+        with Profiler(name='parent') as profiler:
+            resp = self.auth_client.get(self.versions_url, HTTP_X_POLYAXON_PROFILE='1')
+        assert resp.status_code == status.HTTP_200_OK
+        assert profiler.sql_queries > 0
+
+    def test_redis_is_only_patched_while_profiling(self):
+        execute_command = redis.StrictRedis.execute_command
+        with Profiler(name='parent') as profiler:
+            assert redis.StrictRedis.execute_command is not execute_command
+            RedisProfiles.get_profiles()
+        assert profiler.redis_calls > 0
+        assert redis.StrictRedis.execute_command is execute_command
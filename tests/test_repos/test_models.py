@@ -1,5 +1,7 @@
 import os
 
+from unittest.mock import patch
+
 import pytest
 
 from django.conf import settings
@@ -110,3 +112,47 @@ class TestRepoModels(BaseTest):
         # Checkout to master
         git.checkout_commit(repo_path=repo.path)
         assert repo.last_commit[0] == commit2
+
+    def test_head_commit_hash_is_resolved_from_refs(self):
+        repo = RepoFactory(project=self.project)
+        assert repo.last_commit_hash is None
+
+        open(os.path.join(repo.path, 'file1.dat'), 'w+')
+        git.commit(repo.path, 'user@domain.com', 'username')
+        commit1 = git.run_command(cmd='git rev-parse HEAD', data=None,
+                                  location=repo.path, chw=True).strip()
+        assert repo.last_commit_hash == commit1
+        assert repo.last_commit[0] == commit1
+
+        # Packed refs
+        git.run_command(cmd='git pack-refs --all', data=None, location=repo.path, chw=True)
+        assert not os.path.exists(os.path.join(repo.path, '.git', 'refs', 'heads', 'master'))
+        assert repo.last_commit_hash == commit1
+
+        # A new commit is picked up without invalidating the cache explicitly
+        open(os.path.join(repo.path, 'file2.dat'), 'w+')
+        git.run_command(cmd='git add -A', data=None, location=repo.path, chw=True)
+        git.run_command(cmd='git -c user.email=<user@domain.com> -c user.name=username '
+                            'commit -m "updated"',
+                        data=None, location=repo.path, chw=True)
+        commit2 = git.run_command(cmd='git rev-parse HEAD', data=None,
+                                  location=repo.path, chw=True).strip()
+        assert commit1 != commit2
+        assert repo.last_commit_hash == commit2
+
+        # Detached HEAD
+        git.checkout_commit(repo_path=repo.path, commit=commit1)
+        assert repo.last_commit_hash == commit1
+        git.checkout_commit(repo_path=repo.path)
+        assert repo.last_commit_hash == commit2
+
+    def test_head_commit_hash_does_not_spawn_git_processes(self):
+        repo = RepoFactory(project=self.project)
+        open(os.path.join(repo.path, 'file1.dat'), 'w+')
+        git.commit(repo.path, 'user@domain.com', 'username')
+
+        with patch('libs.repos.git.run_command') as mock_run_command:
+            for _ in range(10):
+                assert repo.last_commit_hash is not None
+
+        assert mock_run_command.call_count == 0
@@ -1,5 +1,6 @@
 import json
 import os
+import time
 
 from unittest.mock import patch
 
@@ -16,11 +17,13 @@ from api.repos.serializers import RepoSerializer
 from api.utils.views import ProtectedView
 from constants.jobs import JobLifeCycle
 from constants.urls import API_V1
+from crons.tasks.archives import clean_archives
 from db.models.repos import Repo
 from factories.factory_plugins import NotebookJobFactory
 from factories.factory_projects import ProjectFactory
 from factories.factory_repos import RepoFactory
 from factories.factory_users import UserFactory
+from libs.archive import get_repo_archive_path
 from libs.repos import git
 from tests.utils import BaseViewTest
 
@@ -359,8 +362,10 @@ class DownloadRepoViewTest(BaseViewTest):
         response = self.auth_client.get(self.download_url)
         self.assertEqual(response.status_code, 200)
         self.assertTrue(ProtectedView.NGINX_REDIRECT_HEADER in response)
+        commit = self.project.repo.last_commit_hash
         self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER],
-                         '{}/{}.tar.gz'.format(settings.REPOS_ARCHIVE_ROOT, self.project.name))
+                         get_repo_archive_path(self.project.unique_name, commit))
+        self.assertEqual(response['ETag'], '"{}"'.format(commit))
 
     def test_redirects_nginx_to_file_works_with_internal_client(self):
         self.upload_file()
@@ -378,5 +383,67 @@ class DownloadRepoViewTest(BaseViewTest):
         response = self.internal_client.get(self.download_url)
         self.assertEqual(response.status_code, 200)
         self.assertTrue(ProtectedView.NGINX_REDIRECT_HEADER in response)
+        commit = self.project.repo.last_commit_hash
         self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER],
-                         '{}/{}.tar.gz'.format(settings.REPOS_ARCHIVE_ROOT, self.project.name))
+                         get_repo_archive_path(self.project.unique_name, commit))
+        self.assertEqual(response['ETag'], '"{}"'.format(commit))
+
+    def test_archives_are_created_once_per_commit(self):
+        self.upload_file()
+        commit = self.project.repo.last_commit_hash
+        archive_path = get_repo_archive_path(self.project.unique_name, commit)
+
+        response = self.auth_client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(os.path.exists(archive_path))
+        archive_mtime = os.stat(archive_path).st_mtime_ns
+
+        response = self.auth_client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER], archive_path)
+        self.assertEqual(os.stat(archive_path).st_mtime_ns, archive_mtime)
+
+        # Explicit commit
+        response = self.auth_client.get('{}?commit={}'.format(self.download_url, commit[:8]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response[ProtectedView.NGINX_REDIRECT_HEADER], archive_path)
+
+    def test_archives_of_other_commits_are_kept_until_they_expire(self):
+        self.upload_file()
+        commit = self.project.repo.last_commit_hash
+        other_archive_path = get_repo_archive_path(self.project.unique_name, 'a' * 40)
+        os.makedirs(os.path.dirname(other_archive_path), exist_ok=True)
+        open(other_archive_path, 'w').close()
+
+        response = self.auth_client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        archive_path = get_repo_archive_path(self.project.unique_name, commit)
+        self.assertTrue(os.path.exists(archive_path))
+        self.assertTrue(os.path.exists(other_archive_path))
+
+        expired_at = time.time() - settings.ARCHIVES_TTL - 1
+        os.utime(other_archive_path, (expired_at, expired_at))
+        clean_archives()
+        self.assertTrue(os.path.exists(archive_path))
+        self.assertFalse(os.path.exists(other_archive_path))
+
+    def test_not_modified_if_etag_matches(self):
+        self.upload_file()
+        commit = self.project.repo.last_commit_hash
+        response = self.auth_client.get(self.download_url,
+                                        HTTP_IF_NONE_MATCH='"{}"'.format(commit))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(ProtectedView.NGINX_REDIRECT_HEADER in response)
+        self.assertFalse(os.path.exists(
+            get_repo_archive_path(self.project.unique_name, commit)))
+
+        response = self.auth_client.get(self.download_url, HTTP_IF_NONE_MATCH='"foo"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_download_unknown_commit(self):
+        self.upload_file()
+        response = self.auth_client.get('{}?commit={}'.format(self.download_url, 'a' * 40))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.auth_client.get('{}?commit={}'.format(self.download_url, 'HEAD;ls'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
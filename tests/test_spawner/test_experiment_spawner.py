@@ -0,0 +1,81 @@
+import uuid
+
+import pytest
+
+from kubernetes.client.rest import ApiException
+from mock import patch
+
+from django.conf import settings
+
+from scheduler.experiment_scheduler import start_spawner
+from scheduler.spawners.tensorflow_spawner import TensorflowSpawner
+from schemas.specifications import ExperimentSpecification
+from tests.fake_k8s import PODS, FakeCluster, patch_k8s
+from tests.utils import BaseTest
+
+distributed_experiment_spec_content = """---
+    version: 1
+
+    kind: experiment
+
+    environment:
+      tensorflow:
+        n_workers: {n_workers}
+        n_ps: 1
+
+    run:
+      cmd: video_prediction_train --model=DNA --num_masks=1
+"""
+
+
+def get_tensorflow_spawner(n_workers, spawn_workers):
+    spec = ExperimentSpecification.read(
+        distributed_experiment_spec_content.format(n_workers=n_workers))
+    return TensorflowSpawner(project_name='user.project',
+                             project_uuid=uuid.uuid4().hex,
+                             experiment_name='user.project.1',
+                             experiment_uuid=uuid.uuid4().hex,
+                             spec=spec,
+                             k8s_config=settings.K8S_CONFIG,
+                             namespace=settings.K8S_NAMESPACE,
+                             in_cluster=True,
+                             spawn_workers=spawn_workers)
+
+
+@pytest.mark.spawner_mark
+class TestExperimentSpawner(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.cluster = FakeCluster()
+        patcher = patch_k8s(self.cluster)
+        patcher.__enter__()
+        self.addCleanup(patcher.__exit__, None, None, None)
+
+    def test_start_experiment_creates_all_the_replicas(self):
+        get_tensorflow_spawner(n_workers=4, spawn_workers=4).start_experiment()
+        # Master, workers and ps
+        assert self.cluster.count(PODS) == 6
+
+    def test_failed_start_deletes_the_created_replicas_once(self):
+        spawner = get_tensorflow_spawner(n_workers=4, spawn_workers=4)
+        self.cluster.inject_failure('create_namespaced_pod', times=1, status=500)
+
+        with patch.object(spawner, 'stop_experiment',
+                          wraps=spawner.stop_experiment) as mock_stop:
+            with self.assertRaises(ApiException):
+                start_spawner(spawner)
+
+        assert mock_stop.call_count == 1
+        assert self.cluster.count(PODS) == 0
+
+    def test_failed_rollback_raises_the_creation_error(self):
+        spawner = get_tensorflow_spawner(n_workers=4, spawn_workers=4)
+        self.cluster.inject_failure('create_namespaced_pod', times=1, status=500)
+
+        with patch.object(spawner, 'stop_experiment', side_effect=ValueError):
+            with self.assertRaises(ApiException) as context:
+                start_spawner(spawner)
+
+        assert context.exception.status == 500
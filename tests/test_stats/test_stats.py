@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from django.test import override_settings
+
+import stats
+
+from polyaxon.celery_api import app as celery_app
+from stats.noop import NoOpStatsBackend
+from tests.utils import BaseTest
+
+
+@pytest.mark.stats_mark
+class TestStatsBackend(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.backend = NoOpStatsBackend(prefix='polyaxon')
+
+    @override_settings(STATS_SAMPLE_RATE=0.1)
+    def test_values_are_prefixed_and_sampled(self):
+        with patch.object(NoOpStatsBackend, '_gauge') as gauge:
+            self.backend.gauge('streams.sockets', 2)
+            self.backend.gauge('streams.sockets', 2, sample_rate=1)
+
+        assert gauge.call_args_list[0][1] == {
+            'key': 'polyaxon.streams.sockets', 'value': 2, 'sample_rate': 0.1}
+        assert gauge.call_args_list[1][1]['sample_rate'] == 1
+
+    def test_timer_is_a_context_manager_and_a_decorator(self):
+        with patch.object(NoOpStatsBackend, '_timing') as timing:
+            with self.backend.timer('scheduler.experiments.spawn'):
+                pass
+
+            @self.backend.timer('query.experiment.build')
+            def build():
+                return 1
+
+            assert build() == 1
+
+        assert [call[1]['key'] for call in timing.call_args_list] == [
+            'polyaxon.scheduler.experiments.spawn', 'polyaxon.query.experiment.build']
+        assert all(call[1]['value'] >= 0 for call in timing.call_args_list)
+
+    def test_celery_tasks_are_timed(self):
+        @celery_app.task(name='stats_test_task')
+        def stats_test_task():
+            return 1
+
+        with patch.object(stats.backend, 'timing') as timing:
+            stats_test_task.apply_async()
+
+        assert timing.call_args[0][0] == 'celery.tasks.stats_test_task.duration'
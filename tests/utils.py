@@ -38,7 +38,7 @@ class BaseClient(Client):
         if data is None:
             data = {}
 
-        for key, value in data.items():
+        for key, value in (data.items() if isinstance(data, dict) else ()):
             # Fix UUIDs for convenience
             if isinstance(value, uuid.UUID):
                 data[key] = value.hex